@@ -0,0 +1,58 @@
+"""
+atomic_io.py — execution 스크립트 공용 원자적 파일 쓰기
+
+왜(Why) 이 모듈이 필요한가:
+  상태, 캐시, 색인, 리포트 파일은 여러 프로세스(run-all, backfill, 데몬)가 동시에 읽는다.
+  스크립트마다 임시 파일 + rename을 따로 구현하면 fsync나 실패 시 정리가 빠진 변형이 생긴다.
+  무거운 state_manager를 import하지 않고도 같은 구현을 쓸 수 있도록 의존성 없는 모듈로 둔다.
+
+사용법 (스크립트 내부):
+  from atomic_io import atomic_writer, atomic_write_json
+  with atomic_writer(path) as f:          # 텍스트 ("wb"면 바이너리)
+      f.write(text)
+  atomic_write_json(path, data)           # indent=2 (indent=None이면 공백 없는 JSON)
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: str = "w"):
+    """
+    임시 파일 핸들을 넘겨주고, 블록이 정상 종료되면 fsync한 뒤 rename으로 교체한다.
+    왜: open(..., "w")는 파일을 먼저 비우므로 쓰는 도중 프로세스가 죽으면
+    잘린 파일이 남는다. 같은 디렉토리의 임시 파일을 os.replace로 바꿔치기하면
+    다른 프로세스는 항상 이전 버전 또는 새 버전 중 하나만 보게 된다.
+    예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둔다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    # 왜: rename 자체도 디렉토리 엔트리 변경이므로 디렉토리를 fsync해야 정전 후에도 남는다.
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(str(path.parent), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_json(path: Path, data, indent: int = 2) -> None:
+    """JSON 파일을 atomic_writer로 원자적으로 교체한다. indent=None이면 공백 없이 쓴다."""
+    with atomic_writer(path) as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=None if indent else (",", ":"))
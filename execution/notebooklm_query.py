@@ -10,20 +10,77 @@ notebooklm_query.py — NotebookLM 질의 스크립트
   python execution/notebooklm_query.py --week 1 --questions "질문1" "질문2"
   python execution/notebooklm_query.py --week 1 --chapter "Chapter 1: ..."
   python execution/notebooklm_query.py --week 1 --auto
+
+  # 배치 모드: 여러 주차의 질문을 매니페스트 하나로 만들고, 응답 JSONL을 한 번에 저장
+  python execution/notebooklm_query.py --batch --weeks 1 2 3 [--manifest PATH]
+  python execution/notebooklm_query.py --answer-local [--manifest PATH] [--answers PATH]   # 로컬 대체 응답기
+  python execution/notebooklm_query.py --ingest [--manifest PATH] [--answers PATH]
+
+  # 할당량 스케줄러: 대기열에서 남은 할당량만큼 질문을 꺼내 MCP 호출 목록 생성 (현재 주차 우선)
+  python execution/notebooklm_query.py --dispatch [--wait]
+  python execution/notebooklm_query.py --quota-status
+
+  # 로컬 책 요약(BM25) 응답: 빠른 경로 / 할당량 부족 시 대체
+  python execution/notebooklm_query.py --week 1 --auto --local
+  python execution/notebooklm_query.py --week 1 --auto --local-fallback
+  python execution/notebooklm_query.py --dispatch --local-fallback
+  python execution/notebooklm_query.py --answer-local --answerer bm25
+
+  # 응답 캐시: 같은 노트북에 같은 질문이면 MCP 호출 없이 저장된 응답 사용
+  python execution/notebooklm_query.py --cache-stats
+  python execution/notebooklm_query.py --invalidate-cache ["질문" ...]   # 질문 생략 시 현재 노트북 전체
+  python execution/notebooklm_query.py --week 1 --auto --no-cache
 """
 
 import argparse
+import hashlib
 import json
+import os
+import re
 import sys
+import time
+import unicodedata
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_DIR = PROJECT_ROOT / "data"
-WEEKS_DIR = DATA_DIR / "weeks"
+# 왜: fcntl은 POSIX 전용이다. Windows에서는 잠금 없이 원자적 쓰기만으로 동작한다.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from atomic_io import atomic_write_json, atomic_writer
+from step_metrics import StepMetrics, record_bytes_written
+from workspace_paths import DATA_DIR, PROJECT_ROOT, WEEKS_DIR
 
 KST = timezone(timedelta(hours=9))
 
+# --- 배치 질의 ---
+# 왜: 질문마다 MCP 지시를 읽고 호출한 뒤 save_analysis를 손으로 부르는 대신,
+# 매니페스트 하나로 일괄 질의하고 응답 파일 하나로 일괄 저장한다.
+BATCH_DIR = DATA_DIR / "notebooklm"
+DEFAULT_MANIFEST_PATH = BATCH_DIR / "manifest.json"
+DEFAULT_ANSWERS_PATH = BATCH_DIR / "answers.jsonl"
+DISPATCH_PATH = BATCH_DIR / "dispatch.json"
+MANIFEST_VERSION = 1
+
+# --- 질의 할당량 ---
+# 왜: NotebookLM은 계정당 하루 50회 질의 한도가 있다. 한도는 워크스페이스가 아닌 계정에 걸리므로
+# 공용 data/에 두고, 여러 프로세스(run-all, backfill)가 동시에 써도 되도록 파일 잠금으로 보호한다.
+QUOTA_PATH = PROJECT_ROOT / "data" / "notebooklm-quota.json"
+DAILY_QUERY_LIMIT = int(os.environ.get("NOTEBOOKLM_DAILY_LIMIT") or 50)
+QUOTA_WINDOW_SECONDS = 86400
+QUOTA_HISTORY_DAYS = 14
+
+# --- 응답 캐시 ---
+# 왜: NotebookLM은 하루 50회 질의 한도가 있는데, 재실행하면 같은 질문을 그대로 다시 묻는다.
+# 응답은 노트북 내용에만 의존하므로 워크스페이스별 DATA_DIR이 아닌 공용 data/cache에 둔다.
+ANSWER_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "notebooklm-answers.json"
+DEFAULT_CACHE_TTL_DAYS = float(os.environ.get("NOTEBOOKLM_CACHE_TTL_DAYS") or 14)
+# 왜: 캐시 응답이나 로컬 대체 응답을 다시 캐시하면 실제 NotebookLM 응답처럼 보이게 된다.
+UNCACHEABLE_METHODS = ("cache", "missing")
+
 # --- 챕터별 기본 질문 템플릿 ---
 # 왜: 매주 동일한 프레임워크로 챕터를 분석해야 일관성 있는 결과를 얻을 수 있다.
 # WYSH 브랜드 맥락을 포함한 질문으로 구성하여 단순 요약이 아닌 적용 가능한 인사이트를 생성.
@@ -63,6 +120,294 @@ def load_notebooklm_config() -> dict:
     return config
 
 
+def normalize_question(question: str) -> str:
+    """
+    캐시 키용으로 질문을 정규화한다.
+    왜: 공백/대소문자/전각 문자/끝 구두점만 다른 질문은 같은 응답을 받으므로 같은 키가 되어야 한다.
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(" ?.!？。")
+
+
+class AnswerCache:
+    """
+    노트북 URL + 정규화된 질문을 키로 하는 NotebookLM 응답 캐시 (TTL 만료 + 명시적 무효화).
+
+    저장 형식 (data/cache/notebooklm-answers.json):
+      {"entries": {키: {"notebook_url", "question", "answer", "method", "cached_at"}},
+       "stats": {"hits", "misses", "avoided_calls"}}
+    """
+
+    def __init__(self, path: Path = ANSWER_CACHE_PATH, ttl_days: float = DEFAULT_CACHE_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.data = self._read()
+        # 왜: 저장 시 디스크의 최신 캐시에 이번 실행의 변경분만 합치기 위해 따로 모아 둔다.
+        self._pending_puts = {}
+        self._pending_removals = set()
+        self._pending_stats = {"hits": 0, "misses": 0, "avoided_calls": 0}
+        # 이번 실행에서의 적중/실패 (누적값은 data["stats"])
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self) -> dict:
+        data = {"entries": {}, "stats": {"hits": 0, "misses": 0, "avoided_calls": 0}}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"⚠️  응답 캐시가 손상되어 새로 만듭니다: {self.path}")
+        return data
+
+    def _count(self, name: str) -> None:
+        self.data["stats"][name] += 1
+        self._pending_stats[name] += 1
+
+    @staticmethod
+    def key(notebook_url: str, question: str) -> str:
+        raw = f"{notebook_url or ''}\n{normalize_question(question)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def get(self, notebook_url: str, question: str) -> dict:
+        """유효한 캐시 응답을 반환한다. 없거나 만료됐으면 None."""
+        entry = self.data["entries"].get(self.key(notebook_url, question))
+        if entry is not None and time.time() - entry["cached_at"] > self.ttl_seconds:
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self._count("misses")
+            return None
+        self.hits += 1
+        self._count("hits")
+        # 왜: 적중 한 번이 NotebookLM 질의 한 번을 대신한다.
+        self._count("avoided_calls")
+        return entry
+
+    def put(self, notebook_url: str, question: str, answer: str, method: str = "mcp") -> None:
+        key = self.key(notebook_url, question)
+        entry = {
+            "notebook_url": notebook_url,
+            "question": question,
+            "answer": answer,
+            "method": method,
+            "cached_at": time.time(),
+        }
+        self.data["entries"][key] = entry
+        self._pending_puts[key] = entry
+        self._pending_removals.discard(key)
+
+    def invalidate(self, notebook_url: str, questions: list = None) -> int:
+        """주어진 질문(생략 시 해당 노트북 전체)의 캐시를 지운다. 반환값: 지운 항목 수"""
+        if questions:
+            keys = [self.key(notebook_url, question) for question in questions]
+        else:
+            keys = [
+                key for key, entry in self.data["entries"].items()
+                if entry["notebook_url"] == notebook_url
+            ]
+        removed = 0
+        for key in keys:
+            if self.data["entries"].pop(key, None) is not None:
+                removed += 1
+            self._pending_puts.pop(key, None)
+        # 왜: 노트북 전체 무효화는 다른 프로세스가 그사이 추가한 항목까지 지워야 하므로 저장 때 다시 찾는다.
+        self._pending_removals.update(keys if questions else [("notebook", notebook_url)])
+        return removed
+
+    @contextmanager
+    def _locked(self):
+        """잠금을 잡고 디스크의 최신 캐시를 읽어 넘겨준 뒤, 블록이 끝나면 원자적으로 다시 쓴다."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                data = self._read()
+                yield data
+                atomic_write_json(self.path, data, indent=None)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """
+        이번 실행의 추가/무효화/통계를 디스크의 최신 캐시에 합쳐 저장한다.
+        왜: run-all/backfill의 여러 프로세스가 같은 공용 캐시를 쓰므로, 시작할 때 읽은 사본을
+        그대로 덮어쓰면 다른 프로세스가 그사이 저장한 응답이 사라진다.
+        만료 항목은 지우지 않는다. TTL은 실행마다 --cache-ttl-days로 달라질 수 있고,
+        만료된 질문은 다시 질의하면 같은 키로 덮어쓰인다.
+        """
+        with self._locked() as data:
+            for removal in self._pending_removals:
+                if isinstance(removal, tuple):
+                    notebook_url = removal[1]
+                    for key in [key for key, entry in data["entries"].items()
+                                if entry["notebook_url"] == notebook_url]:
+                        del data["entries"][key]
+                else:
+                    data["entries"].pop(removal, None)
+            data["entries"].update(self._pending_puts)
+            for name, count in self._pending_stats.items():
+                data["stats"][name] = data["stats"].get(name, 0) + count
+        self.data = data
+        self._pending_puts = {}
+        self._pending_removals = set()
+        self._pending_stats = {name: 0 for name in self._pending_stats}
+
+    def print_stats(self) -> None:
+        stats = self.data["stats"]
+        print(f"🗄️  NotebookLM 응답 캐시: 이번 실행 적중 {self.hits} / 실패 {self.misses} "
+              f"(질의 {self.hits}회 절약), 누적 절약 {stats['avoided_calls']}회, "
+              f"항목 {len(self.data['entries'])}개 (TTL {self.ttl_seconds / 86400:g}일)")
+
+
+def remember_answers(results: list, notebook_url: str = None, cache: AnswerCache = None) -> int:
+    """
+    실제 NotebookLM 응답을 캐시에 넣는다. 반환값: 저장한 응답 수
+    왜: 캐시/로컬 대체 응답/누락 응답은 노트북의 실제 응답이 아니므로 넣지 않는다.
+    """
+    if cache is None:
+        cache = AnswerCache()
+    if notebook_url is None:
+        notebook_url = load_notebooklm_config().get("notebook_url")
+    stored = 0
+    for result in results:
+        method = result.get("method", "mcp")
+        if method in UNCACHEABLE_METHODS or method.startswith("local:"):
+            continue
+        if not result.get("question") or result.get("answer") is None:
+            continue
+        cache.put(notebook_url, result["question"], result["answer"], method)
+        stored += 1
+    if stored:
+        cache.save()
+    return stored
+
+
+class QuotaScheduler:
+    """
+    여러 프로세스와 날짜에 걸쳐 유지되는 토큰 버킷 할당량 스케줄러.
+    왜: 한도를 넘기면 "내일 재시도"로 파이프라인과 backfill이 멈춘다. 버킷은 24시간에 한도만큼
+    연속으로 다시 차므로 (50회/일이면 약 29분에 1회), 대기열을 두고 찬 만큼씩 꺼내 쓰면
+    사람이 지켜보지 않아도 한도를 꽉 채워 쓰면서 넘지는 않는다.
+    버킷만으로는 가득 찬 상태에서 한 번에 다 쓰고 그 뒤 다시 찬 만큼을 더 쓸 수 있어
+    24시간에 한도의 두 배 가까이 허용되므로, 최근 24시간 허용 기록(grants)의 합으로도 제한한다.
+
+    저장 형식 (data/notebooklm-quota.json):
+      {"tokens": 남은 토큰(실수), "updated_at": 마지막 갱신 시각,
+       "grants": [[허용 시각, 허용 수], ...] (최근 24시간), "used": {"YYYY-MM-DD": 사용 횟수},
+       "charged": {질의 키: 허용 시각} (최근 24시간, acquire_keys로 허용한 질의)}
+    """
+
+    def __init__(self, path: Path = QUOTA_PATH, limit: int = DAILY_QUERY_LIMIT,
+                 window_seconds: float = QUOTA_WINDOW_SECONDS, clock=time.time):
+        self.path = Path(path)
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.refill_per_second = limit / window_seconds
+        self.clock = clock
+
+    @contextmanager
+    def _locked(self):
+        """잠금을 잡고 최신 상태를 읽어 넘겨준 뒤, 블록이 끝나면 원자적으로 다시 쓴다."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                state = {"tokens": float(self.limit), "updated_at": self.clock(),
+                         "grants": [], "used": {}, "charged": {}}
+                if self.path.exists():
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        state.update(json.load(f))
+                self._refill(state)
+                yield state
+                atomic_write_json(self.path, state)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _refill(self, state: dict) -> None:
+        now = self.clock()
+        elapsed = max(0.0, now - state["updated_at"])
+        # 왜: 한도를 낮춘 경우에도 남은 토큰이 새 한도를 넘지 않게 한다.
+        state["tokens"] = min(float(self.limit), state["tokens"] + elapsed * self.refill_per_second)
+        state["updated_at"] = now
+        state["grants"] = [grant for grant in state["grants"] if grant[0] > now - self.window_seconds]
+        state["charged"] = {key: at for key, at in state["charged"].items() if at > now - self.window_seconds}
+
+    def _window_remaining(self, state: dict) -> int:
+        """최근 24시간 동안 아직 허용할 수 있는 질의 수."""
+        return max(0, self.limit - sum(count for _, count in state["grants"]))
+
+    def available(self) -> int:
+        with self._locked() as state:
+            return min(int(state["tokens"]), self._window_remaining(state))
+
+    def _take(self, state: dict, count: int) -> int:
+        granted = max(0, min(count, int(state["tokens"]), self._window_remaining(state)))
+        state["tokens"] -= granted
+        if granted:
+            now = state["updated_at"]
+            state["grants"].append([now, granted])
+            today = datetime.fromtimestamp(now, KST).strftime("%Y-%m-%d")
+            state["used"][today] = state["used"].get(today, 0) + granted
+            for day in sorted(state["used"])[:-QUOTA_HISTORY_DAYS]:
+                del state["used"][day]
+        return granted
+
+    def acquire(self, count: int) -> int:
+        """최대 count개의 질의 토큰을 가져간다. 반환값: 실제로 허용된 수"""
+        with self._locked() as state:
+            return self._take(state, count)
+
+    def acquire_keys(self, keys: list) -> set:
+        """
+        질의 키마다 토큰을 가져간다. 반환값: 허용된 키 집합
+        왜: 호출 지시만 출력하는 경로(--week N --auto)는 다시 실행해도 같은 질의를 또 부르지 않으므로,
+        최근 24시간 안에 이미 허용한 키는 다시 차감하지 않는다.
+        """
+        with self._locked() as state:
+            charged = state["charged"]
+            new_keys = [key for key in dict.fromkeys(keys) if key not in charged]
+            granted = new_keys[:self._take(state, len(new_keys))]
+            for key in granted:
+                charged[key] = state["updated_at"]
+            return {key for key in keys if key in charged}
+
+    def seconds_until(self, count: int = 1) -> float:
+        """count개의 토큰이 모일 때까지 남은 초 (지금 가능하면 0)."""
+        count = min(count, self.limit)
+        with self._locked() as state:
+            now = state["updated_at"]
+            missing = count - state["tokens"]
+            bucket_wait = missing / self.refill_per_second if missing > 0 else 0.0
+            # 왜: 버킷이 차도 24시간 창이 가득 차 있으면, 오래된 허용 기록이 창 밖으로 나가야 한다.
+            excess = count - self._window_remaining(state)
+            window_wait = 0.0
+            for granted_at, granted in sorted(state["grants"]):
+                if excess <= 0:
+                    break
+                excess -= granted
+                window_wait = granted_at + self.window_seconds - now
+        return max(0.0, bucket_wait, window_wait)
+
+    def print_status(self) -> None:
+        with self._locked() as state:
+            available = min(int(state["tokens"]), self._window_remaining(state))
+            used_today = state["used"].get(datetime.fromtimestamp(state["updated_at"], KST).strftime("%Y-%m-%d"), 0)
+        print(f"⏳ NotebookLM 할당량: 지금 사용 가능 {available}/{self.limit}회, 오늘 사용 {used_today}회")
+        if available < 1:
+            print(f"   다음 질의 가능: {_format_eta(self.seconds_until(1))}")
+
+
+def _format_eta(seconds: float) -> str:
+    at = datetime.now(KST) + timedelta(seconds=seconds)
+    return f"{at.strftime('%m-%d %H:%M KST')} (약 {int(seconds // 60)}분 후)"
+
+
 def query_via_mcp(question: str, notebook_url: str = None) -> dict:
     """
     notebooklm-mcp 서버를 통해 질의한다.
@@ -115,7 +460,7 @@ def generate_chapter_questions(chapter_name: str, custom_questions: list = None)
     return questions
 
 
-def save_analysis(results: list, week_number: int, chapter_name: str) -> Path:
+def save_analysis(results: list, week_number: int, chapter_name: str, use_cache: bool = True) -> Path:
     """
     분석 결과를 주차별 디렉토리에 저장한다.
     왜: 마크다운과 JSON 모두 저장하여 사람 가독성과 프로그래밍 활용을 동시에 지원.
@@ -141,6 +486,7 @@ def save_analysis(results: list, week_number: int, chapter_name: str) -> Path:
 
     with open(analysis_path, "w", encoding="utf-8") as f:
         f.write(content)
+    record_bytes_written(analysis_path)
 
     # --- JSON 저장 ---
     analysis_json_path = week_dir / "chapter-analysis.json"
@@ -151,25 +497,511 @@ def save_analysis(results: list, week_number: int, chapter_name: str) -> Path:
             "analyzed_at": datetime.now(KST).isoformat(),
             "results": results,
         }, f, ensure_ascii=False, indent=2)
+    record_bytes_written(analysis_json_path)
 
     print(f"💾 분석 결과 저장 완료:")
     print(f"   마크다운: {analysis_path}")
     print(f"   JSON: {analysis_json_path}")
 
+    # 왜: 에이전트가 save_analysis를 직접 부르는 단일 주차 경로도 다음 재실행에서 캐시를 쓰도록 한다.
+    if use_cache:
+        remember_answers(results)
+
     return analysis_path
 
 
+def resolve_chapter(week_number: int, state: dict) -> str:
+    """
+    주차의 챕터 이름을 찾는다.
+    왜: 배치 모드는 현재 주차가 아닌 주차도 다루므로 current_chapter만으로는 부족하다.
+    주차 meta → 상태 history → (현재 주차면) current_chapter 순으로 찾는다.
+    """
+    import state_manager
+
+    chapter = (state_manager.get_backend().load_week_meta(week_number) or {}).get("chapter")
+    if chapter:
+        return chapter
+    for entry in state.get("history", []):
+        if entry.get("week") == week_number and entry.get("chapter"):
+            return entry["chapter"]
+    if state.get("current_week") == week_number and state.get("current_chapter"):
+        return state["current_chapter"]
+    return f"Week {week_number}"
+
+
+def _load_state() -> dict:
+    """
+    설정된 상태 저장소에서 상태를 읽는다 (없으면 빈 딕셔너리).
+    왜: STATE_BACKEND=sqlite이면 state.json은 export-json 때만 갱신되어 낡았거나 없다.
+    """
+    import state_manager
+
+    return state_manager.get_backend().load_state() or {}
+
+
+def build_manifest(weeks: list, custom_questions: list = None, chapter_override: str = None,
+                   cache: AnswerCache = None) -> dict:
+    """
+    여러 주차의 질문을 기계가 읽을 수 있는 매니페스트 하나로 만든다.
+    질문 ID는 "w01-q1" 형식이며, 응답 파일의 각 줄은 이 ID로 질문과 연결된다.
+    cache가 주어지면 캐시에 응답이 있는 질문은 "cached_answer"를 붙여 질의 대상에서 뺀다.
+    각 질문의 status는 cached(캐시 응답 있음) / queued(할당량 대기) / dispatched(호출 목록으로 보냄)이다.
+    """
+    state = _load_state()
+    config = load_notebooklm_config()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created_at": datetime.now(KST).isoformat(),
+        "tool": "mcp_notebooklm_ask_question",
+        "notebook_url": config.get("notebook_url"),
+        "answer_format": {"id": "질문 ID", "answer": "응답 텍스트", "method": "(선택) mcp/local 등"},
+        "weeks": {},
+        "questions": [],
+    }
+    for week_number in weeks:
+        chapter = chapter_override or resolve_chapter(week_number, state)
+        manifest["weeks"][str(week_number)] = chapter
+        for i, question in enumerate(generate_chapter_questions(chapter, custom_questions), 1):
+            item = {
+                "id": f"w{week_number:02d}-q{i}",
+                "week": week_number,
+                "question": question,
+                "status": "queued",
+            }
+            cached = cache.get(manifest["notebook_url"], question) if cache is not None else None
+            if cached is not None:
+                item["cached_answer"] = cached["answer"]
+                item["status"] = "cached"
+            manifest["questions"].append(item)
+    return manifest
+
+
+def merge_manifests(existing: dict, manifest: dict) -> dict:
+    """
+    이전 매니페스트에서 아직 저장되지 않은 주차를 새 매니페스트에 이어 붙인다.
+    왜: 매니페스트가 곧 할당량 대기열이므로, 새 배치를 만들어도 이전 배치의 대기 질문이 사라지면 안 된다.
+    새 배치에 다시 포함된 주차는 새 질문으로 바꾼다.
+    """
+    rebuilt = set(manifest["weeks"])
+    for week_key, chapter in existing["weeks"].items():
+        if week_key not in rebuilt:
+            manifest["weeks"][week_key] = chapter
+    kept = [item for item in existing["questions"] if str(item["week"]) not in rebuilt]
+    manifest["questions"] = kept + manifest["questions"]
+    return manifest
+
+
+def rewrite_answers(answers_path: Path, keep_ids: set, extra_entries: list = ()) -> int:
+    """
+    응답 파일에서 keep_ids의 줄만 남기고 extra_entries를 덧붙인다. 반환값: 덧붙인 줄 수
+    왜: 저장이 끝난 주차나 새로 만든 주차의 예전 응답이 같은 질문 ID로 다시 읽히지 않게 한다.
+    """
+    kept_lines = []
+    if answers_path.exists():
+        with open(answers_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    if json.loads(line).get("id") in keep_ids:
+                        kept_lines.append(line if line.endswith("\n") else line + "\n")
+                except json.JSONDecodeError:
+                    continue
+    with atomic_writer(answers_path) as f:
+        f.writelines(kept_lines)
+        for entry in extra_entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return len(extra_entries)
+
+
+def cached_answer_entries(items: list) -> list:
+    """캐시 응답이 있는 질문의 응답 줄 목록."""
+    return [
+        {"id": item["id"], "answer": item["cached_answer"], "method": "cache"}
+        for item in items if "cached_answer" in item
+    ]
+
+
+def write_manifest(manifest: dict, manifest_path: Path) -> None:
+    atomic_write_json(manifest_path, manifest)
+    record_bytes_written(manifest_path)
+
+
+def load_manifest(manifest_path: Path) -> dict:
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"매니페스트가 없습니다: {manifest_path} (먼저 --batch로 생성)")
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전입니다: {manifest.get('version')}")
+    return manifest
+
+
+def dispatch_questions(manifest: dict, scheduler: QuotaScheduler, current_week: int = None) -> list:
+    """
+    대기 중인 질문을 남은 할당량만큼 꺼내 dispatched로 표시한다. 반환값: 꺼낸 질문 목록
+    왜: 현재 주차 질문을 먼저, 그다음 오래된 주차부터 꺼내 이번 주 분석이 backfill에 밀리지 않게 한다.
+    같은 주차 안에서는 매니페스트 순서(Q1, Q2, ...)를 유지한다.
+    """
+    queued = [item for item in manifest["questions"] if item.get("status") == "queued"]
+    queued.sort(key=lambda item: (item["week"] != current_week, item["week"]))
+    granted = scheduler.acquire(len(queued))
+    dispatched_at = datetime.now(KST).isoformat()
+    for item in queued[:granted]:
+        item["status"] = "dispatched"
+        item["dispatched_at"] = dispatched_at
+    return queued[:granted]
+
+
+def write_dispatch(manifest: dict, items: list, dispatch_path: Path = DISPATCH_PATH) -> None:
+    """이번에 호출할 MCP 호출 목록을 기계가 읽을 수 있는 파일로 쓴다."""
+    atomic_write_json(dispatch_path, {
+        "dispatched_at": datetime.now(KST).isoformat(),
+        "calls": [
+            {"id": item["id"], **query_via_mcp(item["question"], manifest.get("notebook_url"))}
+            for item in items
+        ],
+    })
+
+
+def echo_answerer(item: dict, chapter: str) -> str:
+    """
+    네트워크 없이 배치 흐름을 점검하기 위한 대체 응답기.
+    왜: 매니페스트 → 응답 파일 → save_analysis 경로를 NotebookLM 인증 없이 끝까지 돌려 볼 수 있게 한다.
+    """
+    return f"(로컬 대체 응답) {chapter} — {item['question']}"
+
+
+_source_retriever = None
+
+
+def bm25_answerer(item: dict, chapter: str) -> str:
+    """
+    로컬 책 요약(data/sources/)에서 BM25로 찾은 근거 구절을 출처와 함께 돌려주는 응답기.
+    왜: NotebookLM MCP가 멈추거나 할당량이 없어도 같은 소스 기반 근거를 즉시 얻는다.
+    """
+    global _source_retriever
+    from source_retriever import SourceRetriever
+
+    if _source_retriever is None:
+        _source_retriever = SourceRetriever()
+    # 왜: 커스텀 질문처럼 질문에 챕터 번호가 없으면 주차 챕터 이름으로 범위를 좁힌다.
+    chapters = SourceRetriever.chapters_in(item["question"]) or SourceRetriever.chapters_in(chapter)
+    return _source_retriever.answer(item["question"], chapters=chapters or None)
+
+
+# 왜: 응답기를 이름으로 고를 수 있게 해 두면 다른 로컬 응답기를 같은 경로에 끼울 수 있다.
+LOCAL_ANSWERERS = {
+    "echo": echo_answerer,
+    "bm25": bm25_answerer,
+}
+
+
+def local_result(question: str, chapter: str, answerer: str = "bm25") -> dict:
+    """로컬 응답기로 save_analysis용 결과 하나를 만든다."""
+    return {
+        "method": f"local:{answerer}",
+        "question": question,
+        "answer": LOCAL_ANSWERERS[answerer]({"question": question}, chapter),
+        "timestamp": datetime.now(KST).isoformat(),
+    }
+
+
+def answer_queued_locally(manifest: dict, answers_path: Path, answerer: str = "bm25") -> int:
+    """
+    할당량을 기다리는 질문을 로컬 응답기로 답해 응답 파일에 덧붙인다. 반환값: 답한 질문 수
+    왜: 할당량이 없을 때도 --ingest가 주차 분석을 저장할 수 있게 한다. 답한 질문은 status가 local이 된다.
+    """
+    answers_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(answers_path, "a", encoding="utf-8") as f:
+        for item in manifest["questions"]:
+            if item.get("status") != "queued":
+                continue
+            chapter = manifest["weeks"][str(item["week"])]
+            f.write(json.dumps({
+                "id": item["id"],
+                "answer": LOCAL_ANSWERERS[answerer](item, chapter),
+                "method": f"local:{answerer}",
+            }, ensure_ascii=False) + "\n")
+            item["status"] = "local"
+            count += 1
+    return count
+
+
+def answer_manifest_locally(manifest: dict, answers_path: Path, answerer: str = "echo") -> int:
+    """매니페스트의 모든 질문에 로컬 응답기로 답해 응답 JSONL을 쓴다. 반환값: 응답 수"""
+    answer = LOCAL_ANSWERERS[answerer]
+    with atomic_writer(answers_path) as f:
+        for item in manifest["questions"]:
+            chapter = manifest["weeks"][str(item["week"])]
+            # 왜: 로컬 응답기는 할당량을 쓰지 않으므로 대기열 상태와 무관하게 모두 답한다.
+            if "cached_answer" in item:
+                entry = {"id": item["id"], "answer": item["cached_answer"], "method": "cache"}
+            else:
+                entry = {"id": item["id"], "answer": answer(item, chapter), "method": f"local:{answerer}"}
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    record_bytes_written(answers_path)
+    return len(manifest["questions"])
+
+
+def load_answers(answers_path: Path) -> dict:
+    """
+    응답 JSONL을 {질문 ID: 응답 줄}로 읽는다.
+    왜: 일부 질문만 다시 질의해 파일 끝에 덧붙일 수 있도록 같은 ID는 나중 줄이 이긴다.
+    """
+    if not answers_path.exists():
+        raise FileNotFoundError(f"응답 파일이 없습니다: {answers_path}")
+    answers = {}
+    with open(answers_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️  응답 파일 {line_number}번째 줄을 읽을 수 없어 건너뜁니다.")
+                continue
+            if entry.get("id") and entry.get("answer") is not None:
+                answers[entry["id"]] = entry
+    return answers
+
+
+def ingest_answers(manifest: dict, answers: dict, cache: AnswerCache = None) -> list:
+    """
+    응답을 주차별로 묶어 save_analysis로 저장한다.
+    응답이 하나도 없는 주차는 기존 분석을 덮어쓰지 않도록 건너뛰고, 할당량을 기다리는(queued)
+    질문이 남은 주차는 다음 창에서 응답이 모일 때까지 미룬다. 저장한 주차는 매니페스트에서 뺀다.
+    cache가 주어지면 새로 받은 실제 응답을 매니페스트의 노트북 URL로 캐시에 넣는다.
+    반환값: 저장한 주차 번호 목록
+    """
+    known_ids = {item["id"] for item in manifest["questions"]}
+    unknown = [answer_id for answer_id in answers if answer_id not in known_ids]
+    if unknown:
+        print(f"⚠️  매니페스트에 없는 응답 {len(unknown)}개를 무시합니다: {', '.join(unknown[:5])}")
+
+    saved_weeks = []
+    for week_key, chapter in manifest["weeks"].items():
+        week_number = int(week_key)
+        items = [item for item in manifest["questions"] if item["week"] == week_number]
+        answered = [item for item in items if item["id"] in answers]
+        if not answered:
+            print(f"⚠️  Week {week_number}: 응답이 없어 건너뜁니다.")
+            continue
+        waiting = [item["id"] for item in items
+                   if item["id"] not in answers and item.get("status") == "queued"]
+        if waiting:
+            print(f"⏳ Week {week_number}: 할당량 대기 중인 질문 {len(waiting)}개가 남아 저장을 미룹니다.")
+            continue
+        if len(answered) < len(items):
+            missing = [item["id"] for item in items if item["id"] not in answers]
+            print(f"⚠️  Week {week_number}: 응답 누락 {len(missing)}개 ({', '.join(missing)})")
+
+        with StepMetrics("notebooklm_analyzed", week_number):
+            timestamp = datetime.now(KST).isoformat()
+            results = []
+            for item in items:
+                entry = answers.get(item["id"])
+                results.append({
+                    "method": entry.get("method", "mcp") if entry else "missing",
+                    "question": item["question"],
+                    "answer": entry["answer"] if entry else "(응답 없음)",
+                    "timestamp": timestamp,
+                })
+            save_analysis(results, week_number, chapter, use_cache=False)
+            if cache is not None:
+                remember_answers(results, manifest.get("notebook_url"), cache)
+        saved_weeks.append(week_number)
+
+    for week_number in saved_weeks:
+        del manifest["weeks"][str(week_number)]
+    manifest["questions"] = [item for item in manifest["questions"] if item["week"] not in saved_weeks]
+    return saved_weeks
+
+
+def _report_queue(manifest: dict, scheduler: QuotaScheduler) -> None:
+    """대기열에 남은 질문 수와 다음 질의 가능 시각을 출력한다."""
+    queued = sum(1 for item in manifest["questions"] if item.get("status") == "queued")
+    if not queued:
+        return
+    wait = scheduler.seconds_until(1)
+    print(f"⏳ 할당량 대기 질문 {queued}개 — 다음 질의 가능: {_format_eta(wait) if wait else '지금'}")
+    print(f"   python execution/notebooklm_query.py --dispatch --wait 로 이어서 진행하세요.")
+
+
+def print_dispatch(manifest: dict, items: list, answers_path: Path) -> None:
+    print(f"📡 이번에 호출할 질문 {len(items)}개 (호출 목록: {DISPATCH_PATH}):")
+    for item in items:
+        print(f"   [{item['id']}] {item['question'][:70]}{'...' if len(item['question']) > 70 else ''}")
+    print(f"\n💡 에이전트가 호출 목록의 질문마다 {manifest['tool']}을 호출하고,")
+    print(f"   응답을 한 줄에 하나씩 {{\"id\": ..., \"answer\": ...}}로 {answers_path}에 덧붙인 뒤")
+    print(f"   --ingest로 응답이 모인 주차 분석을 한 번에 저장하세요.")
+
+
+def run_batch(args) -> None:
+    """--batch / --dispatch / --answer-local / --ingest 모드를 실행한다."""
+    manifest_path = args.manifest
+    answers_path = args.answers
+    cache = None if args.no_cache else AnswerCache(ttl_days=args.cache_ttl_days)
+    scheduler = QuotaScheduler()
+
+    if args.batch:
+        weeks = args.weeks or ([args.week] if args.week else None)
+        if not weeks:
+            print("❌ --batch에는 --weeks(또는 --week)가 필요합니다.")
+            sys.exit(1)
+        if args.chapter and len(weeks) > 1:
+            print("❌ --chapter는 주차 하나에만 지정할 수 있습니다.")
+            sys.exit(1)
+        manifest = build_manifest(weeks, args.questions, args.chapter, cache)
+        new_items = list(manifest["questions"])
+        if manifest_path.exists():
+            try:
+                manifest = merge_manifests(load_manifest(manifest_path), manifest)
+            except ValueError as e:
+                print(f"⚠️  이전 매니페스트를 이어 쓸 수 없어 새로 만듭니다: {e}")
+        write_manifest(manifest, manifest_path)
+        kept_ids = {item["id"] for item in manifest["questions"]} - {item["id"] for item in new_items}
+        cached_count = rewrite_answers(answers_path, kept_ids, cached_answer_entries(new_items))
+        print(f"📋 매니페스트 생성: 주차 {len(weeks)}개, 질문 {len(new_items)}개 "
+              f"(캐시 응답 {cached_count}개, 질의 필요 {len(new_items) - cached_count}개)")
+        if len(manifest["questions"]) > len(new_items):
+            print(f"   이전 배치에서 이어지는 질문 {len(manifest['questions']) - len(new_items)}개 포함")
+        print(f"   {manifest_path}")
+        if cache is not None:
+            cache.save()
+            cache.print_stats()
+        if not manifest["notebook_url"]:
+            print("⚠️  NOTEBOOKLM_NOTEBOOK_URL이 설정되지 않았습니다.")
+        print(f"\n💡 --dispatch로 남은 할당량만큼 호출할 질문을 꺼내세요.")
+        return
+
+    try:
+        manifest = load_manifest(manifest_path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.dispatch:
+        current_week = _load_state().get("current_week")
+        queued = sum(1 for item in manifest["questions"] if item.get("status") == "queued")
+        if not queued:
+            print("✅ 할당량을 기다리는 질문이 없습니다.")
+            return
+        wait = scheduler.seconds_until(1)
+        if wait and args.wait:
+            # 왜: cron이나 루프에서 부르면 토큰이 찰 때까지 기다렸다가 이어서 진행한다.
+            print(f"⏳ 할당량 소진 — {_format_eta(wait)}까지 기다립니다.")
+            time.sleep(wait)
+        items = dispatch_questions(manifest, scheduler, current_week)
+        write_manifest(manifest, manifest_path)
+        if not items:
+            if args.local_fallback:
+                count = answer_queued_locally(manifest, answers_path)
+                write_manifest(manifest, manifest_path)
+                print(f"📚 NotebookLM 할당량이 없어 대기 질문 {count}개를 로컬 소스 검색으로 답했습니다.")
+                print(f"   --ingest로 주차 분석을 저장하세요.")
+                return
+            print("⏳ 지금은 NotebookLM 할당량이 없습니다.")
+            _report_queue(manifest, scheduler)
+            sys.exit(1)
+        write_dispatch(manifest, items)
+        print_dispatch(manifest, items, answers_path)
+        _report_queue(manifest, scheduler)
+        return
+
+    if args.answer_local:
+        count = answer_manifest_locally(manifest, answers_path, args.answerer)
+        print(f"🧪 로컬 응답기({args.answerer})로 응답 {count}개 생성: {answers_path}")
+        return
+
+    try:
+        answers = load_answers(answers_path)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    saved_weeks = ingest_answers(manifest, answers, cache)
+    write_manifest(manifest, manifest_path)
+    rewrite_answers(answers_path, {item["id"] for item in manifest["questions"]})
+    _report_queue(manifest, scheduler)
+    if not saved_weeks:
+        print("❌ 저장한 주차가 없습니다.")
+        sys.exit(1)
+    print(f"\n🎉 Week {', '.join(str(week) for week in saved_weeks)} 분석 저장 완료!")
+
+
+def drop_week_from_queue(manifest_path: Path, answers_path: Path, week_number: int) -> None:
+    """매니페스트 대기열에 남은 주차의 질문과 응답 줄을 지운다."""
+    if not manifest_path.exists():
+        return
+    try:
+        manifest = load_manifest(manifest_path)
+    except ValueError:
+        return
+    if str(week_number) not in manifest["weeks"]:
+        return
+    del manifest["weeks"][str(week_number)]
+    manifest["questions"] = [item for item in manifest["questions"] if item["week"] != week_number]
+    write_manifest(manifest, manifest_path)
+    rewrite_answers(answers_path, {item["id"] for item in manifest["questions"]})
+
+
+def queue_week_overflow(args, chapter_name: str, questions: list, cached_results: dict,
+                        dispatched: list, config: dict) -> None:
+    """
+    할당량이 모자란 단일 주차 질의를 매니페스트 대기열로 옮긴다.
+    지금 허용된 질문은 dispatched로 바로 호출 목록에 넣고, 나머지는 queued로 남긴다.
+    """
+    dispatched_at = datetime.now(KST).isoformat()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created_at": dispatched_at,
+        "tool": "mcp_notebooklm_ask_question",
+        "notebook_url": config.get("notebook_url"),
+        "answer_format": {"id": "질문 ID", "answer": "응답 텍스트", "method": "(선택) mcp/local 등"},
+        "weeks": {str(args.week): chapter_name},
+        "questions": [],
+    }
+    for i, question in enumerate(questions, 1):
+        item = {"id": f"w{args.week:02d}-q{i}", "week": args.week, "question": question, "status": "queued"}
+        if i in cached_results:
+            item["status"] = "cached"
+            item["cached_answer"] = cached_results[i]["answer"]
+        elif i in dispatched:
+            item["status"] = "dispatched"
+            item["dispatched_at"] = dispatched_at
+        manifest["questions"].append(item)
+    new_items = list(manifest["questions"])
+
+    if args.manifest.exists():
+        try:
+            manifest = merge_manifests(load_manifest(args.manifest), manifest)
+        except ValueError as e:
+            print(f"⚠️  이전 매니페스트를 이어 쓸 수 없어 새로 만듭니다: {e}")
+    write_manifest(manifest, args.manifest)
+    kept_ids = {item["id"] for item in manifest["questions"]} - {item["id"] for item in new_items}
+    rewrite_answers(args.answers, kept_ids, cached_answer_entries(new_items))
+
+    dispatched_items = [item for item in new_items if item["status"] == "dispatched"]
+    print(f"\n⚠️  NotebookLM 할당량이 모자라 Week {args.week} 질문을 대기열로 옮겼습니다 "
+          f"(지금 호출 {len(dispatched_items)}개, 대기 "
+          f"{sum(1 for item in new_items if item['status'] == 'queued')}개).")
+    if dispatched_items:
+        write_dispatch(manifest, dispatched_items)
+        print_dispatch(manifest, dispatched_items, args.answers)
+    _report_queue(manifest, QuotaScheduler())
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="NotebookLM 챕터 분석 질의 스크립트"
     )
     parser.add_argument(
-        "--week", type=int, required=True,
+        "--week", type=int,
         help="주차 번호 (1-23)"
     )
     parser.add_argument(
         "--chapter", type=str, default=None,
-        help="챕터 이름 (생략 시 state.json에서 현재 챕터 사용)"
+        help="챕터 이름 (생략 시 상태 저장소의 현재 챕터 사용)"
     )
     parser.add_argument(
         "--questions", nargs="+", default=None,
@@ -177,48 +1009,205 @@ def main():
     )
     parser.add_argument(
         "--auto", action="store_true",
-        help="state.json에서 자동으로 챕터와 설정을 가져옴"
+        help="상태 저장소에서 자동으로 챕터와 설정을 가져옴"
+    )
+
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--batch", action="store_true",
+        help="--weeks의 모든 질문을 매니페스트 하나로 생성"
+    )
+    mode.add_argument(
+        "--dispatch", action="store_true",
+        help="남은 할당량만큼 대기 질문을 꺼내 MCP 호출 목록 생성 (현재 주차 우선)"
+    )
+    mode.add_argument(
+        "--answer-local", action="store_true",
+        help="매니페스트의 질문에 로컬 대체 응답기로 답해 응답 파일 생성 (점검용)"
+    )
+    mode.add_argument(
+        "--ingest", action="store_true",
+        help="응답 파일(JSONL)을 읽어 주차별 분석을 한 번에 저장"
+    )
+    parser.add_argument(
+        "--weeks", type=int, nargs="+", default=None,
+        help="배치 대상 주차 번호 목록"
+    )
+    parser.add_argument(
+        "--manifest", type=Path, default=DEFAULT_MANIFEST_PATH,
+        help="매니페스트 경로 (기본: data/notebooklm/manifest.json)"
+    )
+    parser.add_argument(
+        "--answers", type=Path, default=DEFAULT_ANSWERS_PATH,
+        help="응답 JSONL 경로 (기본: data/notebooklm/answers.jsonl)"
+    )
+    parser.add_argument(
+        "--answerer", choices=sorted(LOCAL_ANSWERERS), default="echo",
+        help="--answer-local에서 사용할 로컬 응답기 (기본: echo)"
+    )
+    parser.add_argument(
+        "--local", action="store_true",
+        help="NotebookLM 대신 로컬 책 요약(data/sources/) BM25 검색으로 바로 답함"
+    )
+    parser.add_argument(
+        "--local-fallback", action="store_true",
+        help="할당량이 모자라면 대기열 대신 로컬 소스 검색으로 답함"
+    )
+    parser.add_argument(
+        "--wait", action="store_true",
+        help="--dispatch에서 할당량이 없으면 다음 토큰이 찰 때까지 기다림"
+    )
+    parser.add_argument(
+        "--quota-status", action="store_true",
+        help="NotebookLM 질의 할당량 상태만 출력"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="응답 캐시를 읽거나 쓰지 않음"
+    )
+    parser.add_argument(
+        "--cache-ttl-days", type=float, default=DEFAULT_CACHE_TTL_DAYS,
+        help=f"캐시 응답 유효 기간(일) (기본: {DEFAULT_CACHE_TTL_DAYS:g})"
+    )
+    parser.add_argument(
+        "--cache-stats", action="store_true",
+        help="응답 캐시 통계만 출력"
+    )
+    parser.add_argument(
+        "--invalidate-cache", nargs="*", default=None, metavar="QUESTION",
+        help="현재 노트북의 캐시 응답 삭제 (질문을 주면 그 질문만)"
     )
 
     args = parser.parse_args()
 
-    # --- 챕터 결정 ---
-    chapter_name = args.chapter
-    if chapter_name is None:
-        # state.json에서 현재 챕터 가져오기
-        state_path = DATA_DIR / "state.json"
-        if state_path.exists():
-            with open(state_path, "r", encoding="utf-8") as f:
-                state = json.load(f)
-            chapter_name = state.get("current_chapter", f"Week {args.week}")
-        else:
-            chapter_name = f"Week {args.week}"
+    if args.cache_stats or args.invalidate_cache is not None:
+        cache = AnswerCache(ttl_days=args.cache_ttl_days)
+        if args.invalidate_cache is not None:
+            notebook_url = load_notebooklm_config().get("notebook_url")
+            removed = cache.invalidate(notebook_url, args.invalidate_cache)
+            cache.save()
+            print(f"🗑️  캐시 응답 {removed}개 삭제 ({notebook_url or '노트북 URL 미설정'})")
+        cache.print_stats()
+        return
 
-    # --- 질문 생성 ---
-    questions = generate_chapter_questions(chapter_name, args.questions)
+    if args.quota_status:
+        QuotaScheduler().print_status()
+        return
 
-    print(f"📖 챕터: {chapter_name}")
-    print(f"📋 질문 {len(questions)}개 준비:")
-    for i, q in enumerate(questions, 1):
-        print(f"   Q{i}: {q[:80]}{'...' if len(q) > 80 else ''}")
+    if args.batch or args.dispatch or args.answer_local or args.ingest:
+        run_batch(args)
+        return
+    if args.week is None:
+        parser.error("--week가 필요합니다.")
 
-    # --- NotebookLM 설정 확인 ---
-    config = load_notebooklm_config()
-    if not config["notebook_url"]:
-        print("\n⚠️  NOTEBOOKLM_NOTEBOOK_URL이 설정되지 않았습니다.")
-        print("   .env 파일에 NOTEBOOKLM_NOTEBOOK_URL을 설정하거나,")
-        print("   에이전트가 mcp_notebooklm_ask_question 도구를 직접 호출해주세요.")
+    with StepMetrics("notebooklm_analyzed", args.week):
+        # --- 챕터 결정 ---
+        chapter_name = args.chapter
+        if chapter_name is None:
+            # 상태 저장소에서 현재 챕터 가져오기
+            chapter_name = _load_state().get("current_chapter", f"Week {args.week}")
 
-    # --- MCP 호출 지시 생성 ---
-    print("\n📡 NotebookLM MCP 호출 지시:")
-    for i, question in enumerate(questions, 1):
-        mcp_call = query_via_mcp(question, config.get("notebook_url"))
-        print(f"\n--- Q{i} ---")
-        print(json.dumps(mcp_call, ensure_ascii=False, indent=2))
+        # --- 질문 생성 ---
+        questions = generate_chapter_questions(chapter_name, args.questions)
+
+        print(f"📖 챕터: {chapter_name}")
+        print(f"📋 질문 {len(questions)}개 준비:")
+        for i, q in enumerate(questions, 1):
+            print(f"   Q{i}: {q[:80]}{'...' if len(q) > 80 else ''}")
+
+        # --- NotebookLM 설정 확인 ---
+        config = load_notebooklm_config()
+        if not config["notebook_url"]:
+            print("\n⚠️  NOTEBOOKLM_NOTEBOOK_URL이 설정되지 않았습니다.")
+            print("   .env 파일에 NOTEBOOKLM_NOTEBOOK_URL을 설정하거나,")
+            print("   에이전트가 mcp_notebooklm_ask_question 도구를 직접 호출해주세요.")
+
+        # --- 캐시 확인 ---
+        # 왜: 캐시에 있는 질문은 MCP 호출 지시 대신 저장된 응답을 바로 보여 준다.
+        cache = None if args.no_cache else AnswerCache(ttl_days=args.cache_ttl_days)
+        cached_results = {}
+        if cache is not None:
+            for i, question in enumerate(questions, 1):
+                entry = cache.get(config.get("notebook_url"), question)
+                if entry is not None:
+                    cached_results[i] = {
+                        "method": "cache",
+                        "question": question,
+                        "answer": entry["answer"],
+                        "timestamp": datetime.now(KST).isoformat(),
+                    }
+            cache.save()
+
+        if len(cached_results) == len(questions):
+            print("\n🗄️  모든 질문의 응답이 캐시에 있어 NotebookLM을 호출하지 않습니다.")
+            save_analysis([cached_results[i] for i in range(1, len(questions) + 1)],
+                          args.week, chapter_name, use_cache=False)
+            cache.print_stats()
+            return
+
+        # --- 로컬 소스 빠른 경로 ---
+        # 왜: MCP 장애 시나 빠르게 초안이 필요할 때 할당량을 쓰지 않고 책 요약 구절로 바로 답한다.
+        if args.local:
+            drop_week_from_queue(args.manifest, args.answers, args.week)
+            results = [
+                cached_results.get(i) or local_result(question, chapter_name)
+                for i, question in enumerate(questions, 1)
+            ]
+            print(f"\n📚 로컬 소스 검색으로 {len(questions) - len(cached_results)}개 질문에 답했습니다 "
+                  f"(NotebookLM 할당량 미사용).")
+            save_analysis(results, args.week, chapter_name, use_cache=False)
+            return
 
-    print(f"\n💡 에이전트가 위 지시에 따라 mcp_notebooklm_ask_question을 호출하고,")
-    print(f"   응답을 수집한 뒤 save_analysis()를 호출하면 Week {args.week} 분석이 완료됩니다.")
+        # --- 할당량 확인 ---
+        # 왜: 한도를 넘는 질문은 "내일 재시도" 대신 대기열(매니페스트)로 넘겨 --dispatch가 이어받게 한다.
+        scheduler = QuotaScheduler()
+        uncached = [i for i in range(1, len(questions) + 1) if i not in cached_results]
+        # 왜: 같은 주차를 다시 실행해 지시를 다시 출력해도 이미 허용한 질문은 할당량을 또 쓰지 않는다.
+        keys = {i: f"w{args.week:02d}:{normalize_question(questions[i - 1])}" for i in uncached}
+        granted_keys = scheduler.acquire_keys(list(keys.values()))
+        allowed = [i for i in uncached if keys[i] in granted_keys]
+        uncached = allowed + [i for i in uncached if keys[i] not in granted_keys]
+        granted = len(allowed)
+        if granted < len(uncached):
+            if not args.local_fallback:
+                queue_week_overflow(args, chapter_name, questions, cached_results, uncached[:granted], config)
+                return
+            # 왜: --local-fallback이면 할당량이 모자란 질문을 대기열 대신 로컬 소스 구절로 답한다.
+            for i in uncached[granted:]:
+                cached_results[i] = local_result(questions[i - 1], chapter_name)
+            print(f"\n📚 할당량이 모자라 {len(uncached) - granted}개 질문을 로컬 소스 검색으로 답했습니다.")
+            if granted == 0:
+                drop_week_from_queue(args.manifest, args.answers, args.week)
+                save_analysis([cached_results[i] for i in range(1, len(questions) + 1)],
+                              args.week, chapter_name, use_cache=False)
+                return
+
+        # 왜: 이전에 대기열로 넘긴 같은 주차 질문은 이번에 모두 호출하므로 대기열에서 뺀다.
+        drop_week_from_queue(args.manifest, args.answers, args.week)
+
+        # --- MCP 호출 지시 생성 ---
+        print("\n📡 NotebookLM MCP 호출 지시:")
+        for i, question in enumerate(questions, 1):
+            print(f"\n--- Q{i} ---")
+            if i in cached_results:
+                print(json.dumps(cached_results[i], ensure_ascii=False, indent=2))
+                continue
+            mcp_call = query_via_mcp(question, config.get("notebook_url"))
+            print(json.dumps(mcp_call, ensure_ascii=False, indent=2))
+
+        if cache is not None:
+            cache.print_stats()
+        print(f"\n💡 에이전트가 위 지시에 따라 mcp_notebooklm_ask_question을 호출하고,")
+        print(f"   캐시/로컬 응답(method: cache, local:bm25)과 함께 save_analysis()를 호출하면 "
+              f"Week {args.week} 분석이 완료됩니다.")
 
 
 if __name__ == "__main__":
-    main()
+    # 왜: 상주 데몬이 실행 중이면 MCP 호출 지시 생성을 맡기고, 없으면 직접 실행한다.
+    from pipeline_daemon import run_via_daemon
+
+    exit_code = run_via_daemon("notebooklm_query", sys.argv[1:])
+    if exit_code is None:
+        main()
+    else:
+        sys.exit(exit_code)
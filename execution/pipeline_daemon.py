@@ -0,0 +1,436 @@
+"""
+pipeline_daemon.py — 상주 파이프라인 데몬 (Unix 도메인 소켓)
+
+왜(Why) 이 모듈이 필요한가:
+  에이전트는 한 주차 동안 status, complete-step, MCP 호출 지시 생성 같은 짧은 명령을
+  수십 번 실행한다. 매번 인터프리터 기동, .env 파싱, 워크스페이스/챕터 로드,
+  state.json 로드를 반복하므로 명령 자체보다 준비 비용이 크다.
+  데몬은 이 상태와 캐시를 메모리에 유지한 채 기존 명령을 소켓으로 실행해 준다.
+  CLI는 데몬이 있으면 요청만 전달하는 얇은 클라이언트가 되고,
+  데몬이 없으면 지금처럼 프로세스 안에서 직접 실행한다.
+
+사용법:
+  python execution/pipeline_daemon.py start    # 포그라운드로 데몬 실행 (Ctrl+C로 종료)
+  python execution/pipeline_daemon.py status   # 데몬 상태 확인
+  python execution/pipeline_daemon.py reload   # 워크스페이스/설정 캐시 비우기
+  python execution/pipeline_daemon.py stop     # 데몬 종료
+
+  데몬 실행 중에는 기존 명령이 자동으로 데몬을 거친다:
+  python execution/state_manager.py status
+  python execution/notebooklm_query.py --week 1 --auto
+
+  WYSH_NO_DAEMON=1을 설정하면 데몬을 거치지 않고 항상 프로세스 안에서 실행한다.
+
+프로토콜:
+  클라이언트는 JSON 한 줄 요청을 보내고, 데몬은 출력 조각({"stdout": "..."})을
+  JSON 줄 단위로 스트리밍한 뒤 마지막에 {"exit_code": N}을 보낸다.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from workspace_paths import DATA_DIR_ENV
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SOCKET_PATH = Path(os.environ.get("WYSH_DAEMON_SOCKET") or PROJECT_ROOT / "data" / "pipeline-daemon.sock")
+
+KST = timezone(timedelta(hours=9))
+
+# 왜: 연결 시도는 데몬이 없을 때 폴백이 지연되지 않도록 짧게 끊는다.
+CONNECT_TIMEOUT_SECONDS = 0.5
+# 왜: 데몬은 요청을 하나씩 처리하므로 앞선 요청에 묶여 있거나 멈췄다면 수락 응답이 오지 않는다.
+# 이 시간 안에 수락되지 않은 요청은 데몬이 실행하지 않으므로 클라이언트가 직접 실행해도 안전하다.
+ACCEPT_TIMEOUT_SECONDS = float(os.environ.get("WYSH_DAEMON_ACCEPT_TIMEOUT", "5"))
+# 왜: 수락된 뒤 데몬이 이 시간 동안 아무 출력도 보내지 않으면 멈춘 것으로 보고 끊는다.
+# 이미 실행이 시작되었으므로 재실행하지 않고 오류로 끝낸다.
+IDLE_TIMEOUT_SECONDS = float(os.environ.get("WYSH_DAEMON_TIMEOUT", "600"))
+# 왜: 데몬이 수락 기한 직전에 수락 응답을 보낸 경우 클라이언트가 먼저 폴백하지 않도록 여유를 둔다.
+ACCEPT_GRACE_SECONDS = 1.0
+# 왜: 데몬은 요청을 하나씩 처리하므로, 연결만 하고 요청을 보내지 않는 클라이언트를 기다리면
+# 그동안 다른 요청이 모두 멈춘다. 클라이언트는 연결 직후 요청을 보내므로 짧게 끊는다.
+REQUEST_READ_TIMEOUT_SECONDS = 5.0
+
+# --- 데몬이 대신 실행할 수 있는 명령 ---
+# 왜: 데몬은 요청을 하나씩 순서대로 처리한다(sys.argv/stdout을 요청마다 바꿔 끼우므로).
+# run-week/run-all/backfill처럼 몇 분씩 걸리는 명령을 데몬에서 돌리면 그동안 다른 짧은
+# 명령이 모두 대기하므로, 짧은 명령만 데몬에 맡기고 나머지는 클라이언트가 직접 실행한다.
+# 서브커맨드가 없는 스크립트(notebooklm_query)는 실행 방식을 정하는 옵션 이름으로 허용한다.
+DAEMON_COMMANDS = {
+    "state_manager": {
+        "status", "reindex", "init-week", "next", "complete-step",
+        "workspaces", "create-workspace", "profile", "migrate-sqlite", "export-json",
+    },
+    "notebooklm_query": {
+        "--week", "--batch", "--ingest", "--answer-local",
+        "--quota-status", "--cache-stats", "--invalidate-cache",
+    },
+    "transcript_search": {"search", "stats"},
+}
+
+# 왜: 허용된 명령과 함께 써도 오래 걸리는 옵션. --dispatch --wait는 할당량 토큰이 찰 때까지
+# 최대 30분 가까이 잠들 수 있어, 데몬에서 돌리면 그동안 다른 요청이 모두 멈춘다.
+DAEMON_EXCLUDED_OPTIONS = {
+    "notebooklm_query": {"--dispatch", "--wait"},
+}
+
+# 왜: 이 값들은 스크립트가 import 시점에 읽거나 저장소 선택에 쓰이므로,
+# 클라이언트와 데몬의 값이 다르면 데몬의 캐시된 결과가 틀리다. 이때는 클라이언트가 직접 실행한다.
+PINNED_ENV_KEYS = [DATA_DIR_ENV, "STATE_BACKEND"]
+
+# 왜: 데몬 프로세스 안에서 main()을 호출할 때 다시 데몬으로 요청을 보내지 않게 표시한다.
+DAEMON_PROCESS_ENV = "WYSH_DAEMON_PROCESS"
+
+
+def _send(conn: socket.socket, message: dict) -> None:
+    conn.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class _SocketWriter:
+    """
+    print() 출력을 클라이언트 소켓으로 흘려보내는 파일 객체.
+    왜: 출력을 모았다가 한 번에 보내면 complete-step 등의 진행 메시지가 늦게 보이므로
+    write() 호출마다 바로 전달한다.
+    클라이언트가 먼저 끊어져도(`| head` 등) 상태 변경 명령이 중간에 멈추지 않도록
+    이후 출력은 버리고 명령은 끝까지 실행한다.
+    """
+
+    def __init__(self, conn: socket.socket, stream: str):
+        self.conn = conn
+        self.stream = stream
+        self.disconnected = False
+
+    def write(self, text: str) -> int:
+        if text and not self.disconnected:
+            try:
+                _send(self.conn, {self.stream: text})
+            except OSError:
+                self.disconnected = True
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def is_eligible(script: str, argv: list) -> bool:
+    """요청을 데몬에 맡길 수 있는 명령인지 판단한다."""
+    if script not in DAEMON_COMMANDS:
+        return False
+    allowed = DAEMON_COMMANDS[script]
+    # 왜: argparse는 --opt=값 형식과 줄인 옵션 이름(--disp)도 받으므로 앞부분 일치로 막는다.
+    options = [arg.split("=", 1)[0] for arg in argv if arg.startswith("--") and len(arg) > 2]
+    excluded = DAEMON_EXCLUDED_OPTIONS.get(script, set())
+    if any(name.startswith(option) for option in options for name in excluded):
+        return False
+    if all(command.startswith("--") for command in allowed):
+        return any(option in allowed for option in options)
+
+    # 왜: --workspace <name>은 명령보다 앞에 올 수 있으므로 건너뛰고 명령 이름을 찾는다.
+    args = list(argv)
+    if "--workspace" in args:
+        index = args.index("--workspace")
+        del args[index:index + 2]
+    return bool(args) and args[0] in allowed
+
+
+def run_via_daemon(script: str, argv: list) -> int:
+    """
+    데몬이 실행 중이면 명령을 맡기고 종료 코드를 반환한다.
+    데몬이 없거나 맡길 수 없는 명령이면 None을 반환하며, 호출자가 직접 실행한다.
+    """
+    if os.environ.get(DAEMON_PROCESS_ENV) or os.environ.get("WYSH_NO_DAEMON"):
+        return None
+    if not hasattr(socket, "AF_UNIX") or not SOCKET_PATH.exists():
+        return None
+    if not is_eligible(script, argv):
+        return None
+
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(CONNECT_TIMEOUT_SECONDS)
+        conn.connect(str(SOCKET_PATH))
+    except OSError:
+        # 왜: 데몬이 비정상 종료해 소켓 파일만 남은 경우다. 직접 실행으로 넘어간다.
+        return None
+
+    request = {
+        "command": "run",
+        "script": script,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {key: os.environ.get(key) for key in PINNED_ENV_KEYS + ["WYSH_WORKSPACE"]},
+        # 왜: 이 시각이 지난 요청은 데몬이 실행하지 않는다. 클라이언트가 폴백한 뒤
+        # 뒤늦게 데몬이 같은 명령을 한 번 더 실행하는 일을 막는다.
+        "accept_by": time.time() + ACCEPT_TIMEOUT_SECONDS,
+    }
+    started_output = False
+    accepted = False
+    with conn:
+        conn.settimeout(ACCEPT_TIMEOUT_SECONDS + ACCEPT_GRACE_SECONDS)
+        try:
+            _send(conn, request)
+            for message in _read_messages(conn):
+                if message.get("fallback"):
+                    return None
+                if message.get("accepted"):
+                    accepted = True
+                    conn.settimeout(IDLE_TIMEOUT_SECONDS)
+                elif "stdout" in message:
+                    started_output = True
+                    sys.stdout.write(message["stdout"])
+                    sys.stdout.flush()
+                elif "stderr" in message:
+                    started_output = True
+                    sys.stderr.write(message["stderr"])
+                    sys.stderr.flush()
+                elif "exit_code" in message:
+                    return message["exit_code"]
+        except BrokenPipeError:
+            # 왜: 출력을 받는 쪽(`| head` 등)이 먼저 닫힌 경우다. 데몬 쪽 명령은 끝까지 실행된다.
+            return 1
+        except socket.timeout:
+            if not accepted:
+                print(f"ℹ️  데몬이 {ACCEPT_TIMEOUT_SECONDS:g}초 안에 요청을 받지 않아 직접 실행합니다.", file=sys.stderr)
+                return None
+            print(
+                f"❌ 데몬이 {IDLE_TIMEOUT_SECONDS:g}초 동안 응답하지 않습니다. 명령이 일부 실행되었을 수 있으니 "
+                f"상태를 확인한 뒤 `python execution/pipeline_daemon.py status`로 데몬을 점검하거나 "
+                f"WYSH_NO_DAEMON=1로 직접 실행해주세요.",
+                file=sys.stderr,
+            )
+            return 1
+
+    # 왜: 수락된 뒤 연결이 끊기면 명령이 일부 실행되었을 수 있으므로 재실행하지 않는다.
+    if accepted or started_output:
+        print("❌ 데몬 연결이 명령 실행 도중 끊겼습니다. 상태를 확인한 뒤 다시 실행해주세요.")
+        return 1
+    return None
+
+
+def _read_messages(conn: socket.socket):
+    """소켓에서 JSON 줄 메시지를 하나씩 읽는다."""
+    buffer = b""
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            if line.strip():
+                yield json.loads(line.decode("utf-8"))
+
+
+def send_control(command: str) -> dict:
+    """데몬에 제어 명령(ping/reload/shutdown)을 보내고 응답을 반환한다. 데몬이 없으면 None."""
+    if not hasattr(socket, "AF_UNIX") or not SOCKET_PATH.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(CONNECT_TIMEOUT_SECONDS)
+            conn.connect(str(SOCKET_PATH))
+            _send(conn, {"command": command})
+            for message in _read_messages(conn):
+                return message
+    except (OSError, json.JSONDecodeError):
+        return None
+    return None
+
+
+class PipelineDaemon:
+    """
+    요청마다 스크립트의 main()을 같은 프로세스에서 호출하는 상주 서버.
+    왜: 모듈을 한 번만 import하므로 state_manager의 워크스페이스 캐시(챕터/설정),
+    저장소 인스턴스(SQLite 연결), state.json 캐시가 요청 사이에 유지된다.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(KST).isoformat()
+        self.requests_served = 0
+        self.fallbacks = 0
+        self.running = True
+
+    def serve(self) -> None:
+        if send_control("ping") is not None:
+            print(f"⚠️  데몬이 이미 실행 중입니다: {SOCKET_PATH}")
+            return
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+        SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+        os.environ[DAEMON_PROCESS_ENV] = "1"
+        # 왜: 자식 프로세스는 환경 변수를 물려받으므로, 데몬 프로세스만 표시하려면 모듈 상태로 알린다.
+        importlib.import_module("step_metrics").mark_shared_process()
+        # 왜: 첫 요청부터 빠르게 응답하도록 주요 모듈을 미리 import한다.
+        for script in DAEMON_COMMANDS:
+            importlib.import_module(script)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(SOCKET_PATH))
+        # 왜: 소켓으로 상태 변경 명령을 실행할 수 있으므로 소유자만 접근하게 한다.
+        os.chmod(SOCKET_PATH, 0o600)
+        server.listen(16)
+        print(f"🟢 파이프라인 데몬 시작: {SOCKET_PATH} (pid {os.getpid()})")
+
+        try:
+            while self.running:
+                conn, _ = server.accept()
+                with conn:
+                    conn.settimeout(REQUEST_READ_TIMEOUT_SECONDS)
+                    try:
+                        self.handle(conn)
+                    except (BrokenPipeError, ConnectionResetError, socket.timeout, ValueError):
+                        # 왜: 클라이언트가 Ctrl+C로 먼저 끊거나, 요청을 보내지 않거나, 깨진 요청을
+                        # 보내도 데몬은 계속 동작해야 한다.
+                        pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if SOCKET_PATH.exists():
+                SOCKET_PATH.unlink()
+            print(f"\n🔴 파이프라인 데몬 종료 (처리한 요청 {self.requests_served}개)")
+
+    def handle(self, conn: socket.socket) -> None:
+        request = next(_read_messages(conn), None)
+        if request is None:
+            return
+        # 왜: 요청을 받은 뒤에는 출력을 보내기만 한다. 출력을 읽지 않는 클라이언트에 막혀도
+        # 클라이언트의 무응답 기준만큼만 기다리고, 그 뒤 출력은 버린 채 명령을 끝까지 실행한다.
+        conn.settimeout(IDLE_TIMEOUT_SECONDS)
+
+        command = request.get("command")
+        if command == "ping":
+            _send(conn, {
+                "pid": os.getpid(),
+                "started_at": self.started_at,
+                "requests_served": self.requests_served,
+                "fallbacks": self.fallbacks,
+                "socket": str(SOCKET_PATH),
+            })
+        elif command == "reload":
+            self.reload()
+            _send(conn, {"reloaded": True})
+        elif command == "shutdown":
+            self.running = False
+            _send(conn, {"stopped": True})
+        elif command == "run":
+            self.run_command(conn, request)
+        else:
+            _send(conn, {"stderr": f"❌ 알 수 없는 데몬 요청: '{command}'\n"})
+            _send(conn, {"exit_code": 1})
+
+    def reload(self) -> None:
+        """
+        워크스페이스/저장소 캐시를 비운다.
+        왜: workspace.json, chapters.json, .env의 STATE_BACKEND를 고친 뒤
+        데몬을 재시작하지 않고 반영하기 위함.
+        """
+        state_manager = importlib.import_module("state_manager")
+        state_manager._workspaces.clear()
+        importlib.import_module("transcript_search").get_index().invalidate()
+        print(f"🔄 캐시 초기화 ({datetime.now(KST).strftime('%H:%M:%S')})")
+
+    def run_command(self, conn: socket.socket, request: dict) -> None:
+        script = request.get("script")
+        argv = request.get("argv", [])
+        client_env = request.get("env", {})
+
+        pinned_mismatch = any(client_env.get(key) != os.environ.get(key) for key in PINNED_ENV_KEYS)
+        if not is_eligible(script, argv) or pinned_mismatch:
+            self.fallbacks += 1
+            _send(conn, {"fallback": True})
+            return
+        # 왜: 수락 기한이 지난 요청은 클라이언트가 이미 직접 실행했으므로 건너뛴다.
+        if time.time() > request.get("accept_by", float("inf")):
+            self.fallbacks += 1
+            print(f"   {script} {' '.join(argv)} → 수락 기한 초과로 건너뜀")
+            return
+        _send(conn, {"accepted": True})
+
+        module = importlib.import_module(script)
+        saved = (sys.argv, sys.stdout, sys.stderr, os.getcwd(), os.environ.get("WYSH_WORKSPACE"))
+        sys.argv = [f"{script}.py"] + argv
+        sys.stdout = _SocketWriter(conn, "stdout")
+        sys.stderr = _SocketWriter(conn, "stderr")
+        # 왜: --output 같은 상대 경로는 클라이언트 작업 디렉토리 기준이어야 한다.
+        os.chdir(request.get("cwd") or str(PROJECT_ROOT))
+        # 왜: step_metrics는 WYSH_WORKSPACE로 기록할 워크스페이스를 정한다.
+        if client_env.get("WYSH_WORKSPACE"):
+            os.environ["WYSH_WORKSPACE"] = client_env["WYSH_WORKSPACE"]
+        else:
+            os.environ.pop("WYSH_WORKSPACE", None)
+
+        start = time.perf_counter()
+        exit_code = 0
+        try:
+            module.main()
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                exit_code = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except Exception as e:
+            # 왜: 한 요청의 예외로 데몬 전체가 죽으면 안 된다.
+            print(f"❌ 데몬에서 명령 실행 중 오류: {type(e).__name__}: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.argv, sys.stdout, sys.stderr = saved[0], saved[1], saved[2]
+            os.chdir(saved[3])
+            if saved[4] is None:
+                os.environ.pop("WYSH_WORKSPACE", None)
+            else:
+                os.environ["WYSH_WORKSPACE"] = saved[4]
+
+        self.requests_served += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"   {script} {' '.join(argv)} → {exit_code} ({elapsed_ms:.1f}ms)")
+        _send(conn, {"exit_code": exit_code})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="상주 파이프라인 데몬 (Unix 도메인 소켓)"
+    )
+    parser.add_argument(
+        "action", choices=["start", "stop", "status", "reload"],
+        help="start: 데몬 실행, stop: 종료, status: 상태 확인, reload: 캐시 초기화"
+    )
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ 이 플랫폼은 Unix 도메인 소켓을 지원하지 않습니다. 명령은 기존처럼 직접 실행됩니다.")
+        sys.exit(1)
+
+    if args.action == "start":
+        PipelineDaemon().serve()
+        return
+
+    response = send_control({"stop": "shutdown", "status": "ping", "reload": "reload"}[args.action])
+    if response is None:
+        print(f"ℹ️  실행 중인 데몬이 없습니다: {SOCKET_PATH}")
+        sys.exit(1)
+
+    if args.action == "status":
+        print(f"🟢 데몬 실행 중 (pid {response['pid']})")
+        print(f"   소켓: {response['socket']}")
+        print(f"   시작: {response['started_at']}")
+        print(f"   처리한 요청: {response['requests_served']}개, 직접 실행으로 돌려보낸 요청: {response['fallbacks']}개")
+    elif args.action == "stop":
+        print("🔴 데몬 종료 요청 완료")
+    else:
+        print("🔄 데몬 캐시 초기화 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+segment_store.py — 열 단위(columnar) 트랜스크립트 세그먼트 바이너리 저장소
+
+왜(Why) 이 모듈이 필요한가:
+  하류에서 필요한 것은 start/duration 배열과 텍스트뿐인데, JSON/JSONL은 읽을 때마다
+  세그먼트 전체를 딕셔너리로 파싱해야 한다. 영상 수백 개에서 "이 시각의 자막"을 찾으려면
+  파싱 비용이 검색 비용보다 크다. 이 모듈은 세그먼트를 고정 폭 배열과 텍스트 덩어리로 저장하여
+  mmap으로 연 뒤 파싱 없이 임의 접근하고, 시작 시각 배열에서 이진 탐색(O(log n))으로 찾는다.
+
+파일 레이아웃 (transcript_segments.bin, 모든 정수/실수는 little-endian):
+  header   : magic "WYSHSEG1", version(u32), 세그먼트 수 n(u32), 영상 수 m(u32), 예약(u32)
+  videos   : m × [video_id(16바이트, NUL 패딩), 첫 세그먼트 번호(u32), 세그먼트 수(u32)]
+  start    : n × f64
+  duration : n × f64
+  offsets  : (n + 1) × u64   텍스트 덩어리 안에서 세그먼트 i의 범위는 offsets[i]:offsets[i+1]
+  text     : UTF-8 텍스트 덩어리
+
+사용법:
+  with SegmentStore(path) as store:
+      store.segment_at(125.0, video_id="VIDEO_ID")   # 해당 시각의 세그먼트
+      store.segment(0)                                # {"video_id", "text", "start", "duration"}
+      store.as_numpy()                                # NumPy 설치 시 start/duration/offsets 배열 (복사 없음)
+"""
+
+import bisect
+import mmap
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+
+from atomic_io import atomic_writer
+
+# 왜: NumPy는 선택 의존성이다. 없으면 struct 기반 접근만 사용한다.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"WYSHSEG1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+VIDEO_ENTRY = struct.Struct("<16sII")
+VIDEO_ID_BYTES = 16
+
+
+class SegmentStoreWriter:
+    """
+    세그먼트를 하나씩 받아 열 단위 바이너리 파일로 쓰는 저장기.
+    왜: 열마다 임시 파일에 바로 이어 쓰고 마지막에 이어 붙이므로,
+    세그먼트 목록 전체를 메모리에 들고 있지 않아도 된다 (TranscriptWriter와 같은 스트리밍 방식).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self.videos = []
+        self.text_bytes = 0
+        self._columns = None
+
+    def __enter__(self):
+        self._columns = {
+            name: tempfile.TemporaryFile("w+b")
+            for name in ("start", "duration", "offsets", "text")
+        }
+        self._columns["offsets"].write(struct.pack("<Q", 0))
+        return self
+
+    def add(self, video_id: str, segment: dict) -> None:
+        encoded_id = video_id.encode("utf-8")
+        if len(encoded_id) > VIDEO_ID_BYTES:
+            raise ValueError(f"video_id가 {VIDEO_ID_BYTES}바이트를 넘습니다: {video_id}")
+
+        # 왜: 같은 영상의 세그먼트는 연속으로 들어오므로 영상 경계에서만 새 항목을 만든다.
+        if not self.videos or self.videos[-1][0] != video_id:
+            self.videos.append([video_id, self.count, 0])
+        self.videos[-1][2] += 1
+
+        text = segment["text"].encode("utf-8")
+        self.text_bytes += len(text)
+        self._columns["start"].write(struct.pack("<d", segment["start"]))
+        self._columns["duration"].write(struct.pack("<d", segment.get("duration", 0)))
+        self._columns["offsets"].write(struct.pack("<Q", self.text_bytes))
+        self._columns["text"].write(text)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._finish()
+        finally:
+            for column in self._columns.values():
+                column.close()
+        return False
+
+    def _finish(self) -> None:
+        # 왜: 읽는 쪽이 반쯤 쓰인 파일을 mmap하지 않도록 임시 파일을 rename한다.
+        with atomic_writer(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.count, len(self.videos), 0))
+            for video_id, first, count in self.videos:
+                f.write(VIDEO_ENTRY.pack(video_id.encode("utf-8"), first, count))
+            for name in ("start", "duration", "offsets", "text"):
+                self._columns[name].seek(0)
+                shutil.copyfileobj(self._columns[name], f)
+
+
+class _Column:
+    """mmap 위의 고정 폭 배열을 시퀀스처럼 읽는 뷰 (bisect에 그대로 넘길 수 있다)."""
+
+    def __init__(self, buffer, offset: int, length: int, fmt: str):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+        self.item = struct.Struct(fmt)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int):
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.item.unpack_from(self.buffer, self.offset + index * self.item.size)[0]
+
+
+class SegmentStore:
+    """
+    transcript_segments.bin을 mmap으로 열어 파싱 없이 읽는 저장소.
+    왜: 파일 전체를 읽지 않고 필요한 세그먼트의 바이트만 운영체제 페이지 캐시에서 가져온다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, video_count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"세그먼트 저장소 형식이 아닙니다: {self.path}")
+        self.count = count
+
+        position = HEADER.size
+        self.videos = {}
+        for i in range(video_count):
+            raw_id, first, length = VIDEO_ENTRY.unpack_from(self._map, position + i * VIDEO_ENTRY.size)
+            self.videos[raw_id.rstrip(b"\0").decode("utf-8")] = (first, length)
+        position += video_count * VIDEO_ENTRY.size
+
+        self._video_ids = sorted(self.videos, key=lambda video_id: self.videos[video_id][0])
+        self._video_firsts = [self.videos[video_id][0] for video_id in self._video_ids]
+
+        self.start_offset = position
+        self.starts = _Column(self._map, position, count, "<d")
+        position += count * 8
+        self.duration_offset = position
+        self.durations = _Column(self._map, position, count, "<d")
+        position += count * 8
+        self.offsets_offset = position
+        self.offsets = _Column(self._map, position, count + 1, "<Q")
+        position += (count + 1) * 8
+        self.text_offset = position
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def text(self, index: int) -> str:
+        start = self.text_offset + self.offsets[index]
+        end = self.text_offset + self.offsets[index + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def video_of(self, index: int) -> str:
+        """세그먼트가 속한 영상 ID (영상 경계 목록에서 이진 탐색)."""
+        return self._video_ids[bisect.bisect_right(self._video_firsts, index) - 1]
+
+    def segment(self, index: int) -> dict:
+        return {
+            "video_id": self.video_of(index),
+            "text": self.text(index),
+            "start": self.starts[index],
+            "duration": self.durations[index],
+        }
+
+    def segment_at(self, seconds: float, video_id: str = None) -> dict:
+        """
+        주어진 시각에 재생 중인 세그먼트를 반환한다. 없으면 None.
+        왜: 번들에는 영상마다 0초부터 시작하는 구간이 이어져 있으므로 영상 범위 안에서만 탐색한다.
+        video_id를 생략하면 첫 번째 영상에서 찾는다.
+        """
+        if not self.count:
+            return None
+        if video_id is None:
+            video_id = self._video_ids[0]
+        if video_id not in self.videos:
+            return None
+
+        first, length = self.videos[video_id]
+        # 왜: 세그먼트 사이의 빈 구간에서는 다음 세그먼트가 아직 시작하지 않았으므로
+        # 직전 자막을 돌려준다 (영상 플레이어 자막 동기화와 같은 동작).
+        index = bisect.bisect_right(self.starts, seconds, first, first + length) - 1
+        if index < first:
+            return None
+        return self.segment(index)
+
+    def as_numpy(self) -> dict:
+        """
+        start/duration/offsets를 mmap 위의 NumPy 배열로 반환한다 (복사 없음).
+        왜: 대량 집계(총 길이, 구간 필터링)는 벡터 연산이 훨씬 빠르다.
+        반환된 배열이 남아 있는 동안에는 close()할 수 없으므로 사용 후 참조를 놓아야 한다.
+        """
+        if np is None:
+            raise ImportError("numpy가 설치되지 않았습니다. 설치: pip install numpy")
+        return {
+            "start": np.frombuffer(self._map, dtype="<f8", count=self.count, offset=self.start_offset),
+            "duration": np.frombuffer(self._map, dtype="<f8", count=self.count, offset=self.duration_offset),
+            "offsets": np.frombuffer(self._map, dtype="<u8", count=self.count + 1, offset=self.offsets_offset),
+        }
@@ -0,0 +1,325 @@
+"""
+source_retriever.py — 책 요약 소스의 오프라인 BM25 검색
+
+왜(Why) 이 스크립트가 필요한가:
+  챕터 질문은 모두 원격 NotebookLM MCP를 거치는데, 책 요약은 이미
+  data/sources/this-is-marketing-summary.md에 로컬로 있다. 이 스크립트는 요약을 챕터별 구절로 나눠
+  BM25 색인을 미리 만들어 두고, 질문마다 근거 구절을 출처(파일:줄, 챕터, 소제목)와 함께 즉시 돌려준다.
+  notebooklm_query.py가 빠른 경로(--local)로, 또는 MCP 장애/할당량 소진 시 대체 응답기로 쓴다.
+
+구절 단위:
+  "## Chapter N: 제목" 아래의 "### 소제목" 블록. 블록이 길면 목록 항목 경계에서 나눈다.
+  질문에 "Chapter 3~5"처럼 챕터 번호가 있으면 그 챕터 구절만 후보로 삼는다.
+
+색인:
+  data/cache/source-index.json (소스 파일 해시가 바뀌면 자동 재생성)
+
+사용법:
+  python execution/source_retriever.py ask "smallest viable market" [--chapter 4] [--limit 3]
+  python execution/source_retriever.py build
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+import time
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+from transcript_search import BM25_B, BM25_K1, tokenize
+from workspace_paths import PROJECT_ROOT
+
+SOURCE_PATH = PROJECT_ROOT / "data" / "sources" / "this-is-marketing-summary.md"
+# 왜: 색인은 소스에서 언제든 다시 만들 수 있으므로 공용 캐시 디렉토리에 둔다.
+SOURCE_INDEX_PATH = PROJECT_ROOT / "data" / "cache" / "source-index.json"
+
+# 왜: 형식이나 토큰화가 바뀌면 올려서 기존 색인을 무효화한다.
+SOURCE_INDEX_VERSION = 1
+
+DEFAULT_PASSAGE_LIMIT = 3
+# 왜: 구절이 너무 길면 BM25 길이 정규화로 묻히고, 인용하기에도 길다.
+MAX_PASSAGE_WORDS = 120
+
+CHAPTER_HEADING = re.compile(r"^## Chapter (\d+):\s*(.+)$")
+SECTION_HEADING = re.compile(r"^###\s+(.+)$")
+# "Chapter 4", "Chapter 3~5", "Chapter 2 & 3", "Chapter 6-8"
+# 왜: "~"와 "-"는 범위, "&"와 ","는 나열이다 ("Chapter 2 & 9"는 {2, 9}).
+CHAPTER_REFERENCE = re.compile(r"chapter\s*(\d+)(?:\s*([~&,-])\s*(\d+))?", re.IGNORECASE)
+
+# 왜: 기본 질문은 한국어이고 요약은 영어다. 형태소 분석기나 번역 없이도 핵심 개념이 맞도록
+# 자주 쓰는 마케팅 용어만 영어 검색어로 확장한다.
+QUERY_GLOSSARY = {
+    "마케팅": "marketing",
+    "원칙": "principles",
+    "핵심": "core",
+    "예시": "example",
+    "고객": "customers",
+    "시장": "market",
+    "최소": "smallest viable",
+    "실수": "mistake",
+    "오류": "wrong",
+    "경고": "warning",
+    "이야기": "story stories",
+    "신뢰": "trust",
+    "긴장": "tension",
+    "지위": "status",
+    "문화": "culture",
+    "브랜드": "brand",
+    "가격": "price pricing",
+    "광고": "advertising ads",
+    "관대": "generous generosity",
+    "변화": "change",
+    "청중": "audience",
+    "부족": "tribe",
+    "적용": "application",
+}
+
+
+def parse_passages(source_path: Path = SOURCE_PATH) -> list:
+    """요약 파일을 챕터/소제목 단위 구절 목록으로 나눈다."""
+    passages = []
+    chapter = None
+    chapter_title = None
+    section = None
+    block = []
+    block_line = None
+
+    def flush():
+        nonlocal block, block_line
+        if chapter is not None and block:
+            _split_block(passages, block, block_line, chapter, chapter_title, section)
+        block = []
+        block_line = None
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            chapter_match = CHAPTER_HEADING.match(line)
+            if chapter_match or line.startswith("## "):
+                flush()
+                # 왜: "## Overview" 같은 챕터 밖 섹션은 특정 챕터 근거가 아니므로 구절로 쓰지 않는다.
+                chapter = int(chapter_match.group(1)) if chapter_match else None
+                chapter_title = chapter_match.group(2).strip() if chapter_match else None
+                section = None
+                continue
+            section_match = SECTION_HEADING.match(line)
+            if section_match:
+                flush()
+                section = section_match.group(1).strip()
+                continue
+            if not line.strip() or line.strip() == "---":
+                continue
+            if block_line is None:
+                block_line = line_number
+            block.append((line_number, line))
+    flush()
+    return passages
+
+
+def _split_block(passages: list, block: list, first_line: int, chapter: int,
+                 chapter_title: str, section: str) -> None:
+    """소제목 블록을 목록 항목 경계에서 MAX_PASSAGE_WORDS 이하 구절로 나눈다."""
+    current = []
+    words = 0
+    for line_number, line in block:
+        line_words = len(line.split())
+        # 왜: 하위 항목(들여쓴 줄)은 상위 항목과 떨어지면 뜻을 잃으므로 최상위 항목 경계에서만 나눈다.
+        top_level = not line.startswith((" ", "\t"))
+        if current and top_level and words + line_words > MAX_PASSAGE_WORDS:
+            _append_passage(passages, current, chapter, chapter_title, section)
+            current = []
+            words = 0
+        current.append((line_number, line))
+        words += line_words
+    if current:
+        _append_passage(passages, current, chapter, chapter_title, section)
+
+
+def _append_passage(passages: list, lines: list, chapter: int, chapter_title: str, section: str) -> None:
+    passages.append({
+        "id": f"ch{chapter:02d}-{sum(1 for p in passages if p['chapter'] == chapter) + 1}",
+        "chapter": chapter,
+        "chapter_title": chapter_title,
+        "section": section or "",
+        "line": lines[0][0],
+        "text": "\n".join(line for _, line in lines),
+    })
+
+
+def _source_hash(source_path: Path) -> str:
+    with open(source_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_index(source_path: Path = SOURCE_PATH, index_path: Path = SOURCE_INDEX_PATH) -> dict:
+    """구절을 나누고 BM25 통계를 계산해 색인 파일로 저장한다."""
+    passages = parse_passages(source_path)
+    document_frequency = {}
+    for passage in passages:
+        # 왜: 챕터 제목과 소제목도 검색 대상에 넣어 "Smallest Viable Market" 같은 제목 질의가 맞게 한다.
+        terms = tokenize(f"{passage['chapter_title']} {passage['section']} {passage['text']}")
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        passage["terms"] = frequencies
+        passage["length"] = len(terms)
+        for term in frequencies:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    index = {
+        "version": SOURCE_INDEX_VERSION,
+        "source": str(source_path.relative_to(PROJECT_ROOT)) if source_path.is_relative_to(PROJECT_ROOT) else str(source_path),
+        "source_hash": _source_hash(source_path),
+        "built_at": time.time(),
+        "average_length": sum(p["length"] for p in passages) / len(passages) if passages else 0,
+        "document_frequency": document_frequency,
+        "passages": passages,
+    }
+    atomic_write_json(index_path, index, indent=None)
+    return index
+
+
+class SourceRetriever:
+    """
+    미리 만든 BM25 색인으로 질문에 맞는 요약 구절을 찾는 검색기.
+    왜: 색인을 한 번 읽어 두면 질문 하나당 검색은 구절 수백 개의 점수 계산뿐이라 즉시 끝난다.
+    """
+
+    def __init__(self, source_path: Path = SOURCE_PATH, index_path: Path = SOURCE_INDEX_PATH):
+        self.source_path = Path(source_path)
+        self.index_path = Path(index_path)
+        self.index = self._load()
+
+    def _load(self) -> dict:
+        if not self.source_path.exists():
+            raise FileNotFoundError(f"소스 파일이 없습니다: {self.source_path}")
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if (index.get("version") == SOURCE_INDEX_VERSION
+                    and index.get("source_hash") == _source_hash(self.source_path)):
+                return index
+        # 왜: 소스가 바뀌었거나 색인이 없으면 바로 다시 만든다 (수십 ms).
+        return build_index(self.source_path, self.index_path)
+
+    @staticmethod
+    def chapters_in(text: str) -> set:
+        """질문에 언급된 챕터 번호 집합 ("Chapter 3~5" → {3, 4, 5})."""
+        chapters = set()
+        for match in CHAPTER_REFERENCE.finditer(text):
+            first = int(match.group(1))
+            last = int(match.group(3)) if match.group(3) else first
+            if match.group(2) in ("&", ","):
+                chapters.update((first, last))
+                continue
+            if last < first:
+                first, last = last, first
+            chapters.update(range(first, last + 1))
+        return chapters
+
+    @staticmethod
+    def expand_query(question: str) -> str:
+        extra = [english for korean, english in QUERY_GLOSSARY.items() if korean in question]
+        return " ".join([question] + extra)
+
+    def search(self, question: str, limit: int = DEFAULT_PASSAGE_LIMIT, chapters: set = None) -> list:
+        """
+        질문에 맞는 구절을 BM25 점수순으로 반환한다.
+        chapters를 생략하면 질문에 언급된 챕터로 후보를 좁힌다.
+        후보 챕터 안에서 일치하는 단어가 없으면, 그 챕터의 앞쪽 구절(Core Thesis부터)을 돌려준다.
+        """
+        if chapters is None:
+            chapters = self.chapters_in(question)
+        candidates = [p for p in self.index["passages"] if not chapters or p["chapter"] in chapters]
+
+        terms = set(tokenize(self.expand_query(question)))
+        total = len(self.index["passages"])
+        average_length = self.index["average_length"] or 1
+        scored = []
+        for passage in candidates:
+            score = 0.0
+            for term in terms:
+                frequency = passage["terms"].get(term)
+                if not frequency:
+                    continue
+                document_frequency = self.index["document_frequency"][term]
+                idf = math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * passage["length"] / average_length)
+                score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            if score > 0:
+                scored.append((score, passage))
+
+        if not scored and chapters:
+            return [dict(passage, score=0.0) for passage in candidates[:limit]]
+        scored.sort(key=lambda item: -item[0])
+        return [dict(passage, score=round(score, 3)) for score, passage in scored[:limit]]
+
+    def citation(self, passage: dict) -> str:
+        return (f"Chapter {passage['chapter']}: {passage['chapter_title']} · {passage['section']} "
+                f"({self.index['source']}:{passage['line']})")
+
+    def answer(self, question: str, limit: int = DEFAULT_PASSAGE_LIMIT, chapters: set = None) -> str:
+        """근거 구절을 출처와 함께 묶은 마크다운 응답. 구절이 없으면 안내 문구."""
+        passages = self.search(question, limit, chapters)
+        if not passages:
+            return "(로컬 소스에서 관련 구절을 찾지 못했습니다)"
+        lines = [f"> 로컬 소스 검색 응답 (NotebookLM 미사용) — 근거 구절 {len(passages)}개", ""]
+        for i, passage in enumerate(passages, 1):
+            lines.append(f"{i}. **{self.citation(passage)}**")
+            lines.extend(f"   {line}" for line in passage["text"].splitlines())
+            lines.append("")
+        return "\n".join(lines).rstrip() + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="책 요약 소스의 오프라인 BM25 검색"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ask_parser = subparsers.add_parser("ask", help="질문에 맞는 근거 구절 검색")
+    ask_parser.add_argument("question", help="질문")
+    ask_parser.add_argument("--chapter", type=int, nargs="+", default=None,
+                            help="검색할 챕터 번호 (생략 시 질문에 언급된 챕터, 없으면 전체)")
+    ask_parser.add_argument("--limit", type=int, default=DEFAULT_PASSAGE_LIMIT,
+                            help=f"구절 수 (기본: {DEFAULT_PASSAGE_LIMIT})")
+    ask_parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    subparsers.add_parser("build", help="색인 재생성")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not SOURCE_PATH.exists():
+            print(f"❌ 소스 파일이 없습니다: {SOURCE_PATH}")
+            sys.exit(1)
+        index = build_index()
+        print(f"📚 소스 색인 생성: 구절 {len(index['passages'])}개, 단어 {len(index['document_frequency'])}개")
+        print(f"   {SOURCE_INDEX_PATH}")
+        return
+
+    try:
+        retriever = SourceRetriever()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    chapters = set(args.chapter) if args.chapter else None
+    started = time.perf_counter()
+    if args.json:
+        passages = retriever.search(args.question, args.limit, chapters)
+        for passage in passages:
+            passage.pop("terms", None)
+        print(json.dumps(passages, ensure_ascii=False, indent=2))
+        return
+    answer = retriever.answer(args.question, args.limit, chapters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(answer)
+    print(f"⚡ {elapsed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,23 +9,62 @@ state_manager.py — 주차별 상태 관리 핵심 모듈
 
 사용법:
   python execution/state_manager.py status         # 현재 상태 출력
+  python execution/state_manager.py status --all   # 전체 주차 요약 (week-index.json 기반)
+  python execution/state_manager.py reindex [--week N]  # 주차 요약 인덱스 재생성
   python execution/state_manager.py next            # 다음 주차로 전이
   python execution/state_manager.py init-week       # 현재 주차 디렉토리 생성
   python execution/state_manager.py complete-step <step_name>  # 단계 완료 표시
+  python execution/state_manager.py run-week [--max-workers N] [--reuse]  # 의존성 그래프 기반 동시 실행
+  python execution/state_manager.py migrate-sqlite  # JSON 상태를 SQLite 저장소로 이전
+  python execution/state_manager.py export-json     # SQLite 상태를 state.json/meta.json으로 내보내기
+  python execution/state_manager.py workspaces      # 워크스페이스 목록
+  python execution/state_manager.py create-workspace <name> [chapters_file]  # 워크스페이스 생성
+  python execution/state_manager.py run-all [--max-workers N] [--reuse]      # 모든 워크스페이스 동시 진행
+  python execution/state_manager.py backfill --from 1 --to 23 [--parallel-weeks N] [--reuse]  # 여러 주차 일괄 재생성
+  python execution/state_manager.py profile [--output report.json]  # 단계별 실행 지표 집계
+
+  execution/pipeline_daemon.py가 실행 중이면 짧은 명령은 데몬을 거쳐 실행된다.
+
+상태 저장소:
+  .env 또는 환경 변수의 STATE_BACKEND로 선택한다 (json | sqlite, 기본 json).
+
+워크스페이스:
+  모든 명령에 --workspace <name>을 붙이면 data/workspaces/<name>/ 아래의
+  독립된 상태/주차 디렉토리와 chapters.json을 사용한다. 생략 시 기존 data/를 사용한다.
 """
 
+import asyncio
+import contextvars
+import copy
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import sys
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+from atomic_io import atomic_write_json
+from workspace_paths import DATA_DIR_ENV
+
+# 왜: fcntl은 POSIX 전용이다. Windows에서는 잠금 없이 원자적 쓰기만으로 동작한다.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # --- 프로젝트 루트 경로를 동적으로 결정 ---
 # 왜: execution/ 하위에서 실행되더라도 항상 프로젝트 루트의 data/를 참조하기 위함
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
-STATE_FILE = DATA_DIR / "state.json"
-WEEKS_DIR = DATA_DIR / "weeks"
+WORKSPACES_DIR = DATA_DIR / "workspaces"
+
+# 왜: 기본 워크스페이스는 기존 data/ 레이아웃(state.json, weeks/)을 그대로 사용한다.
+# 다른 브랜드/사이클은 Workspace 객체가 data/workspaces/<name>/ 아래 같은 구조로 격리한다.
+DEFAULT_WORKSPACE = "default"
 
 # --- 한국 표준시 (KST) ---
 KST = timezone(timedelta(hours=9))
@@ -71,46 +110,793 @@ PIPELINE_STEPS = [
     "feedback_applied",          # 이전 주차 피드백 반영 완료
 ]
 
+# --- 파이프라인 단계 의존성 그래프 ---
+# 왜: 트랜스크립트 추출, WYSH 스캔, 트렌드 리서치는 서로의 산출물을 쓰지 않는다.
+# 의존 관계를 명시해 두면 독립 단계를 동시에 실행하여, 한 주차의 소요 시간을
+# 모든 단계의 합이 아니라 가장 긴 의존 체인의 길이로 줄일 수 있다.
+PIPELINE_DEPENDENCIES = {
+    "transcript_extracted": [],
+    "notebooklm_analyzed": ["transcript_extracted"],
+    "wysh_context_collected": [],
+    "trends_researched": [],
+    "ideas_generated": ["notebooklm_analyzed", "wysh_context_collected", "trends_researched"],
+    "feedback_applied": ["ideas_generated"],
+}
+
+# 왜: run-week가 동시에 띄우는 서브프로세스 수의 기본값.
+# 독립 단계가 3개이므로 3이면 병렬성을 모두 활용한다.
+DEFAULT_MAX_WORKERS = 3
+
+# 왜: backfill이 동시에 진행하는 주차 수의 기본값. 주차마다 최대 DEFAULT_MAX_WORKERS개의
+# 프로세스를 띄우므로, 전체 프로세스 수는 대략 이 값 x DEFAULT_MAX_WORKERS로 제한된다.
+DEFAULT_PARALLEL_WEEKS = 4
+
+# --- 단계별 산출물 ---
+# 왜: 단계 지문(fingerprint)의 출력 해시와, 하위 단계 입력으로 쓰이는 상위 산출물 해시를
+# 계산할 때 어떤 파일을 봐야 하는지 정의한다.
+STEP_ARTIFACTS = {
+    "transcript_extracted": ["transcript.md", "transcript_segments.jsonl", "transcript_segments.bin",
+                             "transcript_chunks.jsonl"],
+    "notebooklm_analyzed": ["chapter-analysis.md"],
+    "wysh_context_collected": ["wysh-context.json"],
+    "trends_researched": ["trends.md", "trends.json", "trends-diff.json"],
+    "ideas_generated": ["ideas.json"],
+    "feedback_applied": ["feedback.json"],
+}
+
+# --- MFS 점수 구간 ---
+# 왜: directives/idea-generation.md의 MFS 해석표와 같은 구간으로 분포를 집계한다.
+# (하한, 구간 이름) 순서이며, 위에서부터 처음 만족하는 구간에 속한다.
+MFS_BUCKETS = [
+    (10, "10+"),
+    (7, "7-9"),
+    (4, "4-6"),
+    (1, "1-3"),
+    (float("-inf"), "<=0"),
+]
+
+# --- 외부 서비스별 동시 실행 한도 ---
+# 왜: run-all로 여러 워크스페이스를 한 프로세스에서 진행할 때, 브라우저와 유료 API는
+# 워크스페이스 수와 무관하게 공유 한도 안에서만 사용해야 한다.
+STEP_SERVICES = {
+    "transcript_extracted": "youtube",
+    "wysh_context_collected": "browser",
+    "trends_researched": "deep_research",
+}
+SERVICE_CONCURRENCY = {
+    "youtube": 2,
+    "browser": 1,
+    "deep_research": 2,
+}
+
+
+class Workspace:
+    """
+    브랜드/리딩 리스트 단위로 격리된 상태 공간.
+    왜: 경로와 챕터 목록이 모듈 상수이면 체크아웃 하나가 한 사이클만 돌릴 수 있다.
+    워크스페이스마다 state.json, weeks/, 잠금/저널 파일, 챕터 목록을 따로 두어
+    같은 엔진으로 여러 D2C 브랜드와 도서를 동시에 운영할 수 있게 한다.
+
+    워크스페이스 디렉토리 구성:
+      chapters.json   챕터 이름 목록 (JSON 배열, 없으면 기본 CHAPTERS)
+      workspace.json  선택 설정 {"project": "...", "env": {"WYSH_SHOP_URL": "..."}}
+    """
+
+    def __init__(self, name: str = DEFAULT_WORKSPACE):
+        # 왜: 이름이 경로로 쓰이므로 디렉토리 탈출(../)이 불가능한 문자만 허용한다.
+        if not re.match(r"^[A-Za-z0-9_-]+$", name):
+            raise ValueError(f"워크스페이스 이름은 영문/숫자/-/_만 사용할 수 있습니다: '{name}'")
+
+        self.name = name
+        self.data_dir = DATA_DIR if name == DEFAULT_WORKSPACE else WORKSPACES_DIR / name
+        self.state_file = self.data_dir / "state.json"
+        self.state_db_file = self.data_dir / "state.db"
+        self.lock_file = self.data_dir / "state.lock"
+        self.journal_file = self.data_dir / "step-journal.jsonl"
+        self.weeks_dir = self.data_dir / "weeks"
+        self.chapters_file = self.data_dir / "chapters.json"
+        self.config_file = self.data_dir / "workspace.json"
+        self.index_file = self.data_dir / "week-index.json"
+
+        config = {}
+        if self.config_file.exists():
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        self.project_name = config.get("project", "WYSH x Seth Godin Marketing Execution Engine")
+        # 왜: 브랜드별 쇼핑몰 URL 등은 서브프로세스 환경 변수로 전달하여 스크립트 수정 없이 바꾼다.
+        self.env = config.get("env", {})
+        self.chapters = self._load_chapters()
+
+        self.backend = None
+        self.lock_depth = 0
+        self.lock_handle = None
+
+    def _load_chapters(self) -> list:
+        if not self.chapters_file.exists():
+            return CHAPTERS
+        with open(self.chapters_file, "r", encoding="utf-8") as f:
+            chapters = json.load(f)
+        if not isinstance(chapters, list) or not chapters:
+            raise ValueError(f"챕터 파일은 비어 있지 않은 JSON 배열이어야 합니다: {self.chapters_file}")
+        return chapters
+
+    def week_dir(self, week_number: int) -> Path:
+        return self.weeks_dir / f"week-{week_number:02d}"
+
+    def subprocess_env(self) -> dict:
+        """
+        execution 스크립트에 넘길 환경 변수를 만든다.
+        왜: 각 스크립트는 workspace_paths.DATA_DIR(WYSH_DATA_DIR)로 산출물 위치를 결정하므로,
+        워크스페이스 디렉토리를 넘기면 스크립트를 고치지 않고도 격리된다.
+        """
+        env = dict(os.environ)
+        env.update({key: str(value) for key, value in self.env.items()})
+        env[DATA_DIR_ENV] = str(self.data_dir)
+        env["WYSH_WORKSPACE"] = self.name
+        return env
+
+
+_workspaces = {}
+# 왜: run-all은 여러 워크스페이스를 하나의 이벤트 루프에서 동시에 진행한다.
+# ContextVar는 asyncio 태스크마다 독립 복사본을 가지므로, 전역 변수와 달리
+# 한 태스크가 워크스페이스를 바꿔도 다른 태스크에 영향을 주지 않는다.
+_active_workspace = contextvars.ContextVar("active_workspace", default=None)
+
+
+def get_workspace(name: str = DEFAULT_WORKSPACE) -> Workspace:
+    """이름에 해당하는 워크스페이스를 반환한다 (프로세스 내 캐시)."""
+    if name not in _workspaces:
+        _workspaces[name] = Workspace(name)
+    return _workspaces[name]
+
+
+def current_workspace() -> Workspace:
+    """현재 컨텍스트에서 활성화된 워크스페이스를 반환한다."""
+    return _active_workspace.get() or get_workspace(DEFAULT_WORKSPACE)
+
+
+def activate_workspace(name: str) -> Workspace:
+    """현재 컨텍스트(또는 asyncio 태스크)의 워크스페이스를 전환한다."""
+    workspace = get_workspace(name)
+    _active_workspace.set(workspace)
+    return workspace
+
+
+def list_workspaces() -> list:
+    """
+    기본 워크스페이스와 data/workspaces/ 아래의 모든 워크스페이스 이름을 반환한다.
+    왜: 스케줄러가 디렉토리만 만들어 두면 자동으로 대상에 포함시키기 위함.
+    """
+    names = [DEFAULT_WORKSPACE]
+    if WORKSPACES_DIR.exists():
+        names.extend(
+            path.name for path in sorted(WORKSPACES_DIR.iterdir())
+            if path.is_dir() and re.match(r"^[A-Za-z0-9_-]+$", path.name)
+        )
+    return names
+
+
+def create_workspace(name: str, chapters_file: str = None) -> Workspace:
+    """
+    새 워크스페이스 디렉토리와 chapters.json을 만든다.
+    왜: 챕터 목록 파일은 JSON 배열 또는 한 줄에 한 챕터인 텍스트 파일 모두 허용하여
+    목차를 복사해 붙이기만 하면 되게 한다.
+    """
+    if name == DEFAULT_WORKSPACE:
+        print(f"❌ '{DEFAULT_WORKSPACE}'는 기존 data/ 디렉토리를 가리키는 예약된 이름입니다.")
+        return None
+
+    workspace_dir = WORKSPACES_DIR / name
+    if workspace_dir.exists():
+        print(f"⚠️  워크스페이스가 이미 존재합니다: {workspace_dir}")
+        return get_workspace(name)
+
+    chapters = CHAPTERS
+    if chapters_file:
+        source = Path(chapters_file)
+        if not source.exists():
+            print(f"❌ 챕터 파일을 찾을 수 없습니다: {source}")
+            return None
+        with open(source, "r", encoding="utf-8") as f:
+            raw = f.read()
+        if source.suffix == ".json":
+            chapters = json.loads(raw)
+        else:
+            chapters = [line.strip() for line in raw.splitlines() if line.strip()]
+
+    (workspace_dir / "weeks").mkdir(parents=True, exist_ok=True)
+    atomic_write_json(workspace_dir / "chapters.json", chapters)
+
+    print(f"✅ 워크스페이스 생성: {workspace_dir}")
+    print(f"   챕터 {len(chapters)}개")
+    return get_workspace(name)
+
+
+@contextmanager
+def state_lock(workspace: Workspace = None):
+    """
+    상태 파일의 읽기-수정-쓰기 구간을 프로세스 간 advisory lock(fcntl)으로 보호한다.
+    왜: 두 워커가 동시에 meta.json을 읽고 각자 단계를 추가해 쓰면 한쪽 갱신이 사라진다.
+    같은 프로세스 안에서 중첩 호출되어도 교착되지 않도록 재진입을 허용한다.
+    잠금은 워크스페이스 단위이므로 서로 다른 워크스페이스는 서로를 기다리지 않는다.
+    """
+    workspace = workspace or current_workspace()
+
+    if fcntl is None:
+        yield
+        return
+
+    if workspace.lock_depth == 0:
+        workspace.data_dir.mkdir(parents=True, exist_ok=True)
+        workspace.lock_handle = open(workspace.lock_file, "a")
+        fcntl.flock(workspace.lock_handle.fileno(), fcntl.LOCK_EX)
+    workspace.lock_depth += 1
+
+    try:
+        yield
+    finally:
+        workspace.lock_depth -= 1
+        if workspace.lock_depth == 0:
+            fcntl.flock(workspace.lock_handle.fileno(), fcntl.LOCK_UN)
+            workspace.lock_handle.close()
+            workspace.lock_handle = None
+
+
+def append_step_journal(week_number: int, step_name: str, workspace: Workspace = None) -> None:
+    """
+    단계 완료를 append-only 저널에 한 줄로 기록하고 fsync한다.
+    왜: meta.json 갱신 전에 저널을 먼저 남겨 두면, 갱신 도중 크래시가 나도
+    다음 로드 시 저널을 재생하여 완료 기록을 복구할 수 있다.
+    """
+    workspace = workspace or current_workspace()
+    workspace.data_dir.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "week": week_number,
+        "step": step_name,
+        "completed_at": datetime.now(KST).isoformat(),
+    }
+    with open(workspace.journal_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class StateBackend(ABC):
+    """
+    상태 저장소 인터페이스.
+    왜: 주차/단계/히스토리 저장 방식을 교체할 수 있도록 읽기·쓰기 경로를 한곳으로 모은다.
+    상위 함수(init_week, complete_step 등)는 저장소 종류를 알 필요가 없다.
+    추상 메서드를 빠뜨린 저장소는 실행 도중이 아니라 생성 시점에 TypeError로 실패한다.
+    """
+
+    @abstractmethod
+    def load_state(self) -> dict:
+        """전역 상태를 반환한다. 저장된 상태가 없으면 None."""
+
+    @abstractmethod
+    def save_state(self, state: dict) -> None:
+        """전역 상태(히스토리 포함)를 저장한다."""
+
+    @abstractmethod
+    def load_week_meta(self, week_number: int) -> dict:
+        """주차 메타데이터를 반환한다. 초기화되지 않은 주차면 None."""
+
+    @abstractmethod
+    def save_week_meta(self, week_number: int, week_meta: dict) -> None:
+        """주차 메타데이터 전체를 저장한다."""
+
+    def mark_step_completed(self, week_number: int, step_name: str) -> bool:
+        """
+        단계 완료를 기록한다.
+        반환값: 새로 기록했으면 True, 이미 완료된 단계였으면 False.
+        """
+        week_meta = self.load_week_meta(week_number)
+        if step_name in week_meta["completed_steps"]:
+            return False
+        week_meta["completed_steps"].append(step_name)
+        self.save_week_meta(week_number, week_meta)
+        return True
+
+    @abstractmethod
+    def week_numbers(self) -> list:
+        """저장된 모든 주차 번호를 반환한다."""
+
+    def mark_week_completed(self, week_number: int, completed_at: str) -> None:
+        """주차 완료 시각을 기록한다."""
+        week_meta = self.load_week_meta(week_number)
+        if week_meta is None:
+            return
+        week_meta["completed_at"] = completed_at
+        self.save_week_meta(week_number, week_meta)
+
+
+class JsonStateBackend(StateBackend):
+    """
+    state.json + 주차별 meta.json 파일 저장소 (기본값).
+    왜: 사람이 직접 열어보고 git으로 변경 이력을 추적하기 쉬운 기존 레이아웃을 유지한다.
+    모든 쓰기는 원자적 rename으로, 읽기-수정-쓰기는 state_lock() 안에서 수행하고,
+    단계 완료는 저널에 먼저 기록한 뒤 load_state() 시 재생한다.
+    """
+
+    def __init__(self, workspace: Workspace = None):
+        self.workspace = workspace or current_workspace()
+        # 왜: 상주 데몬에서는 같은 state.json을 요청마다 다시 읽는다.
+        # 파일의 (mtime, 크기)가 그대로면 파싱 결과를 재사용한다.
+        self._state_cache = None
+
+    def load_state(self) -> dict:
+        if not self.workspace.state_file.exists():
+            return None
+        self.replay_step_journal()
+
+        stat = self.workspace.state_file.stat()
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        if self._state_cache is None or self._state_cache[0] != cache_key:
+            with open(self.workspace.state_file, "r", encoding="utf-8") as f:
+                self._state_cache = (cache_key, json.load(f))
+        # 왜: 호출자가 반환된 상태를 수정하므로 캐시 원본은 복사해서 넘긴다.
+        return copy.deepcopy(self._state_cache[1])
+
+    def save_state(self, state: dict) -> None:
+        with state_lock(self.workspace):
+            atomic_write_json(self.workspace.state_file, state)
+
+    def load_week_meta(self, week_number: int) -> dict:
+        meta_path = self.workspace.week_dir(week_number) / "meta.json"
+        if not meta_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_week_meta(self, week_number: int, week_meta: dict) -> None:
+        with state_lock(self.workspace):
+            atomic_write_json(self.workspace.week_dir(week_number) / "meta.json", week_meta)
+
+    def week_numbers(self) -> list:
+        return sorted(
+            int(meta_path.parent.name.split("-")[1])
+            for meta_path in self.workspace.weeks_dir.glob("week-*/meta.json")
+        )
+
+    def mark_step_completed(self, week_number: int, step_name: str) -> bool:
+        # 왜: 잠금 안에서 최신 meta.json을 다시 읽어야 다른 워커의 갱신을 덮어쓰지 않는다.
+        with state_lock(self.workspace):
+            week_meta = self.load_week_meta(week_number)
+            if step_name in week_meta["completed_steps"]:
+                return False
+            append_step_journal(week_number, step_name, self.workspace)
+            week_meta["completed_steps"].append(step_name)
+            self.save_week_meta(week_number, week_meta)
+        return True
+
+    def mark_week_completed(self, week_number: int, completed_at: str) -> None:
+        with state_lock(self.workspace):
+            super().mark_week_completed(week_number, completed_at)
+
+    def replay_step_journal(self) -> int:
+        """
+        저널의 단계 완료 기록 중 meta.json에 반영되지 않은 것을 재생하고 저널을 비운다.
+        왜: 저널은 크래시 복구용이므로, 모든 기록이 meta.json에 반영되면 더 보관할 필요가 없다.
+        이렇게 하면 저널은 마지막 로드 이후의 완료 기록만 담는 작은 파일로 유지된다.
+
+        반환값: 새로 반영한 단계 수
+        """
+        journal_file = self.workspace.journal_file
+        if not journal_file.exists():
+            return 0
+
+        replayed = 0
+        with state_lock(self.workspace):
+            entries = []
+            with open(journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # 왜: 마지막 줄은 append 도중 잘렸을 수 있다. fsync 전이므로 완료로 보지 않는다.
+                        continue
+
+            metas = {}
+            dirty_weeks = set()
+            for entry in entries:
+                week_number = entry["week"]
+                if week_number not in metas:
+                    metas[week_number] = self.load_week_meta(week_number)
+                week_meta = metas[week_number]
+                if week_meta is None:
+                    continue
+                if entry["step"] not in week_meta["completed_steps"]:
+                    week_meta["completed_steps"].append(entry["step"])
+                    dirty_weeks.add(week_number)
+                    replayed += 1
+
+            # 왜: 실제로 누락이 있던 주차만 다시 쓴다.
+            for week_number in sorted(dirty_weeks):
+                self.save_week_meta(week_number, metas[week_number])
+                update_week_index(week_number)
+
+            journal_file.unlink()
+
+        if replayed:
+            print(f"🔁 저널에서 단계 완료 기록 {replayed}개를 복구했습니다.")
+        return replayed
+
+
+class SqliteStateBackend(StateBackend):
+    """
+    SQLite(WAL 모드) 상태 저장소.
+    왜: 브랜드/사이클이 늘어나면 상태 변경마다 전체 JSON을 다시 쓰고 주차 디렉토리를
+    하나씩 여는 비용이 커진다. 주차·단계·히스토리를 인덱스가 있는 테이블에 두고
+    변경된 행만 갱신하여 쓰기 비용을 상태 크기와 무관하게 유지한다.
+    대시보드용 파일 레이아웃은 export_json()으로 내보낸다.
+    """
+
+    # 왜: weeks 테이블의 고정 컬럼. 이외의 meta 키는 extra(JSON)에 보존하여
+    # meta.json에 필드가 추가되어도 스키마 변경 없이 왕복(round-trip)되게 한다.
+    WEEK_COLUMNS = ("chapter", "started_at", "completed_at", "ideas_count")
+    HISTORY_COLUMNS = ("chapter", "started_at", "completed_at", "ideas_count", "feedback_applied")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS project (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS history (
+            week INTEGER PRIMARY KEY,
+            chapter TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            ideas_count INTEGER NOT NULL DEFAULT 0,
+            feedback_applied INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS weeks (
+            week INTEGER PRIMARY KEY,
+            chapter TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            ideas_count INTEGER NOT NULL DEFAULT 0,
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS steps (
+            week INTEGER NOT NULL,
+            step TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            completed_at TEXT NOT NULL,
+            PRIMARY KEY (week, step)
+        );
+        CREATE INDEX IF NOT EXISTS idx_steps_week_position ON steps(week, position);
+        CREATE INDEX IF NOT EXISTS idx_weeks_completed_at ON weeks(completed_at);
+        CREATE INDEX IF NOT EXISTS idx_history_completed_at ON history(completed_at);
+    """
+
+    def __init__(self, workspace: Workspace = None):
+        self.workspace = workspace or current_workspace()
+        self.db_path = self.workspace.state_db_file
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 왜: 동시 실행되는 run-week 워커가 같은 DB를 열 수 있으므로 잠금 대기 시간을 둔다.
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        # 왜: WAL 모드는 읽기와 쓰기가 서로를 막지 않아 status 조회가 쓰기 중에도 빠르다.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        # 왜: 마지막으로 읽거나 쓴 히스토리 행을 기억해 두고, 바뀐 행만 UPDATE한다.
+        self._history_snapshot = {}
+
+    def load_state(self) -> dict:
+        rows = self.conn.execute("SELECT key, value FROM project").fetchall()
+        if not rows:
+            return None
+
+        state = {row["key"]: json.loads(row["value"]) for row in rows}
+        history_rows = self.conn.execute(
+            "SELECT * FROM history ORDER BY week"
+        ).fetchall()
+        state["history"] = [self._history_entry(row) for row in history_rows]
+        self._history_snapshot = {
+            entry["week"]: dict(entry) for entry in state["history"]
+        }
+        return state
+
+    def save_state(self, state: dict) -> None:
+        project_rows = [
+            (key, json.dumps(value, ensure_ascii=False))
+            for key, value in state.items()
+            if key != "history"
+        ]
+        changed_history = [
+            entry for entry in state.get("history", [])
+            if self._history_snapshot.get(entry["week"]) != entry
+        ]
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO project (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                project_rows,
+            )
+            self.conn.executemany(
+                "INSERT INTO history (week, chapter, started_at, completed_at, ideas_count, feedback_applied) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(week) DO UPDATE SET chapter = excluded.chapter, "
+                "started_at = excluded.started_at, completed_at = excluded.completed_at, "
+                "ideas_count = excluded.ideas_count, feedback_applied = excluded.feedback_applied",
+                [
+                    (
+                        entry["week"],
+                        entry.get("chapter"),
+                        entry.get("started_at"),
+                        entry.get("completed_at"),
+                        entry.get("ideas_count", 0),
+                        int(bool(entry.get("feedback_applied", False))),
+                    )
+                    for entry in changed_history
+                ],
+            )
+
+        for entry in changed_history:
+            self._history_snapshot[entry["week"]] = dict(entry)
+
+    def load_week_meta(self, week_number: int) -> dict:
+        row = self.conn.execute(
+            "SELECT * FROM weeks WHERE week = ?", (week_number,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        steps = self.conn.execute(
+            "SELECT step FROM steps WHERE week = ? ORDER BY position",
+            (week_number,),
+        ).fetchall()
+
+        # 왜: init_week가 만드는 meta.json과 같은 키 순서를 유지하여 내보낸 파일의 diff를 최소화한다.
+        week_meta = {
+            "week": row["week"],
+            "chapter": row["chapter"],
+            "started_at": row["started_at"],
+            "completed_at": row["completed_at"],
+            "completed_steps": [step["step"] for step in steps],
+            "ideas_count": row["ideas_count"],
+        }
+        week_meta.update(json.loads(row["extra"]))
+        return week_meta
+
+    def save_week_meta(self, week_number: int, week_meta: dict) -> None:
+        extra = {
+            key: value for key, value in week_meta.items()
+            if key not in self.WEEK_COLUMNS and key not in ("week", "completed_steps")
+        }
+        now = datetime.now(KST).isoformat()
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO weeks (week, chapter, started_at, completed_at, ideas_count, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(week) DO UPDATE SET chapter = excluded.chapter, "
+                "started_at = excluded.started_at, completed_at = excluded.completed_at, "
+                "ideas_count = excluded.ideas_count, extra = excluded.extra",
+                (
+                    week_number,
+                    week_meta.get("chapter"),
+                    week_meta.get("started_at"),
+                    week_meta.get("completed_at"),
+                    week_meta.get("ideas_count", 0),
+                    json.dumps(extra, ensure_ascii=False),
+                ),
+            )
+            # 왜: 이미 기록된 단계의 완료 시각은 보존하고, 목록에서 빠진 단계만 지운다.
+            completed_steps = week_meta.get("completed_steps", [])
+            existing = {
+                row["step"] for row in self.conn.execute(
+                    "SELECT step FROM steps WHERE week = ?", (week_number,)
+                )
+            }
+            self.conn.executemany(
+                "DELETE FROM steps WHERE week = ? AND step = ?",
+                [(week_number, step) for step in existing - set(completed_steps)],
+            )
+            self.conn.executemany(
+                "INSERT INTO steps (week, step, position, completed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(week, step) DO UPDATE SET position = excluded.position",
+                [
+                    (week_number, step, position, now)
+                    for position, step in enumerate(completed_steps)
+                ],
+            )
+
+    def mark_step_completed(self, week_number: int, step_name: str) -> bool:
+        # 왜: 단계 완료는 steps 테이블에 한 행을 추가하는 것으로 끝난다 (주차 전체 재작성 없음).
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO steps (week, step, position, completed_at) "
+                "SELECT ?, ?, COALESCE(MAX(position) + 1, 0), ? FROM steps WHERE week = ?",
+                (week_number, step_name, datetime.now(KST).isoformat(), week_number),
+            )
+        return cursor.rowcount > 0
+
+    def mark_week_completed(self, week_number: int, completed_at: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE weeks SET completed_at = ? WHERE week = ?",
+                (completed_at, week_number),
+            )
+
+    def week_numbers(self) -> list:
+        rows = self.conn.execute("SELECT week FROM weeks ORDER BY week").fetchall()
+        return [row["week"] for row in rows]
+
+    @staticmethod
+    def _history_entry(row: sqlite3.Row) -> dict:
+        entry = {"week": row["week"]}
+        for column in SqliteStateBackend.HISTORY_COLUMNS:
+            entry[column] = row[column]
+        entry["feedback_applied"] = bool(entry["feedback_applied"])
+        return entry
+
+
+def load_state_config() -> dict:
+    """
+    .env와 환경 변수에서 상태 저장소 설정을 로드한다.
+    왜: 저장소 교체를 코드 수정 없이 환경별로 선택할 수 있게 한다.
+    환경 변수가 .env보다 우선한다.
+    """
+    config = {"backend": "json"}
+
+    env_path = PROJECT_ROOT / ".env"
+    if env_path.exists():
+        with open(env_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                if key.strip() == "STATE_BACKEND" and value.strip():
+                    config["backend"] = value.strip().lower()
+
+    if os.environ.get("STATE_BACKEND"):
+        config["backend"] = os.environ["STATE_BACKEND"].strip().lower()
+
+    return config
+
+
+# 왜: 저장소 종류별 생성자. 새 저장소는 여기에 등록하면 된다.
+STATE_BACKENDS = {
+    "json": JsonStateBackend,
+    "sqlite": SqliteStateBackend,
+}
+
+
+def get_backend() -> StateBackend:
+    """
+    현재 워크스페이스에 설정된 상태 저장소 인스턴스를 반환한다.
+    왜: SQLite 연결을 워크스페이스당 한 번만 열어 재사용한다.
+    """
+    workspace = current_workspace()
+    if workspace.backend is None:
+        backend_name = load_state_config()["backend"]
+        if backend_name not in STATE_BACKENDS:
+            print(f"⚠️  알 수 없는 STATE_BACKEND: '{backend_name}'. json 저장소를 사용합니다.")
+            backend_name = "json"
+        workspace.backend = STATE_BACKENDS[backend_name](workspace)
+    return workspace.backend
+
+
+def migrate_json_to_sqlite() -> None:
+    """
+    기존 state.json과 주차별 meta.json을 SQLite 저장소로 옮긴다.
+    왜: 운영 중인 사이클의 진행 상황을 잃지 않고 저장소를 교체하기 위함.
+    """
+    source = JsonStateBackend()
+    target = SqliteStateBackend()
+
+    state = source.load_state()
+    if state is None:
+        print(f"❌ 이전할 {source.workspace.state_file}이 없습니다.")
+        return
+    target.save_state(state)
+
+    migrated_weeks = 0
+    for meta_path in sorted(source.workspace.weeks_dir.glob("week-*/meta.json")):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            week_meta = json.load(f)
+        target.save_week_meta(week_meta["week"], week_meta)
+        migrated_weeks += 1
+
+    print(f"✅ SQLite 이전 완료: {target.db_path}")
+    print(f"   히스토리 {len(state.get('history', []))}개, 주차 메타 {migrated_weeks}개")
+    print("   .env에 STATE_BACKEND=sqlite를 설정하면 SQLite 저장소를 사용합니다.")
+
+
+def export_json() -> None:
+    """
+    SQLite 저장소의 상태를 기존 state.json/meta.json 레이아웃으로 내보낸다.
+    왜: 대시보드와 사람이 읽는 파일 레이아웃은 그대로 유지해야 한다.
+    """
+    source = SqliteStateBackend()
+    target = JsonStateBackend()
+
+    state = source.load_state()
+    if state is None:
+        print(f"❌ {source.db_path}에 저장된 상태가 없습니다.")
+        return
+    target.save_state(state)
+
+    week_numbers = source.week_numbers()
+    for week_number in week_numbers:
+        target.save_week_meta(week_number, source.load_week_meta(week_number))
+
+    print(f"✅ JSON 내보내기 완료: {target.workspace.state_file}")
+    print(f"   주차 메타 {len(week_numbers)}개 → {target.workspace.weeks_dir}")
+
 
 def load_state() -> dict:
     """
     state.json을 읽어 딕셔너리로 반환한다.
     왜: 단일 진실 소스에서 현재 상태를 가져오기 위함.
-    파일이 없으면 초기 상태를 생성한다.
-    """
-    if not STATE_FILE.exists():
-        # 왜: 초기 실행 시 state.json이 없을 수 있으므로 기본값으로 생성
-        initial_state = {
-            "project": "WYSH x Seth Godin Marketing Execution Engine",
-            "total_weeks": len(CHAPTERS),
-            "current_week": 1,
-            "current_chapter": CHAPTERS[0],
-            "status": "pending",
-            "youtube_urls": [],
-            "notebooklm_notebook_url": None,
-            "created_at": datetime.now(KST).isoformat(),
-            "updated_at": datetime.now(KST).isoformat(),
-            "history": [],
-        }
-        save_state(initial_state)
-        return initial_state
+    저장된 상태가 없으면 초기 상태를 생성한다.
+    """
+    state = get_backend().load_state()
+    if state is None:
+        with state_lock():
+            # 왜: 잠금을 기다리는 사이 다른 프로세스가 먼저 만들었으면 그것을 쓴다.
+            state = get_backend().load_state()
+            if state is None:
+                state = _initial_state()
+                save_state(state)
+    return state
 
-    with open(STATE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+
+def _initial_state() -> dict:
+    """
+    state.json이 없을 때 쓰는 초기 상태.
+    왜: 초기 실행 시 state.json이 없을 수 있으므로 기본값으로 생성
+    """
+    workspace = current_workspace()
+    return {
+        "project": workspace.project_name,
+        "total_weeks": len(workspace.chapters),
+        "current_week": 1,
+        "current_chapter": workspace.chapters[0],
+        "status": "pending",
+        "youtube_urls": [],
+        "notebooklm_notebook_url": None,
+        "created_at": datetime.now(KST).isoformat(),
+        "updated_at": datetime.now(KST).isoformat(),
+        "history": [],
+    }
 
 
 def save_state(state: dict) -> None:
     """
     state.json에 상태를 저장한다.
     왜: 모든 상태 변경은 반드시 이 함수를 통해야 일관성이 보장된다.
+    읽기-수정-쓰기는 locked_state()를 쓴다. 이 함수만 부르면 그사이 다른 프로세스의 변경을 덮어쓴다.
     """
     state["updated_at"] = datetime.now(KST).isoformat()
+    get_backend().save_state(state)
 
-    # 왜: data/ 디렉토리가 없을 수 있으므로 방어적으로 생성
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+@contextmanager
+def locked_state():
+    """
+    state_lock을 잡은 채 최신 상태를 다시 읽어 넘겨주고, 블록이 정상 종료되면 저장한다.
+    왜: run-week/backfill은 시작할 때 읽은 state를 몇 시간씩 들고 있다. 그 사본을 다시 쓰면
+    그사이 실행된 next/init-week나 다른 주차 워커의 변경이 조용히 되돌려진다.
+    """
+    with state_lock():
+        state = load_state()
+        yield state
+        save_state(state)
+
+
+def _refresh(stale: dict, fresh: dict) -> dict:
+    """호출자가 들고 있는 state 사본을 방금 저장한 최신 상태로 바꾼다."""
+    stale.clear()
+    stale.update(copy.deepcopy(fresh))
+    return stale
 
 
 def get_week_dir(week_number: int) -> Path:
@@ -118,7 +904,7 @@ def get_week_dir(week_number: int) -> Path:
     주차별 데이터 디렉토리 경로를 반환한다.
     왜: 주차 번호를 zero-padded 문자열로 변환하여 파일 정렬이 자연스럽게 되도록 한다.
     """
-    return WEEKS_DIR / f"week-{week_number:02d}"
+    return current_workspace().week_dir(week_number)
 
 
 def init_week(state: dict) -> dict:
@@ -126,55 +912,58 @@ def init_week(state: dict) -> dict:
     현재 주차의 디렉토리와 초기 파일을 생성한다.
     왜: 매주 시작 시 필요한 데이터 폴더를 생성하고,
     history에 새 주차 엔트리를 추가하여 진행 상태를 기록한다.
+    호출자의 state가 아니라 잠금 안에서 다시 읽은 최신 상태를 기준으로 한다.
     """
-    week_num = state["current_week"]
-    chapter = state["current_chapter"]
-    week_dir = get_week_dir(week_num)
+    with locked_state() as current:
+        week_num = current["current_week"]
+        chapter = current["current_chapter"]
+        week_dir = get_week_dir(week_num)
 
-    # 왜: 이미 생성된 주차라면 중복 생성을 방지
-    if week_dir.exists():
-        print(f"⚠️  Week {week_num} 디렉토리가 이미 존재합니다: {week_dir}")
-        return state
+        # 왜: 이미 생성된 주차라면 중복 생성을 방지
+        already_exists = week_dir.exists()
+        if already_exists:
+            print(f"⚠️  Week {week_num} 디렉토리가 이미 존재합니다: {week_dir}")
+        else:
+            week_dir.mkdir(parents=True, exist_ok=True)
+            print(f"📁 Week {week_num} 디렉토리 생성: {week_dir}")
 
-    week_dir.mkdir(parents=True, exist_ok=True)
-    print(f"📁 Week {week_num} 디렉토리 생성: {week_dir}")
+            # 왜: 주차별로 어떤 파이프라인 단계를 완료했는지 추적하는 메타 파일 생성
+            week_meta = {
+                "week": week_num,
+                "chapter": chapter,
+                "started_at": datetime.now(KST).isoformat(),
+                "completed_at": None,
+                "completed_steps": [],
+                "ideas_count": 0,
+            }
 
-    # 왜: 주차별로 어떤 파이프라인 단계를 완료했는지 추적하는 메타 파일 생성
-    week_meta = {
-        "week": week_num,
-        "chapter": chapter,
-        "started_at": datetime.now(KST).isoformat(),
-        "completed_at": None,
-        "completed_steps": [],
-        "ideas_count": 0,
-    }
-
-    meta_path = week_dir / "meta.json"
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(week_meta, f, ensure_ascii=False, indent=2)
+            get_backend().save_week_meta(week_num, week_meta)
 
-    # history에 추가
-    # 왜: 전체 프로젝트 히스토리에서 각 주차의 시작/완료를 한눈에 볼 수 있게 한다.
-    state["history"].append({
-        "week": week_num,
-        "chapter": chapter,
-        "started_at": datetime.now(KST).isoformat(),
-        "completed_at": None,
-        "ideas_count": 0,
-        "feedback_applied": False,
-    })
+            # history에 추가
+            # 왜: 전체 프로젝트 히스토리에서 각 주차의 시작/완료를 한눈에 볼 수 있게 한다.
+            if not any(entry["week"] == week_num for entry in current["history"]):
+                current["history"].append({
+                    "week": week_num,
+                    "chapter": chapter,
+                    "started_at": datetime.now(KST).isoformat(),
+                    "completed_at": None,
+                    "ideas_count": 0,
+                    "feedback_applied": False,
+                })
 
-    state["status"] = "in_progress"
-    save_state(state)
+            current["status"] = "in_progress"
 
-    print(f"✅ Week {week_num} 초기화 완료: {chapter}")
-    return state
+    if not already_exists:
+        update_week_index(week_num)
+        print(f"✅ Week {week_num} 초기화 완료: {chapter}")
+    return _refresh(state, current)
 
 
-def complete_step(state: dict, step_name: str) -> dict:
+def complete_step(state: dict, step_name: str, week_number: int = None) -> dict:
     """
-    현재 주차에서 특정 파이프라인 단계를 완료 표시한다.
+    현재 주차(또는 week_number 주차)에서 특정 파이프라인 단계를 완료 표시한다.
     왜: 파이프라인 중간에 중단되더라도 어디서부터 재시작해야 하는지 알 수 있다.
+    backfill은 현재 주차가 아닌 과거 주차를 채우므로 week_number를 직접 넘긴다.
     """
     if step_name not in PIPELINE_STEPS:
         valid_steps = ", ".join(PIPELINE_STEPS)
@@ -182,38 +971,41 @@ def complete_step(state: dict, step_name: str) -> dict:
         print(f"   유효한 단계: {valid_steps}")
         return state
 
-    week_num = state["current_week"]
-    week_dir = get_week_dir(week_num)
-    meta_path = week_dir / "meta.json"
+    week_num = week_number or state["current_week"]
+    backend = get_backend()
+    week_meta = backend.load_week_meta(week_num)
 
-    if not meta_path.exists():
+    if week_meta is None:
         print(f"❌ Week {week_num} 메타 파일이 없습니다. 먼저 init-week를 실행하세요.")
         return state
 
-    with open(meta_path, "r", encoding="utf-8") as f:
-        week_meta = json.load(f)
-
-    # 왜: 이미 완료된 단계는 다시 표시하지 않는다 (멱등성 보장)
-    if step_name in week_meta["completed_steps"]:
-        print(f"⚠️  '{step_name}' 단계는 이미 완료되었습니다.")
+    # 왜: 이미 완료된 단계는 다시 표시하지 않는다 (멱등성 보장).
+    # 지문은 매번 갱신하여 재실행 후 다시 완료 표시한 경우에도 최신 산출물을 기준으로 삼는다.
+    newly_completed = backend.mark_step_completed(week_num, step_name)
+    if step_name == "transcript_extracted":
+        record_week_sources(state, week_num)
+    record_step_fingerprint(state, step_name, week_num)
+    update_week_index(week_num)
+    if not newly_completed:
+        print(f"⚠️  Week {week_num} '{step_name}' 단계는 이미 완료되었습니다.")
         return state
 
     week_meta["completed_steps"].append(step_name)
 
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(week_meta, f, ensure_ascii=False, indent=2)
-
     remaining = [s for s in PIPELINE_STEPS if s not in week_meta["completed_steps"]]
     progress = len(week_meta["completed_steps"]) / len(PIPELINE_STEPS) * 100
 
-    print(f"✅ '{step_name}' 완료 ({progress:.0f}%)")
+    print(f"✅ Week {week_num} '{step_name}' 완료 ({progress:.0f}%)")
     if remaining:
         print(f"   남은 단계: {', '.join(remaining)}")
     else:
         print(f"🎉 Week {week_num} 모든 단계 완료!")
 
-    save_state(state)
-    return state
+    # 왜: 단계 완료는 주차 meta.json만 바꾼다. 호출자가 들고 있는 오래된 state를 다시 쓰지 않고,
+    # 잠금 안에서 최신 상태를 읽어 갱신 시각만 바꾼다.
+    with locked_state() as current:
+        pass
+    return _refresh(state, current)
 
 
 def transition_to_next_week(state: dict) -> dict:
@@ -221,52 +1013,765 @@ def transition_to_next_week(state: dict) -> dict:
     현재 주차를 완료하고 다음 주차로 전이한다.
     왜: 주간 사이클의 핵심 로직. 자동으로 다음 챕터를 설정하고
     상태를 갱신하여 매끄러운 순환이 가능하게 한다.
+    전이 전체를 잠금 안에서 최신 상태 기준으로 수행하여 동시에 실행된 다른 명령의 변경을 보존한다.
     """
-    week_num = state["current_week"]
-    total = state["total_weeks"]
+    with locked_state() as current:
+        week_num = current["current_week"]
+        total = current["total_weeks"]
 
-    # --- 현재 주차 완료 처리 ---
-    week_dir = get_week_dir(week_num)
-    meta_path = week_dir / "meta.json"
+        # --- 현재 주차 완료 처리 ---
+        backend = get_backend()
+        week_meta = backend.load_week_meta(week_num)
 
-    if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            week_meta = json.load(f)
+        if week_meta is not None:
+            # 왜: 모든 단계가 완료되지 않았으면 경고 (강제 전이는 허용)
+            incomplete = [s for s in PIPELINE_STEPS if s not in week_meta.get("completed_steps", [])]
+            if incomplete:
+                print(f"⚠️  Week {week_num}에 미완료 단계가 있습니다: {', '.join(incomplete)}")
+                print(f"   강제로 다음 주차로 전이합니다.")
 
-        # 왜: 모든 단계가 완료되지 않았으면 경고 (강제 전이는 허용)
-        incomplete = [s for s in PIPELINE_STEPS if s not in week_meta.get("completed_steps", [])]
-        if incomplete:
-            print(f"⚠️  Week {week_num}에 미완료 단계가 있습니다: {', '.join(incomplete)}")
-            print(f"   강제로 다음 주차로 전이합니다.")
+            backend.mark_week_completed(week_num, datetime.now(KST).isoformat())
+            update_week_index(week_num)
 
-        week_meta["completed_at"] = datetime.now(KST).isoformat()
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(week_meta, f, ensure_ascii=False, indent=2)
+        # history 업데이트
+        for entry in current["history"]:
+            if entry["week"] == week_num and entry["completed_at"] is None:
+                entry["completed_at"] = datetime.now(KST).isoformat()
+                break
 
-    # history 업데이트
-    for entry in state["history"]:
-        if entry["week"] == week_num and entry["completed_at"] is None:
-            entry["completed_at"] = datetime.now(KST).isoformat()
-            break
+        # --- 다음 주차로 전이 ---
+        cycle_finished = week_num >= total
+        if cycle_finished:
+            # 왜: 23주 사이클 완주 시 completed 상태로 전환
+            current["status"] = "completed"
+        else:
+            current["current_week"] = week_num + 1
+            current["current_chapter"] = current_workspace().chapters[week_num]  # 0-indexed
+            current["status"] = "pending"
 
-    # --- 다음 주차로 전이 ---
-    if week_num >= total:
-        # 왜: 23주 사이클 완주 시 completed 상태로 전환
-        state["status"] = "completed"
-        save_state(state)
+    if cycle_finished:
         print(f"🏆 축하합니다! 전체 {total}주 사이클을 완주했습니다!")
-        return state
+    else:
+        print(f"➡️  Week {current['current_week']}로 전이 완료: {current['current_chapter']}")
+    return _refresh(state, current)
 
-    next_week = week_num + 1
-    next_chapter = CHAPTERS[next_week - 1]  # 0-indexed
 
-    state["current_week"] = next_week
-    state["current_chapter"] = next_chapter
-    state["status"] = "pending"
-    save_state(state)
+def record_step_metrics(week_number: int, step_name: str, metrics: dict) -> bool:
+    """
+    주차 meta.json의 step_metrics에 단계 실행 지표를 기록한다.
+    왜: execution 스크립트(step_metrics.StepMetrics)가 직접 파일을 쓰면 잠금과 저장소 선택을
+    우회하게 되므로, 지표 기록도 다른 상태 변경과 같은 경로를 거치게 한다.
+
+    반환값: 기록했으면 True, 해당 주차 meta.json이 없으면 False
+    """
+    backend = get_backend()
+    with state_lock():
+        week_meta = backend.load_week_meta(week_number)
+        if week_meta is None:
+            return False
+        week_meta.setdefault("step_metrics", {})[step_name] = metrics
+        backend.save_week_meta(week_number, week_meta)
+    return True
+
+
+def build_profile_report() -> dict:
+    """
+    모든 주차의 step_metrics를 단계별로 집계한다.
+    왜: 최적화 우선순위를 정하려면 어느 단계가 시간/메모리/외부 호출을 지배하는지,
+    그리고 최근 주차에서 회귀가 있었는지를 한눈에 봐야 한다.
+    """
+    backend = get_backend()
+    per_week = {}
+    per_step = {}
+
+    for week_number in backend.week_numbers():
+        week_meta = backend.load_week_meta(week_number) or {}
+        step_metrics = week_meta.get("step_metrics", {})
+        if not step_metrics:
+            continue
+        per_week[week_number] = step_metrics
+
+        for step_name, metrics in step_metrics.items():
+            summary = per_step.setdefault(step_name, {
+                "runs": 0,
+                "failed_runs": 0,
+                "total_wall_seconds": 0.0,
+                "max_wall_seconds": 0.0,
+                "max_wall_week": None,
+                "peak_rss_mb": None,
+                "total_bytes_written": 0,
+                "external_calls": {},
+            })
+            wall = metrics.get("wall_seconds") or 0.0
+            summary["runs"] += 1
+            if metrics.get("status") != "success":
+                summary["failed_runs"] += 1
+            summary["total_wall_seconds"] += wall
+            if wall >= summary["max_wall_seconds"]:
+                summary["max_wall_seconds"] = wall
+                summary["max_wall_week"] = week_number
+            # 왜: 데몬 안에서 실행된 기록의 process_peak_rss_mb는 데몬 수명 최대치라 집계하지 않는다.
+            rss = max(
+                (metrics.get(key) for key in ("peak_rss_mb", "children_peak_rss_mb")
+                 if metrics.get(key) is not None),
+                default=None,
+            )
+            if rss is not None:
+                summary["peak_rss_mb"] = max(summary["peak_rss_mb"] or 0, rss)
+            summary["total_bytes_written"] += metrics.get("bytes_written", 0)
+            for service, count in metrics.get("external_calls", {}).items():
+                summary["external_calls"][service] = summary["external_calls"].get(service, 0) + count
+
+    for summary in per_step.values():
+        summary["total_wall_seconds"] = round(summary["total_wall_seconds"], 3)
+        summary["avg_wall_seconds"] = round(summary["total_wall_seconds"] / summary["runs"], 3)
+
+    return {
+        "workspace": current_workspace().name,
+        "generated_at": datetime.now(KST).isoformat(),
+        "weeks_profiled": sorted(per_week),
+        "steps": {step: per_step[step] for step in PIPELINE_STEPS if step in per_step},
+        "weeks": per_week,
+    }
+
+
+def print_profile(report: dict) -> None:
+    """단계별 집계를 표로 출력한다."""
+    if not report["steps"]:
+        print("ℹ️  기록된 단계 계측이 없습니다. execution 스크립트를 한 번 이상 실행하세요.")
+        return
+
+    print(f"⏱️  단계별 실행 지표 (주차 {len(report['weeks_profiled'])}개)")
+    header = f"{'단계':<24}{'실행':>5}{'실패':>5}{'평균(s)':>10}{'최대(s)':>10}{'최대주차':>8}{'RSS(MB)':>9}{'기록(KB)':>10}  외부 호출"
+    print(header)
+    print("-" * (len(header) + 10))
+    for step_name, summary in report["steps"].items():
+        calls = ", ".join(f"{service} {count}" for service, count in summary["external_calls"].items())
+        rss = summary["peak_rss_mb"]
+        print(
+            f"{step_name:<24}{summary['runs']:>5}{summary['failed_runs']:>5}"
+            f"{summary['avg_wall_seconds']:>10.2f}{summary['max_wall_seconds']:>10.2f}"
+            f"{summary['max_wall_week'] or '-':>8}{rss if rss is not None else '-':>9}"
+            f"{summary['total_bytes_written'] / 1024:>10.1f}  {calls or '-'}"
+        )
+
+
+def summarize_week(week_number: int) -> dict:
+    """
+    한 주차의 진행 상황, 아이디어 수, MFS 분포, 산출물 크기를 요약한다.
+    왜: 이 함수는 해당 주차 디렉토리 하나만 읽으므로, 변경된 주차만 다시 요약하면
+    전체 인덱스를 주차 수와 무관한 비용으로 최신 상태로 유지할 수 있다.
+    """
+    week_meta = get_backend().load_week_meta(week_number) or {}
+    week_dir = get_week_dir(week_number)
+
+    ideas = []
+    ideas_path = week_dir / "ideas.json"
+    if ideas_path.exists():
+        try:
+            with open(ideas_path, "r", encoding="utf-8") as f:
+                ideas = json.load(f).get("ideas", [])
+        except (json.JSONDecodeError, AttributeError):
+            print(f"⚠️  Week {week_number} ideas.json을 해석할 수 없어 아이디어 요약을 건너뜁니다.")
+
+    mfs_distribution = {label: 0 for _, label in MFS_BUCKETS}
+    mfs_totals = []
+    for idea in ideas:
+        total = (idea.get("mfs") or {}).get("total")
+        if not isinstance(total, (int, float)):
+            continue
+        mfs_totals.append(total)
+        for lower_bound, label in MFS_BUCKETS:
+            if total >= lower_bound:
+                mfs_distribution[label] += 1
+                break
+
+    artifact_sizes = {}
+    if week_dir.exists():
+        for path in sorted(week_dir.iterdir()):
+            if path.is_file() and not path.name.startswith("."):
+                artifact_sizes[path.name] = path.stat().st_size
+
+    completed_steps = [step for step in PIPELINE_STEPS if step in week_meta.get("completed_steps", [])]
+    return {
+        "week": week_number,
+        "chapter": week_meta.get("chapter"),
+        "started_at": week_meta.get("started_at"),
+        "completed_at": week_meta.get("completed_at"),
+        "completed_steps": completed_steps,
+        "progress": round(len(completed_steps) / len(PIPELINE_STEPS) * 100),
+        "ideas_count": len(ideas),
+        "mfs_distribution": mfs_distribution,
+        "mfs_average": round(sum(mfs_totals) / len(mfs_totals), 2) if mfs_totals else None,
+        "artifact_sizes": artifact_sizes,
+        "artifact_bytes": sum(artifact_sizes.values()),
+        "indexed_at": datetime.now(KST).isoformat(),
+    }
+
+
+def _rollup_week_index(weeks: dict) -> dict:
+    """주차별 요약을 전체 합계로 묶는다."""
+    mfs_distribution = {label: 0 for _, label in MFS_BUCKETS}
+    for entry in weeks.values():
+        for label, count in entry["mfs_distribution"].items():
+            mfs_distribution[label] = mfs_distribution.get(label, 0) + count
+
+    return {
+        "weeks_indexed": len(weeks),
+        "weeks_completed": sum(1 for entry in weeks.values() if entry["completed_at"]),
+        "steps_completed": sum(len(entry["completed_steps"]) for entry in weeks.values()),
+        "ideas_count": sum(entry["ideas_count"] for entry in weeks.values()),
+        "mfs_distribution": mfs_distribution,
+        "artifact_bytes": sum(entry["artifact_bytes"] for entry in weeks.values()),
+    }
+
+
+def load_week_index() -> dict:
+    """week-index.json을 읽는다. 없으면 빈 인덱스를 반환한다."""
+    index_file = current_workspace().index_file
+    if not index_file.exists():
+        return {"updated_at": None, "weeks": {}, "totals": _rollup_week_index({})}
+    with open(index_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_week_index(week_number: int) -> None:
+    """
+    week-index.json에서 한 주차의 요약만 갱신한다.
+    왜: 상태가 바뀐 주차만 다시 읽고, 나머지 주차 요약은 기존 인덱스 값을 그대로 쓴다.
+    합계는 인덱스 안의 요약만으로 다시 계산하므로 다른 주차 디렉토리를 열지 않는다.
+    """
+    with state_lock():
+        index = load_week_index()
+        index["weeks"][str(week_number)] = summarize_week(week_number)
+        index["weeks"] = dict(sorted(index["weeks"].items(), key=lambda item: int(item[0])))
+        index["totals"] = _rollup_week_index(index["weeks"])
+        index["updated_at"] = datetime.now(KST).isoformat()
+        atomic_write_json(current_workspace().index_file, index)
+
+
+def rebuild_week_index(week_number: int = None) -> None:
+    """
+    인덱스를 재생성한다. week_number를 주면 그 주차만 갱신한다.
+    왜: 에이전트가 state_manager를 거치지 않고 ideas.json 등을 직접 고친 경우에 맞춘다.
+    """
+    if week_number is not None:
+        update_week_index(week_number)
+        print(f"✅ Week {week_number} 인덱스 갱신 완료")
+        return
+
+    week_numbers = sorted(set(get_backend().week_numbers()) | {
+        int(path.name.split("-")[1])
+        for path in current_workspace().weeks_dir.glob("week-*")
+        if path.is_dir()
+    })
+    with state_lock():
+        weeks = {str(number): summarize_week(number) for number in week_numbers}
+        index = {
+            "updated_at": datetime.now(KST).isoformat(),
+            "weeks": weeks,
+            "totals": _rollup_week_index(weeks),
+        }
+        atomic_write_json(current_workspace().index_file, index)
+    print(f"✅ 인덱스 재생성 완료: 주차 {len(weeks)}개 → {current_workspace().index_file}")
+
+
+def print_all_status(state: dict) -> None:
+    """
+    week-index.json만 읽어 전체 주차 요약을 출력한다.
+    왜: 주차 디렉토리를 하나씩 열지 않으므로 사이클이 여러 개 쌓여도 응답 시간이 일정하다.
+    """
+    index = load_week_index()
+    if not index["weeks"]:
+        print("ℹ️  주차 인덱스가 비어 있습니다. 'reindex' 명령으로 생성하세요.")
+        return
+
+    print(f"📚 전체 주차 요약 (현재 Week {state['current_week']}/{state['total_weeks']}, 인덱스 갱신: {index['updated_at']})")
+    labels = [label for _, label in MFS_BUCKETS]
+    print(f"{'주차':>4}  {'단계':>5}  {'아이디어':>6}  {'MFS 평균':>8}  {' / '.join(labels):<28}  {'크기(KB)':>8}  챕터")
+    for entry in index["weeks"].values():
+        distribution = " / ".join(str(entry["mfs_distribution"].get(label, 0)) for label in labels)
+        average = f"{entry['mfs_average']:.1f}" if entry["mfs_average"] is not None else "-"
+        done = "✅" if entry["completed_at"] else "  "
+        chapter = (entry["chapter"] or "-")[:40]
+        print(
+            f"{entry['week']:>4}  {len(entry['completed_steps'])}/{len(PIPELINE_STEPS):<3}  "
+            f"{entry['ideas_count']:>6}  {average:>8}  {distribution:<28}  "
+            f"{entry['artifact_bytes'] / 1024:>8.1f}  {done} {chapter}"
+        )
+
+    totals = index["totals"]
+    distribution = " / ".join(str(totals["mfs_distribution"].get(label, 0)) for label in labels)
+    print(
+        f"\n합계: 주차 {totals['weeks_indexed']}개 (완료 {totals['weeks_completed']}), "
+        f"단계 {totals['steps_completed']}개, 아이디어 {totals['ideas_count']}개, "
+        f"MFS 분포 [{distribution}], 산출물 {totals['artifact_bytes'] / 1024:.1f}KB"
+    )
+
+
+def hash_file(path: Path) -> str:
+    """
+    파일의 SHA-256 해시를 반환한다. 파일이 없으면 None.
+    왜: 산출물이 바뀌었는지를 수정 시각이 아닌 내용으로 판단해야 복사/체크아웃에도 안정적이다.
+    """
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_step_outputs(step_name: str, week_number: int) -> dict:
+    """단계 산출물 파일별 해시를 반환한다."""
+    week_dir = get_week_dir(week_number)
+    return {
+        artifact: hash_file(week_dir / artifact)
+        for artifact in STEP_ARTIFACTS[step_name]
+    }
+
+
+def collect_step_inputs(step_name: str, state: dict, week_number: int = None) -> dict:
+    """
+    단계 결과를 결정하는 입력값을 모은다.
+    왜: 입력이 같고 산출물이 그대로라면 단계를 다시 실행해도 같은 결과가 나오므로,
+    유료 API 호출(deep-research)과 네트워크 왕복을 건너뛸 수 있다.
+    상위 단계 산출물 해시를 포함하여 상류가 바뀌면 하류도 다시 실행되게 한다.
+    """
+    # 왜: 각 스크립트의 기본값을 직접 참조해야 스크립트 설정이 바뀌었을 때 지문도 바뀐다.
+    import notebooklm_query
+    import trend_researcher
+    import wysh_scanner
+    import youtube_transcript
+
+    week_num = week_number or state["current_week"]
+    inputs = {}
+    if step_name == "transcript_extracted":
+        inputs["youtube_urls"] = week_youtube_urls(state, week_num)
+        inputs["languages"] = youtube_transcript.DEFAULT_LANGUAGES
+    elif step_name == "notebooklm_analyzed":
+        # 왜: 과거 주차는 현재 챕터가 아닌 해당 주차 meta.json의 챕터를 기준으로 한다.
+        week_meta = get_backend().load_week_meta(week_num) or {}
+        inputs["chapter"] = week_meta.get("chapter") or state.get("current_chapter")
+        inputs["questions"] = notebooklm_query.DEFAULT_QUESTIONS
+    elif step_name == "wysh_context_collected":
+        scanner_config = wysh_scanner.load_env_config()
+        inputs["shop_url"] = scanner_config["shop_url"]
+        inputs["instagram_handle"] = scanner_config["instagram_handle"]
+    elif step_name == "trends_researched":
+        inputs["topics"] = trend_researcher.DEFAULT_TOPICS
+
+    # 왜: 워크스페이스 환경 변수(쇼핑몰 URL 등)가 바뀌면 같은 스크립트라도 결과가 달라진다.
+    workspace_env = current_workspace().env
+    if workspace_env:
+        inputs["workspace_env"] = workspace_env
+
+    inputs["upstream"] = {
+        dep: hash_step_outputs(dep, week_num)
+        for dep in PIPELINE_DEPENDENCIES[step_name]
+    }
+    return inputs
+
+
+def compute_step_fingerprint(step_name: str, state: dict, week_number: int = None) -> dict:
+    """
+    단계의 입력 해시와 산출물 해시로 이루어진 지문을 계산한다.
+    왜: 입력 원문 전체가 아닌 해시만 meta.json에 남겨 파일 크기를 작게 유지한다.
+    """
+    week_num = week_number or state["current_week"]
+    inputs = collect_step_inputs(step_name, state, week_num)
+    canonical = json.dumps(inputs, ensure_ascii=False, sort_keys=True)
+    return {
+        "inputs": hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        "outputs": hash_step_outputs(step_name, week_num),
+    }
 
-    print(f"➡️  Week {next_week}로 전이 완료: {next_chapter}")
-    return state
+
+def record_step_fingerprint(state: dict, step_name: str, week_number: int = None) -> None:
+    """
+    주차 meta.json의 step_fingerprints에 단계 지문을 기록한다.
+    왜: 다음 run-week --reuse 실행 시 비교 기준이 된다.
+    """
+    week_num = week_number or state["current_week"]
+    fingerprint = compute_step_fingerprint(step_name, state, week_num)
+    fingerprint["recorded_at"] = datetime.now(KST).isoformat()
+
+    backend = get_backend()
+    with state_lock():
+        week_meta = backend.load_week_meta(week_num)
+        if week_meta is None:
+            return
+        week_meta.setdefault("step_fingerprints", {})[step_name] = fingerprint
+        backend.save_week_meta(week_num, week_meta)
+
+
+def step_fingerprint_matches(state: dict, step_name: str, week_meta: dict) -> bool:
+    """
+    기록된 지문이 현재 입력/산출물과 일치하는지 확인한다.
+    왜: 산출물이 지워졌거나 수정되었으면, 입력이 같아도 다시 실행해야 한다.
+    """
+    recorded = week_meta.get("step_fingerprints", {}).get(step_name)
+    if not recorded:
+        return False
+
+    current = compute_step_fingerprint(step_name, state, week_meta["week"])
+    if any(value is None for value in current["outputs"].values()):
+        return False
+    return (
+        recorded.get("inputs") == current["inputs"]
+        and recorded.get("outputs") == current["outputs"]
+    )
+
+
+def collect_youtube_urls(state: dict) -> list:
+    """
+    트랜스크립트 배치 대상 URL(.env의 YOUTUBE_URLS + 상태의 youtube_urls)을 반환한다.
+    왜: youtube_transcript.py --all이 읽는 목록과 같은 규칙을 써야
+    실행 여부 판단과 단계 지문이 실제 추출 대상과 일치한다.
+    """
+    import youtube_transcript
+
+    # 왜: 워크스페이스 설정의 YOUTUBE_URLS는 서브프로세스 환경 변수로 전달되므로 같이 반영한다.
+    return youtube_transcript.load_youtube_urls(
+        state.get("youtube_urls") or [],
+        current_workspace().env.get("YOUTUBE_URLS"),
+    )
+
+
+def week_youtube_urls(state: dict, week_number: int) -> list:
+    """
+    주차의 트랜스크립트 대상 URL을 반환한다.
+    왜: backfill이 지난 주차를 현재 설정의 URL로 다시 만들면 그 주차의 원래 영상이 아닌
+    이번 주 영상의 트랜스크립트로 덮어쓰게 된다. 주차 meta.json에 기록된 URL을 우선하고,
+    기록이 없으면 현재 주차만 현재 설정을 쓴다. 기록 없는 지난 주차는 빈 목록이다.
+    """
+    week_meta = get_backend().load_week_meta(week_number) or {}
+    if week_meta.get("youtube_urls"):
+        return week_meta["youtube_urls"]
+    if week_number == state["current_week"]:
+        return collect_youtube_urls(state)
+    return []
+
+
+def record_week_sources(state: dict, week_number: int) -> None:
+    """트랜스크립트 추출이 끝난 주차의 meta.json에 사용한 URL을 남긴다 (이미 있으면 유지)."""
+    urls = week_youtube_urls(state, week_number)
+    if not urls:
+        return
+    backend = get_backend()
+    with state_lock():
+        week_meta = backend.load_week_meta(week_number)
+        if week_meta is None or week_meta.get("youtube_urls"):
+            return
+        week_meta["youtube_urls"] = urls
+        backend.save_week_meta(week_number, week_meta)
+
+
+def build_step_command(step_name: str, state: dict, week_number: int = None) -> list:
+    """
+    파이프라인 단계를 실행할 execution 스크립트 커맨드를 만든다.
+    왜: 스크립트로 자동화된 단계만 run-week가 직접 실행하고,
+    에이전트 판단이 필요한 단계(NotebookLM 질의, 아이디어 생성, 피드백)는
+    None을 반환하여 오케스트레이션 레이어에 맡긴다.
+    """
+    week_num = week_number or state["current_week"]
+    execution_dir = PROJECT_ROOT / "execution"
+
+    if step_name == "transcript_extracted":
+        # 왜: 영상 URL이 없으면 추출할 대상이 없으므로 수동 단계로 남긴다.
+        # 기록된 URL이 없는 지난 주차(backfill)도 마찬가지다.
+        # URL을 명시적으로 넘겨, 지난 주차를 현재 주차의 영상으로 다시 만들지 않게 한다.
+        urls = week_youtube_urls(state, week_num)
+        if not urls:
+            return None
+        return [
+            sys.executable, str(execution_dir / "youtube_transcript.py"),
+            "--urls", *urls, "--week", str(week_num),
+        ]
+    if step_name == "wysh_context_collected":
+        return [
+            sys.executable, str(execution_dir / "wysh_scanner.py"),
+            "--target", "all", "--week", str(week_num), "--headless",
+        ]
+    if step_name == "trends_researched":
+        return [
+            sys.executable, str(execution_dir / "trend_researcher.py"),
+            "--week", str(week_num),
+        ]
+
+    return None
+
+
+async def _run_step_process(step_name: str, cmd: list, semaphore: asyncio.Semaphore = None) -> int:
+    """
+    단계 하나를 서브프로세스로 실행하고 출력을 단계 이름 접두어와 함께 중계한다.
+    왜: 여러 단계가 동시에 출력하므로 어떤 로그가 어느 단계의 것인지 구분해야 한다.
+    semaphore가 주어지면 같은 외부 서비스를 쓰는 단계끼리 동시 실행 수를 제한한다.
+    """
+    workspace = current_workspace()
+    label = step_name if workspace.name == DEFAULT_WORKSPACE else f"{workspace.name}/{step_name}"
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(1)
+
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=str(PROJECT_ROOT),
+            env=workspace.subprocess_env(),
+        )
+        async for raw_line in process.stdout:
+            line = raw_line.decode("utf-8", errors="replace").rstrip()
+            print(f"   [{label}] {line}")
+        return await process.wait()
+
+
+async def run_week_pipeline(
+    state: dict,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    reuse: bool = False,
+    service_semaphores: dict = None,
+    week_number: int = None,
+) -> dict:
+    """
+    현재 주차의 파이프라인을 의존성 그래프에 따라 동시 실행한다.
+    왜: 선행 단계가 모두 완료된 단계는 즉시 실행하고, 각 단계가 끝나는 즉시
+    complete_step을 호출하여 중간에 중단되더라도 진행 상황이 보존되게 한다.
+    complete_step은 이벤트 루프 안에서 순차적으로 호출되므로 meta.json 갱신이 겹치지 않는다.
+
+    reuse=True이면 완료 표시 대신 지문으로 재사용 여부를 판단한다. 지문이 일치하는 단계는
+    실행 없이 완료 처리하고, 입력이나 산출물이 바뀐 단계는 완료 표시가 있어도 다시 실행한다.
+    상위 단계가 다시 실행되면 하위 단계의 입력 해시도 바뀌므로 변경이 자연스럽게 전파된다.
+
+    service_semaphores는 run-all/backfill이 공유하는 {서비스: Semaphore}이다.
+    week_number를 주면 현재 주차 대신 해당 주차를 실행한다 (backfill).
+
+    반환값: {단계 이름: "completed" | "reused" | "skipped" | "failed" | "manual" | "blocked"}
+    """
+    week_num = week_number or state["current_week"]
+    week_meta = get_backend().load_week_meta(week_num)
+
+    if week_meta is None:
+        print(f"❌ Week {week_num} 메타 파일이 없습니다. 먼저 init-week를 실행하세요.")
+        return {}
+
+    marked_completed = set(week_meta.get("completed_steps", []))
+    fingerprints = week_meta.get("step_fingerprints", {})
+    if reuse:
+        # 왜: 재사용 모드에서는 완료 표시를 그대로 믿지 않고, 준비된 시점에 지문을 검사한다.
+        completed = set()
+    else:
+        completed = set(marked_completed)
+    outcomes = {step: "skipped" for step in completed if step in PIPELINE_STEPS}
+    pending = [step for step in PIPELINE_STEPS if step not in completed]
+    running = {}
+
+    mode = " (지문 재사용 모드)" if reuse else ""
+    workspace_label = "" if current_workspace().name == DEFAULT_WORKSPACE else f"[{current_workspace().name}] "
+    print(f"🚀 {workspace_label}Week {week_num} 파이프라인 실행 (최대 동시 실행: {max_workers}){mode}")
+
+    while True:
+        # 왜: 선행 단계가 모두 완료된 단계만 실행 후보가 된다.
+        for step in list(pending):
+            if len(running) >= max_workers:
+                break
+            if not all(dep in completed for dep in PIPELINE_DEPENDENCIES[step]):
+                continue
+
+            pending.remove(step)
+
+            if reuse:
+                if step_fingerprint_matches(state, step, week_meta):
+                    completed.add(step)
+                    outcomes[step] = "reused"
+                    print(f"♻️  Week {week_num} '{step}' 지문 일치 — 재사용")
+                    if step not in marked_completed:
+                        complete_step(state, step, week_num)
+                    continue
+                if step in marked_completed and step not in fingerprints:
+                    # 왜: 지문 기능 이전에 완료된 단계는 검증할 수 없으므로 완료 표시를 신뢰한다.
+                    completed.add(step)
+                    outcomes[step] = "skipped"
+                    continue
+
+            cmd = build_step_command(step, state, week_num)
+            if cmd is None:
+                outcomes[step] = "manual"
+                if step == "transcript_extracted" and week_num != state["current_week"]:
+                    print(f"⏭️  Week {week_num} '{step}': 주차에 기록된 영상 URL이 없어 다시 만들지 않습니다.")
+                else:
+                    print(f"🤖 Week {week_num} '{step}' 단계는 에이전트가 직접 수행해야 합니다.")
+                continue
+
+            print(f"▶️  Week {week_num} '{step}' 시작")
+            service = STEP_SERVICES.get(step)
+            semaphore = (service_semaphores or {}).get(service)
+            task = asyncio.create_task(_run_step_process(step, cmd, semaphore))
+            running[task] = step
+
+        if not running:
+            break
+
+        done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            step = running.pop(task)
+            try:
+                returncode = task.result()
+            except Exception as e:
+                print(f"❌ Week {week_num} '{step}' 실행 에러: {e}")
+                returncode = -1
+
+            if returncode == 0:
+                completed.add(step)
+                outcomes[step] = "completed"
+                complete_step(state, step, week_num)
+            else:
+                outcomes[step] = "failed"
+                print(f"❌ Week {week_num} '{step}' 실패 (exit code {returncode})")
+
+    # 왜: 선행 단계가 실패했거나 수동 단계에 막힌 단계는 실행되지 못한 채 남는다.
+    for step in pending:
+        outcomes[step] = "blocked"
+
+    print(f"\n📋 {workspace_label}Week {week_num} run-week 결과:")
+    for step in PIPELINE_STEPS:
+        print(f"   {step}: {outcomes.get(step, 'blocked')}")
+
+    return outcomes
+
+
+async def run_all_workspaces(max_workers: int = DEFAULT_MAX_WORKERS, reuse: bool = False) -> dict:
+    """
+    모든 워크스페이스의 현재 주차를 하나의 이벤트 루프에서 동시에 진행한다.
+    왜: 워크스페이스마다 저장소를 복제해 따로 돌리면 브라우저와 유료 API 한도를
+    서로 모른 채 나눠 쓰게 된다. 한 프로세스에서 서비스별 세마포어를 공유하여
+    전체 동시 실행 수를 SERVICE_CONCURRENCY 안으로 묶는다.
+
+    반환값: {워크스페이스 이름: run_week_pipeline 결과}
+    """
+    service_semaphores = {
+        service: asyncio.Semaphore(limit)
+        for service, limit in SERVICE_CONCURRENCY.items()
+    }
+
+    async def advance(name: str) -> dict:
+        # 왜: gather가 만든 태스크는 각자 컨텍스트 복사본을 가지므로 여기서의 전환은 격리된다.
+        workspace = activate_workspace(name)
+        state = load_state()
+
+        if state["status"] == "completed":
+            print(f"🏆 [{name}] 사이클이 이미 완료되었습니다.")
+            return {}
+        if get_backend().load_week_meta(state["current_week"]) is None:
+            state = init_week(state)
+
+        outcomes = await run_week_pipeline(state, max_workers, reuse, service_semaphores)
+        print(f"   ({workspace.name}: Week {state['current_week']})")
+        return outcomes
+
+    names = list_workspaces()
+    print(f"🗂️  워크스페이스 {len(names)}개 진행: {', '.join(names)}")
+    results = await asyncio.gather(*(advance(name) for name in names), return_exceptions=True)
+
+    summary = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"❌ [{name}] 실행 에러: {result}")
+            summary[name] = {"error": str(result)}
+        else:
+            summary[name] = result
+    return summary
+
+
+def ensure_week_meta(state: dict, week_number: int) -> dict:
+    """
+    과거 주차의 meta.json이 없으면 만든다.
+    왜: backfill은 현재 주차와 history를 건드리지 않고 지난 주차의 산출물만 재생성해야 한다.
+    이미 존재하는 meta.json(완료 단계, 지문)은 그대로 두어 --reuse가 동작하게 한다.
+    """
+    backend = get_backend()
+    week_meta = backend.load_week_meta(week_number)
+    if week_meta is not None:
+        return week_meta
+
+    # 왜: history에 기록된 챕터명이 있으면 그것을, 없으면 챕터 목록의 해당 순번을 쓴다.
+    chapter = None
+    for entry in state.get("history", []):
+        if entry["week"] == week_number:
+            chapter = entry.get("chapter")
+            break
+    if chapter is None:
+        chapters = current_workspace().chapters
+        chapter = chapters[week_number - 1] if week_number <= len(chapters) else f"Week {week_number}"
+
+    week_meta = {
+        "week": week_number,
+        "chapter": chapter,
+        "started_at": datetime.now(KST).isoformat(),
+        "completed_at": None,
+        "completed_steps": [],
+        "ideas_count": 0,
+    }
+    backend.save_week_meta(week_number, week_meta)
+    update_week_index(week_number)
+    return week_meta
+
+
+async def backfill_weeks(
+    state: dict,
+    from_week: int,
+    to_week: int,
+    parallel_weeks: int = DEFAULT_PARALLEL_WEEKS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    reuse: bool = False,
+) -> dict:
+    """
+    여러 주차의 스크립트 단계를 제한된 워커 풀에서 동시에 재생성한다.
+    왜: 쉬었다가 따라잡거나 프롬프트를 바꾼 뒤 23주치를 다시 만들 때, 주차별로 직렬
+    실행하면 주차 수만큼 시간이 곱해진다. 주차 단위 세마포어로 동시 주차 수를,
+    서비스별 세마포어로 브라우저/유료 API 동시 사용 수를 묶어 외부 한도는 지키면서
+    남는 병렬성을 모두 쓴다. 각 단계는 별도 프로세스로 실행되고, 끝나는 즉시
+    해당 주차의 meta.json에 완료와 지문이 기록된다.
+
+    반환값: {주차 번호: run_week_pipeline 결과}
+    """
+    week_semaphore = asyncio.Semaphore(parallel_weeks)
+    service_semaphores = {
+        service: asyncio.Semaphore(limit)
+        for service, limit in SERVICE_CONCURRENCY.items()
+    }
+
+    async def run_one(week_number: int) -> dict:
+        async with week_semaphore:
+            ensure_week_meta(state, week_number)
+            return await run_week_pipeline(
+                state, max_workers, reuse, service_semaphores, week_number
+            )
+
+    weeks = list(range(from_week, to_week + 1))
+    print(f"⏪ Week {from_week}~{to_week} backfill ({len(weeks)}주, 동시 주차 {parallel_weeks}개)")
+    results = await asyncio.gather(*(run_one(week) for week in weeks), return_exceptions=True)
+
+    summary = {}
+    for week_number, result in zip(weeks, results):
+        if isinstance(result, Exception):
+            print(f"❌ Week {week_number} backfill 에러: {result}")
+            summary[week_number] = {"error": str(result)}
+        else:
+            summary[week_number] = result
+
+    print("\n📊 backfill 요약:")
+    for week_number, outcomes in summary.items():
+        counts = {}
+        for outcome in outcomes.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        detail = ", ".join(f"{name} {count}" for name, count in sorted(counts.items()))
+        print(f"   Week {week_number:02d}: {detail or '실행 없음'}")
+
+    return summary
 
 
 def print_status(state: dict) -> None:
@@ -294,13 +1799,9 @@ def print_status(state: dict) -> None:
     print("╚══════════════════════════════════════════════════════════════╝")
 
     # 현재 주차 파이프라인 진행 상황
-    week_dir = get_week_dir(week_num)
-    meta_path = week_dir / "meta.json"
-
-    if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            week_meta = json.load(f)
+    week_meta = get_backend().load_week_meta(week_num)
 
+    if week_meta is not None:
         completed = week_meta.get("completed_steps", [])
         print("\n📋 파이프라인 진행 상황:")
         for step in PIPELINE_STEPS:
@@ -316,39 +1817,158 @@ def main():
     왜: state_manager를 커맨드라인에서 직접 실행할 수 있게 하여
     에이전트와 개발자 모두 사용 가능하게 한다.
     """
-    if len(sys.argv) < 2:
-        print("사용법: python execution/state_manager.py <command>")
+    args = sys.argv[1:]
+
+    # 왜: --workspace는 모든 명령에 공통인 옵션이므로 명령 해석 전에 분리한다.
+    workspace_name = DEFAULT_WORKSPACE
+    if "--workspace" in args:
+        index = args.index("--workspace")
+        if index + 1 >= len(args):
+            print("❌ --workspace 뒤에 워크스페이스 이름을 지정해주세요.")
+            sys.exit(1)
+        workspace_name = args[index + 1]
+        del args[index:index + 2]
+
+    if not args:
+        print("사용법: python execution/state_manager.py [--workspace <name>] <command>")
         print("")
         print("명령어:")
-        print("  status          현재 프로젝트 상태 출력")
+        print("  status [--all]  현재 프로젝트 상태 출력 (--all: 전체 주차 요약)")
+        print("  reindex [--week N]  주차 요약 인덱스(week-index.json) 재생성")
         print("  init-week       현재 주차 디렉토리 초기화")
         print("  next            다음 주차로 전이")
         print("  complete-step <step>  파이프라인 단계 완료 표시")
+        print("  run-week [--max-workers N] [--reuse]  독립 단계를 동시에 실행")
+        print("                  --reuse: 입력/산출물 지문이 그대로인 단계는 건너뜀")
+        print("  migrate-sqlite  JSON 상태를 SQLite 저장소로 이전")
+        print("  export-json     SQLite 상태를 JSON 파일 레이아웃으로 내보내기")
+        print("  workspaces      워크스페이스 목록 출력")
+        print("  create-workspace <name> [chapters_file]  워크스페이스 생성")
+        print("  run-all [--max-workers N] [--reuse]  모든 워크스페이스를 한 프로세스에서 진행")
+        print("  backfill --from N --to M [--parallel-weeks K] [--max-workers N] [--reuse]")
+        print("                  여러 주차의 스크립트 단계를 동시에 재생성")
+        print("  profile [--output report.json]  주차별 단계 실행 지표를 집계")
         print("")
         print("파이프라인 단계:")
         for step in PIPELINE_STEPS:
             print(f"  - {step}")
         sys.exit(1)
 
-    command = sys.argv[1]
+    command = args[0]
+
+    max_workers = DEFAULT_MAX_WORKERS
+    reuse = "--reuse" in args
+    if "--max-workers" in args:
+        try:
+            max_workers = max(1, int(args[args.index("--max-workers") + 1]))
+        except (IndexError, ValueError):
+            print("❌ --max-workers 뒤에 정수를 지정해주세요.")
+            sys.exit(1)
+
+    # 왜: 워크스페이스 관리 명령은 특정 워크스페이스의 상태를 로드하지 않는다.
+    if command == "workspaces":
+        for name in list_workspaces():
+            workspace = get_workspace(name)
+            print(f"  - {name}: {workspace.data_dir} (챕터 {len(workspace.chapters)}개)")
+        return
+    if command == "create-workspace":
+        if len(args) < 2:
+            print("❌ 워크스페이스 이름을 지정해주세요.")
+            sys.exit(1)
+        if create_workspace(args[1], args[2] if len(args) > 2 else None) is None:
+            sys.exit(1)
+        return
+    if command == "run-all":
+        summary = asyncio.run(run_all_workspaces(max_workers, reuse))
+        if any("failed" in outcomes.values() or "error" in outcomes for outcomes in summary.values()):
+            sys.exit(1)
+        return
+
+    try:
+        activate_workspace(workspace_name)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    # 왜: 저장소 이전/내보내기는 현재 설정된 저장소와 무관하게 동작해야 하므로
+    # load_state()로 초기 상태를 만들기 전에 처리한다.
+    if command == "migrate-sqlite":
+        migrate_json_to_sqlite()
+        return
+    if command == "export-json":
+        export_json()
+        return
+    if command == "profile":
+        report = build_profile_report()
+        print_profile(report)
+        output_path = current_workspace().data_dir / "profile-report.json"
+        if "--output" in args and args.index("--output") + 1 < len(args):
+            output_path = Path(args[args.index("--output") + 1])
+        atomic_write_json(output_path, report)
+        print(f"\n💾 프로파일 리포트 저장: {output_path}")
+        return
+
     state = load_state()
 
     if command == "status":
-        print_status(state)
+        if "--all" in args:
+            print_all_status(state)
+        else:
+            print_status(state)
+    elif command == "reindex":
+        week_number = None
+        if "--week" in args:
+            try:
+                week_number = int(args[args.index("--week") + 1])
+            except (IndexError, ValueError):
+                print("❌ --week 뒤에 주차 번호를 지정해주세요.")
+                sys.exit(1)
+        rebuild_week_index(week_number)
     elif command == "init-week":
         init_week(state)
     elif command == "next":
         transition_to_next_week(state)
     elif command == "complete-step":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("❌ 단계 이름을 지정해주세요.")
             print(f"   예: python execution/state_manager.py complete-step transcript_extracted")
             sys.exit(1)
-        complete_step(state, sys.argv[2])
+        complete_step(state, args[1])
+    elif command == "run-week":
+        outcomes = asyncio.run(run_week_pipeline(state, max_workers, reuse))
+        if "failed" in outcomes.values():
+            sys.exit(1)
+    elif command == "backfill":
+        try:
+            from_week = int(args[args.index("--from") + 1]) if "--from" in args else 1
+            to_week = int(args[args.index("--to") + 1]) if "--to" in args else state["current_week"]
+            parallel_weeks = DEFAULT_PARALLEL_WEEKS
+            if "--parallel-weeks" in args:
+                parallel_weeks = max(1, int(args[args.index("--parallel-weeks") + 1]))
+        except (IndexError, ValueError):
+            print("❌ --from/--to/--parallel-weeks 뒤에 정수를 지정해주세요.")
+            sys.exit(1)
+
+        if not 1 <= from_week <= to_week <= state["total_weeks"]:
+            print(f"❌ 주차 범위가 올바르지 않습니다: {from_week}~{to_week} (1~{state['total_weeks']})")
+            sys.exit(1)
+
+        summary = asyncio.run(backfill_weeks(
+            state, from_week, to_week, parallel_weeks, max_workers, reuse
+        ))
+        if any("failed" in outcomes.values() or "error" in outcomes for outcomes in summary.values()):
+            sys.exit(1)
     else:
         print(f"❌ 알 수 없는 명령어: '{command}'")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    # 왜: 상주 데몬이 실행 중이면 명령을 맡기고, 없으면 기존처럼 직접 실행한다.
+    from pipeline_daemon import run_via_daemon
+
+    exit_code = run_via_daemon("state_manager", sys.argv[1:])
+    if exit_code is None:
+        main()
+    else:
+        sys.exit(exit_code)
@@ -0,0 +1,174 @@
+"""
+step_metrics.py — 파이프라인 단계 실행 계측 모듈
+
+왜(Why) 이 모듈이 필요한가:
+  complete_step은 단계 이름만 남기므로, 어떤 단계가 한 주차의 실행 시간이나
+  메모리를 지배하는지 알 수 없다. 각 execution 스크립트가 이 모듈로 자신의 실행을
+  감싸면 시작/종료 시각, 소요 시간, 최대 RSS(자기 프로세스/자식 프로세스), 기록한 바이트 수, 외부 호출 횟수가
+  해당 주차 meta.json의 step_metrics에 남는다.
+  집계는 `python execution/state_manager.py profile`로 확인한다.
+
+사용법 (스크립트 내부):
+  with StepMetrics("trends_researched", args.week):
+      ...
+      count_external_call("deep_research")
+      record_bytes_written(trends_path)
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# 왜: resource는 POSIX 전용이다. Windows에서는 RSS 없이 나머지 지표만 기록한다.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+KST = timezone(timedelta(hours=9))
+
+# 왜: fetch_transcript 같은 하위 함수가 계측 객체를 인자로 받지 않아도
+# 호출 횟수와 기록 바이트를 보고할 수 있도록 현재 활성 계측을 모듈 전역에 둔다.
+_active = None
+# 왜: youtube_transcript 배치 모드처럼 스레드 풀에서 동시에 보고할 수 있으므로 합산을 보호한다.
+_counter_lock = threading.Lock()
+
+
+# 왜: 상주 데몬(pipeline_daemon)은 스크립트의 main()을 자기 프로세스 안에서 실행한다.
+# 그때 RUSAGE_SELF의 ru_maxrss는 단계가 아니라 데몬 수명 전체의 최대치이므로 구분해야 한다.
+_shared_process = False
+
+
+def mark_shared_process() -> None:
+    """이 프로세스가 여러 단계를 차례로 실행하는 상주 프로세스임을 표시한다 (pipeline_daemon이 호출)."""
+    global _shared_process
+    _shared_process = True
+
+
+def _rusage_snapshot() -> dict:
+    """현재 프로세스와 종료된 자식 프로세스의 최대 RSS(원 단위)와 자식 CPU 시간을 읽는다."""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "self_maxrss": own.ru_maxrss,
+        "children_maxrss": children.ru_maxrss,
+        "children_cpu": children.ru_utime + children.ru_stime,
+    }
+
+
+def _to_mb(maxrss: int) -> float:
+    # 왜: ru_maxrss 단위는 macOS에서 바이트, Linux에서 KB이다.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(maxrss / divisor, 1)
+
+
+def _rss_metrics(before: dict) -> dict:
+    """
+    단계 실행 전후의 rusage를 비교해 메모리/자식 CPU 지표를 만든다.
+    왜: ru_maxrss는 누적 최대치라 단계 전후 차이로만 이 단계의 몫을 가려낼 수 있다.
+      - peak_rss_mb: 단계가 프로세스를 혼자 쓸 때(스크립트 직접 실행)만 기록한다.
+        데몬 안에서는 데몬 수명 최대치이므로 process_peak_rss_mb로 따로 표시한다.
+      - children_peak_rss_mb: 이 단계 동안 종료된 자식(서브프로세스)이 이전 최대치를
+        넘었을 때만 기록한다. 넘지 못했다면 이 단계 자식의 최대치는 알 수 없다.
+      - children_cpu_seconds: 이 단계 동안 종료된 자식의 CPU 시간 합(전후 차이).
+    """
+    after = _rusage_snapshot()
+    if before is None or after is None:
+        return {"peak_rss_mb": None}
+
+    metrics = {}
+    if _shared_process:
+        metrics["peak_rss_mb"] = None
+        metrics["process_peak_rss_mb"] = _to_mb(after["self_maxrss"])
+    else:
+        metrics["peak_rss_mb"] = _to_mb(after["self_maxrss"])
+
+    if after["children_maxrss"] > before["children_maxrss"]:
+        metrics["children_peak_rss_mb"] = _to_mb(after["children_maxrss"])
+    children_cpu = after["children_cpu"] - before["children_cpu"]
+    if children_cpu > 0:
+        metrics["children_cpu_seconds"] = round(children_cpu, 3)
+    return metrics
+
+
+def count_external_call(service: str, count: int = 1) -> None:
+    """활성 계측이 있으면 외부 서비스 호출 횟수를 더한다."""
+    if _active is not None:
+        with _counter_lock:
+            _active.external_calls[service] = _active.external_calls.get(service, 0) + count
+
+
+def record_bytes_written(path: Path) -> None:
+    """활성 계측이 있으면 방금 쓴 파일의 크기를 더한다."""
+    if _active is not None and Path(path).exists():
+        with _counter_lock:
+            _active.bytes_written += Path(path).stat().st_size
+
+
+class StepMetrics:
+    """
+    단계 실행 하나를 감싸 지표를 수집하고, 종료 시 주차 meta.json에 기록한다.
+    왜: sys.exit()로 끝나는 실패 경로까지 기록해야 느린 실패도 회귀로 잡을 수 있으므로
+    컨텍스트 매니저로 구현하여 예외/종료 여부와 무관하게 기록되게 한다.
+    """
+
+    def __init__(self, step_name: str, week_number: int):
+        self.step_name = step_name
+        self.week_number = week_number
+        self.external_calls = {}
+        self.bytes_written = 0
+        self.started_at = None
+        self._start = None
+        self._rusage_before = None
+
+    def __enter__(self):
+        global _active
+        _active = self
+        self.started_at = datetime.now(KST).isoformat()
+        self._start = time.perf_counter()
+        self._rusage_before = _rusage_snapshot()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        _active = None
+
+        if exc_type is None:
+            status = "success"
+        elif exc_type is SystemExit and exc.code in (0, None):
+            status = "success"
+        else:
+            status = "failed"
+
+        metrics = {
+            "started_at": self.started_at,
+            "ended_at": datetime.now(KST).isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._start, 3),
+            **_rss_metrics(self._rusage_before),
+            "bytes_written": self.bytes_written,
+            "external_calls": self.external_calls,
+            "status": status,
+        }
+
+        # 왜: 계측 기록 실패가 본 작업의 결과(종료 코드)를 바꾸면 안 된다.
+        try:
+            self._record(metrics)
+        except Exception as e:
+            print(f"⚠️  단계 계측 기록 실패: {e}")
+        return False
+
+    def _record(self, metrics: dict) -> None:
+        # 왜: meta.json 갱신은 잠금/원자적 쓰기/저장소 선택을 담당하는 state_manager를 거친다.
+        # run-week가 넘겨준 WYSH_WORKSPACE로 같은 워크스페이스의 meta.json에 기록한다.
+        import state_manager
+
+        state_manager.activate_workspace(
+            os.environ.get("WYSH_WORKSPACE") or state_manager.DEFAULT_WORKSPACE
+        )
+        if not state_manager.record_step_metrics(self.week_number, self.step_name, metrics):
+            print(f"ℹ️  Week {self.week_number} meta.json이 없어 단계 계측을 기록하지 않았습니다.")
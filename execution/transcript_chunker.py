@@ -0,0 +1,246 @@
+"""
+transcript_chunker.py — 토큰 예산 기반 트랜스크립트 청크 분할
+
+왜(Why) 이 스크립트가 필요한가:
+  transcript.md는 영상 전체가 "## 전체 텍스트" 한 덩어리라서 NotebookLM/LLM에 보내거나
+  질문할 때 너무 크다. 이 스크립트는 세그먼트 경계에서 자른, 토큰 예산 이하의 겹치는 청크를
+  시작/끝 타임스탬프와 함께 만든다. 질의 단계는 전체 트랜스크립트 대신 관련 청크만 보내면 된다.
+
+  청크 결과는 영상별 트랜스크립트 해시(+ 분할 설정)로 data/cache/chunks/에 캐시되므로,
+  트랜스크립트가 바뀌지 않은 영상은 다시 계산하지 않는다.
+
+출력:
+  data/weeks/week-XX/transcript_chunks.jsonl
+  {"id": "VIDEO_ID#3", "video_id", "start", "end", "tokens", "segments": [첫 번호, 끝 번호], "text"}
+
+사용법:
+  python execution/transcript_chunker.py chunk --week 1 [--max-tokens 800] [--overlap-tokens 100]
+  python execution/transcript_chunker.py select --week 1 "smallest viable market" [--budget 2000]
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import sys
+from atomic_io import atomic_writer
+from workspace_paths import PROJECT_ROOT, WEEKS_DIR
+
+# 왜: 청크는 영상 내용과 설정만으로 결정되므로 워크스페이스 간에 공유한다 (트랜스크립트 캐시와 같은 위치).
+CHUNK_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "chunks"
+
+# --- 청크 설정 ---
+# 왜: NotebookLM/LLM 한 번의 질의에 여러 청크를 함께 넣을 수 있는 크기로 잡는다.
+DEFAULT_MAX_TOKENS = 800
+# 왜: 문장이 청크 경계에서 잘려 맥락을 잃지 않도록 앞 청크의 끝부분을 다음 청크 앞에 겹친다.
+DEFAULT_OVERLAP_TOKENS = 100
+DEFAULT_SELECT_BUDGET = 2000
+
+# 왜: 청크 형식이나 토큰 추정 방식을 바꾸면 올려서 기존 캐시를 무효화한다.
+CHUNKER_VERSION = 1
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 추정한다.
+    왜: 특정 모델의 토크나이저에 의존하지 않기 위해, 영어는 약 4글자당 1토큰,
+    한글 등 비 ASCII 문자는 글자당 1토큰으로 보수적으로 계산한다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return max(1, math.ceil(ascii_chars / 4) + (len(text) - ascii_chars))
+
+
+def chunk_segments(video_id: str, segments: list, max_tokens: int = DEFAULT_MAX_TOKENS,
+                   overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> list:
+    """
+    한 영상의 세그먼트를 토큰 예산 이하의 겹치는 청크 목록으로 나눈다.
+    세그먼트 하나가 예산보다 크면 자르지 않고 그 세그먼트만으로 청크를 만든다.
+    """
+    costs = [estimate_tokens(segment["text"]) + 1 for segment in segments]
+    chunks = []
+    first = 0
+    while first < len(segments):
+        last = first
+        total = costs[first]
+        while last + 1 < len(segments) and total + costs[last + 1] <= max_tokens:
+            last += 1
+            total += costs[last]
+
+        chunks.append({
+            "id": f"{video_id}#{len(chunks)}",
+            "video_id": video_id,
+            "start": segments[first]["start"],
+            "end": segments[last]["start"] + segments[last].get("duration", 0),
+            "tokens": total,
+            "segments": [first, last],
+            "text": " ".join(segment["text"] for segment in segments[first:last + 1]),
+        })
+        if last + 1 >= len(segments):
+            break
+
+        # 왜: 다음 청크는 겹침 예산만큼 앞 청크의 마지막 세그먼트들에서 시작한다.
+        # 진행이 멈추지 않도록 시작점은 항상 한 칸 이상 앞으로 간다.
+        next_first = last + 1
+        overlap = 0
+        while next_first - 1 > first and overlap + costs[next_first - 1] <= overlap_tokens:
+            next_first -= 1
+            overlap += costs[next_first]
+        first = next_first
+    return chunks
+
+
+def _video_hash(video_id: str, segments: list, max_tokens: int, overlap_tokens: int) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CHUNKER_VERSION, video_id, max_tokens, overlap_tokens]).encode("utf-8"))
+    for segment in segments:
+        digest.update(json.dumps(
+            [segment["text"], segment["start"], segment.get("duration", 0)], ensure_ascii=False
+        ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def chunk_video(video_id: str, segments: list, max_tokens: int = DEFAULT_MAX_TOKENS,
+                overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> tuple:
+    """
+    캐시를 확인하고 영상 하나의 청크를 반환한다.
+    반환값: (청크 목록, 캐시 적중 여부)
+    """
+    cache_path = CHUNK_CACHE_DIR / f"{_video_hash(video_id, segments, max_tokens, overlap_tokens)}.jsonl"
+    if cache_path.exists():
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()], True
+
+    chunks = chunk_segments(video_id, segments, max_tokens, overlap_tokens)
+    # 왜: 캐시 파일은 내용 해시로만 찾으므로, 정전으로 잘린 파일이 남으면 다음 실행이 그대로 읽는다.
+    with atomic_writer(cache_path) as f:
+        for chunk in chunks:
+            f.write(json.dumps(chunk, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return chunks, False
+
+
+def chunk_week(week_number: int, max_tokens: int = DEFAULT_MAX_TOKENS,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> dict:
+    """
+    주차 트랜스크립트의 모든 영상을 청크로 나눠 transcript_chunks.jsonl에 쓴다.
+    왜: 세그먼트는 영상별로 연속해 저장되므로 영상 하나씩만 메모리에 올려 처리한다.
+    반환값: {"videos", "chunks", "cached"}
+    """
+    from youtube_transcript import iter_segments
+
+    week_dir = WEEKS_DIR / f"week-{week_number:02d}"
+    chunks_path = week_dir / "transcript_chunks.jsonl"
+    summary = {"videos": 0, "chunks": 0, "cached": 0}
+
+    with atomic_writer(chunks_path) as f:
+        for video_id, group in itertools.groupby(
+            iter_segments(week_number), key=lambda segment: segment.get("video_id", "unknown")
+        ):
+            chunks, cached = chunk_video(video_id, list(group), max_tokens, overlap_tokens)
+            for chunk in chunks:
+                f.write(json.dumps(chunk, ensure_ascii=False, separators=(",", ":")) + "\n")
+            summary["videos"] += 1
+            summary["chunks"] += len(chunks)
+            summary["cached"] += int(cached)
+
+    # 왜: 트랜스크립트가 비었는데 이전 실행의 청크가 남아 있으면 select/질의 단계가 지난 내용을 쓴다.
+    if summary["videos"] == 0:
+        chunks_path.unlink(missing_ok=True)
+    return summary
+
+
+def iter_chunks(week_number: int):
+    """주차의 청크를 하나씩 읽는 제너레이터."""
+    chunks_path = WEEKS_DIR / f"week-{week_number:02d}" / "transcript_chunks.jsonl"
+    if not chunks_path.exists():
+        return
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def select_chunks(week_number: int, question: str, budget: int = DEFAULT_SELECT_BUDGET) -> list:
+    """
+    질문과 관련된 청크를 토큰 예산 안에서 골라 시간순으로 반환한다.
+    왜: 질의 단계가 전체 트랜스크립트 대신 관련 구간만 보내게 한다.
+    관련도는 검색 색인과 같은 토큰화(영어 단어 + 한글 bigram)로 질문 토큰과 겹치는 정도를 센다.
+    """
+    from transcript_search import tokenize
+
+    question_terms = set(tokenize(question))
+    scored = []
+    for chunk in iter_chunks(week_number):
+        chunk_terms = tokenize(chunk["text"])
+        if not chunk_terms:
+            continue
+        overlap = sum(1 for term in chunk_terms if term in question_terms)
+        distinct = len(question_terms & set(chunk_terms))
+        if distinct:
+            # 왜: 질문의 여러 단어를 함께 담은 청크를 우선하고, 같으면 밀도가 높은 청크를 고른다.
+            scored.append((distinct, overlap / len(chunk_terms), chunk))
+
+    selected = []
+    used = 0
+    for _, _, chunk in sorted(scored, key=lambda item: (-item[0], -item[1])):
+        if used + chunk["tokens"] > budget:
+            continue
+        selected.append(chunk)
+        used += chunk["tokens"]
+    return sorted(selected, key=lambda chunk: (chunk["video_id"], chunk["start"]))
+
+
+def _format_time(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="토큰 예산 기반 트랜스크립트 청크 분할"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    chunk_parser = subparsers.add_parser("chunk", help="주차 트랜스크립트를 청크로 분할")
+    chunk_parser.add_argument("--week", type=int, required=True, help="주차 번호 (1-23)")
+    chunk_parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS,
+                              help=f"청크당 최대 토큰 수 (기본: {DEFAULT_MAX_TOKENS})")
+    chunk_parser.add_argument("--overlap-tokens", type=int, default=DEFAULT_OVERLAP_TOKENS,
+                              help=f"앞 청크와 겹칠 토큰 수 (기본: {DEFAULT_OVERLAP_TOKENS})")
+
+    select_parser = subparsers.add_parser("select", help="질문과 관련된 청크만 선택")
+    select_parser.add_argument("--week", type=int, required=True, help="주차 번호 (1-23)")
+    select_parser.add_argument("question", help="질문")
+    select_parser.add_argument("--budget", type=int, default=DEFAULT_SELECT_BUDGET,
+                               help=f"선택할 청크의 총 토큰 예산 (기본: {DEFAULT_SELECT_BUDGET})")
+    select_parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    args = parser.parse_args()
+
+    if args.command == "chunk":
+        if args.overlap_tokens >= args.max_tokens:
+            print("❌ --overlap-tokens는 --max-tokens보다 작아야 합니다.")
+            sys.exit(1)
+        summary = chunk_week(args.week, args.max_tokens, args.overlap_tokens)
+        if summary["videos"] == 0:
+            print(f"❌ Week {args.week}에 트랜스크립트 세그먼트가 없습니다.")
+            sys.exit(1)
+        print(f"✂️  Week {args.week} 청크 {summary['chunks']}개 생성 "
+              f"(영상 {summary['videos']}개, 캐시 사용 {summary['cached']}개)")
+        return
+
+    chunks = select_chunks(args.week, args.question, args.budget)
+    if args.json:
+        print(json.dumps(chunks, ensure_ascii=False, indent=2))
+        return
+    if not chunks:
+        print(f"ℹ️  Week {args.week}에서 질문과 관련된 청크를 찾지 못했습니다.")
+        return
+    print(f"📎 관련 청크 {len(chunks)}개 (토큰 {sum(chunk['tokens'] for chunk in chunks)}/{args.budget})")
+    for chunk in chunks:
+        print(f"\n[{chunk['id']}] {_format_time(chunk['start'])}~{_format_time(chunk['end'])} ({chunk['tokens']} 토큰)")
+        print(chunk["text"])
+
+
+if __name__ == "__main__":
+    main()
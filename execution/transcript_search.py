@@ -0,0 +1,481 @@
+"""
+transcript_search.py — 트랜스크립트 전문 검색 (역색인)
+
+왜(Why) 이 스크립트가 필요한가:
+  "Godin이 smallest viable market을 어디서 말했지?"를 찾으려면 지금은 data/weeks/*/의
+  트랜스크립트를 하나씩 열어봐야 한다. 이 스크립트는 youtube_transcript.py가 저장한 세그먼트로
+  역색인을 만들고, 검색어에 대해 영상/타임스탬프 단위 순위 결과를 밀리초 단위로 돌려준다.
+
+  색인은 증분 갱신된다. 문서 단위는 "주차/영상"이고, 영상 하나를 다시 색인하면
+  그 영상의 문서 파일과 게시 목록이 바뀐 샤드 파일만 다시 쓴다. 텍스트가 바뀌지 않은 영상은 건너뛴다.
+
+토큰화:
+  - 영어/숫자: 소문자화한 단어 (짧은 불용어 제외)
+  - 한국어: 형태소 분석기 없이 동작하도록 한글 연속 구간을 2글자 단위(bigram)로 나눈다.
+    "마케팅은" → 마케, 케팅, 팅은 이므로 검색어 "마케팅"(마케, 케팅)과 조사가 붙은 형태가 일치한다.
+
+순위: 세그먼트 단위 BM25
+
+사용법:
+  python execution/transcript_search.py search "smallest viable market" [--limit 10] [--week 3]
+  python execution/transcript_search.py index [--week 3]      # 주차(생략 시 전체) 증분 색인
+  python execution/transcript_search.py index --rebuild       # 색인 전체 재생성
+  python execution/transcript_search.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from atomic_io import atomic_write_json
+from workspace_paths import DATA_DIR, WEEKS_DIR
+
+# 왜: fcntl은 POSIX 전용이다. Windows에서는 잠금 없이 원자적 쓰기만으로 동작한다.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+INDEX_DIR = DATA_DIR / "search-index"
+
+# 왜: 단어를 해시로 고정 개수의 샤드에 나눠 담아, 영상 하나를 갱신할 때
+# 색인 전체가 아니라 그 영상의 단어가 속한 샤드만 다시 쓰게 한다.
+SHARD_COUNT = 64
+
+# 왜: 색인 파일 구성이 바뀌면 예전 색인을 읽지 않고 다시 만든다.
+INDEX_VERSION = 2
+
+# BM25 파라미터 (일반적인 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+DEFAULT_LIMIT = 10
+
+ENGLISH_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "do", "for", "from", "he", "i",
+    "if", "in", "is", "it", "its", "of", "on", "or", "so", "that", "the", "they", "this",
+    "to", "was", "we", "what", "with", "you",
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def tokenize(text: str) -> list:
+    """영어 단어와 한글 bigram 토큰 목록을 반환한다."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        word = match.group()
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif word not in ENGLISH_STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+def shard_of(term: str) -> int:
+    # 왜: 내장 hash()는 프로세스마다 달라지므로 고정 해시를 쓴다.
+    return int(hashlib.md5(term.encode("utf-8")).hexdigest()[:8], 16) % SHARD_COUNT
+
+
+@contextmanager
+def index_lock():
+    """
+    색인 갱신 구간을 프로세스 간 advisory lock으로 보호한다.
+    왜: run-all/backfill에서 여러 주차의 트랜스크립트 단계가 동시에 색인을 갱신할 수 있다.
+    """
+    if fcntl is None:
+        yield
+        return
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    with open(INDEX_DIR / "index.lock", "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class SearchIndex:
+    """
+    샤드로 나눈 역색인.
+
+    디렉토리 구성 (data/search-index/):
+      docs.json             {"version": 2, "docs": {"주차/영상": {"week", "video_id", "hash", "segments", "tokens"}}}
+      docs/<주차>-<영상>.json {"lengths": [세그먼트별 토큰 수], "terms": [...]}
+      postings-XX.json      {단어: {"주차/영상": [[세그먼트 번호, 빈도], ...]}}
+
+    왜: 문서 목록(docs.json)은 검색과 갱신마다 통째로 읽고 쓰므로 작은 메타데이터만 둔다.
+    세그먼트 길이와 단어 목록은 문서별 파일에 두어, 영상 하나를 갱신할 때 그 파일만 다시 쓴다.
+    샤드 파일은 (mtime, 크기)가 같으면 다시 읽지 않으므로 상주 데몬에서 반복 검색이 빠르다.
+    스크립트와 데몬은 get_index()로 같은 인스턴스를 재사용한다.
+    """
+
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self._cache = {}
+
+    def _load(self, name: str, default):
+        path = self.index_dir / name
+        if not path.exists():
+            return default
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != key:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = (key, json.load(f))
+            self._cache[name] = cached
+        return cached[1]
+
+    def invalidate(self) -> None:
+        """읽어 둔 docs/샤드를 모두 버린다."""
+        self._cache.clear()
+
+    def load_docs(self) -> dict:
+        data = self._load("docs.json", {})
+        # 왜: 예전 형식(문서마다 단어 목록을 담은 docs.json)은 문서별 파일이 없으므로 빈 색인으로 본다.
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return data["docs"]
+
+    def load_shard(self, shard: int) -> dict:
+        return self._load(f"postings-{shard:02d}.json", {})
+
+    @staticmethod
+    def _detail_name(doc_key: str) -> str:
+        return f"docs/{doc_key.replace('/', '-', 1)}.json"
+
+    def load_detail(self, doc_key: str) -> dict:
+        """문서의 세그먼트 길이와 단어 목록."""
+        return self._load(self._detail_name(doc_key), {"lengths": [], "terms": []})
+
+    def _load_docs_for_update(self) -> dict:
+        """
+        갱신할 문서 목록을 읽는다. 예전 형식 색인이면 지우고 빈 목록에서 다시 시작한다.
+        왜: 예전 형식의 샤드에 남은 게시 목록은 새 문서별 파일과 맞지 않는다.
+        """
+        if (self.index_dir / "docs.json").exists() and not self.load_docs():
+            for path in self.index_dir.glob("postings-*.json"):
+                path.unlink()
+            (self.index_dir / "docs.json").unlink()
+            self.invalidate()
+        return dict(self.load_docs())
+
+    def _save_docs(self, docs: dict) -> None:
+        atomic_write_json(self.index_dir / "docs.json", {"version": INDEX_VERSION, "docs": docs}, indent=None)
+
+    def update_document(self, doc_key: str, week: int, video_id: str, texts: list) -> bool:
+        """
+        문서 하나(주차의 영상 하나)의 세그먼트 텍스트로 색인을 갱신한다.
+        반환값: 실제로 색인을 바꿨으면 True (텍스트가 그대로면 False)
+        """
+        content_hash = hashlib.sha256("\n".join(texts).encode("utf-8")).hexdigest()
+        with index_lock():
+            docs = self._load_docs_for_update()
+            previous = docs.get(doc_key)
+            if previous and previous["hash"] == content_hash:
+                return False
+
+            postings = {}
+            lengths = []
+            for segment_index, text in enumerate(texts):
+                tokens = tokenize(text)
+                lengths.append(len(tokens))
+                counts = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, count in counts.items():
+                    postings.setdefault(token, []).append([segment_index, count])
+
+            old_terms = set(self.load_detail(doc_key)["terms"]) if previous else set()
+            self._write_postings(doc_key, old_terms, postings)
+
+            atomic_write_json(self.index_dir / self._detail_name(doc_key),
+                              {"lengths": lengths, "terms": sorted(postings)}, indent=None)
+            docs[doc_key] = {
+                "week": week,
+                "video_id": video_id,
+                "hash": content_hash,
+                "segments": len(lengths),
+                "tokens": sum(lengths),
+            }
+            self._save_docs(docs)
+        return True
+
+    def remove_document(self, doc_key: str) -> None:
+        with index_lock():
+            docs = self._load_docs_for_update()
+            if docs.pop(doc_key, None) is None:
+                return
+            self._write_postings(doc_key, set(self.load_detail(doc_key)["terms"]), {})
+            self._save_docs(docs)
+            detail_path = self.index_dir / self._detail_name(doc_key)
+            if detail_path.exists():
+                detail_path.unlink()
+
+    def _write_postings(self, doc_key: str, old_terms: set, new_postings: dict) -> None:
+        """
+        문서의 예전 단어와 새 단어가 속한 샤드 중 게시 목록이 실제로 바뀐 샤드만 다시 쓴다.
+        왜: 자막 몇 줄만 고쳐 다시 색인해도 대부분의 단어는 같은 세그먼트에 같은 빈도로 남는다.
+        """
+        touched = {}
+        for term in old_terms | set(new_postings):
+            touched.setdefault(shard_of(term), []).append(term)
+
+        for shard, terms in touched.items():
+            data = self.load_shard(shard)
+            changed = {}
+            for term in terms:
+                entry = dict(data.get(term, {}))
+                if entry.get(doc_key) == new_postings.get(term):
+                    continue
+                entry.pop(doc_key, None)
+                if term in new_postings:
+                    entry[doc_key] = new_postings[term]
+                changed[term] = entry
+            if not changed:
+                continue
+            data = dict(data)
+            for term, entry in changed.items():
+                if entry:
+                    data[term] = entry
+                else:
+                    data.pop(term, None)
+            atomic_write_json(self.index_dir / f"postings-{shard:02d}.json", data, indent=None)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, week: int = None) -> list:
+        """
+        BM25로 세그먼트 순위를 매겨 상위 결과를 반환한다.
+        반환값: [{"score", "week", "video_id", "segment", "matched"}, ...]
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        docs = self.load_docs()
+        total_segments = sum(doc["segments"] for doc in docs.values())
+        if total_segments == 0:
+            return []
+        average_length = sum(doc["tokens"] for doc in docs.values()) / total_segments
+
+        scores = {}
+        matched = {}
+        for term in terms:
+            term_postings = self.load_shard(shard_of(term)).get(term, {})
+            document_frequency = sum(len(postings) for postings in term_postings.values())
+            if not document_frequency:
+                continue
+            idf = math.log(1 + (total_segments - document_frequency + 0.5) / (document_frequency + 0.5))
+            for doc_key, postings in term_postings.items():
+                doc = docs.get(doc_key)
+                if doc is None or (week is not None and doc["week"] != week):
+                    continue
+                lengths = self.load_detail(doc_key)["lengths"]
+                for segment_index, frequency in postings:
+                    length = lengths[segment_index]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    key = (doc_key, segment_index)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    matched.setdefault(key, set()).add(term)
+
+        ranked = sorted(scores.items(), key=lambda item: (-len(matched[item[0]]), -item[1]))[:limit]
+        return [
+            {
+                "score": round(score, 3),
+                "week": docs[doc_key]["week"],
+                "video_id": docs[doc_key]["video_id"],
+                "segment": segment_index,
+                "matched": sorted(matched[(doc_key, segment_index)]),
+            }
+            for (doc_key, segment_index), score in ranked
+        ]
+
+
+# 왜: main()마다 SearchIndex를 새로 만들면 상주 데몬에서도 샤드 캐시가 요청마다 버려진다.
+# 모듈 전역 인스턴스 하나를 재사용하고, 문서 목록(docs.json)이 바뀌면 캐시 전체를 비운다.
+_shared_index = None
+_shared_manifest_stamp = None
+
+
+def _manifest_stamp() -> tuple:
+    try:
+        stat = (INDEX_DIR / "docs.json").stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_index() -> SearchIndex:
+    """
+    프로세스에서 공유하는 SearchIndex를 반환한다.
+    왜: 샤드별 (mtime, 크기) 확인만으로는 색인 재생성이나 다른 프로세스의 갱신 뒤에
+    더는 쓰이지 않는 샤드가 메모리에 남는다. 문서 목록이 바뀐 시점에 한 번 비운다.
+    """
+    global _shared_index, _shared_manifest_stamp
+    if _shared_index is None:
+        _shared_index = SearchIndex(INDEX_DIR)
+    stamp = _manifest_stamp()
+    if stamp != _shared_manifest_stamp:
+        _shared_index.invalidate()
+        _shared_manifest_stamp = stamp
+    return _shared_index
+
+
+def _week_number(week_dir: Path) -> int:
+    return int(week_dir.name.split("-")[1])
+
+
+def read_week_videos(week_number: int) -> dict:
+    """
+    주차 트랜스크립트를 영상별 세그먼트 목록 {video_id: [segment, ...]}으로 읽는다.
+    왜: 문서 단위가 주차/영상이므로 번들을 영상별로 나눈다. 예전 형식(video_id 없는 배열)은
+    transcript.md의 Video ID를 쓸 수 없으므로 "unknown"으로 묶는다.
+    """
+    from youtube_transcript import iter_segments
+
+    videos = {}
+    for segment in iter_segments(week_number):
+        videos.setdefault(segment.get("video_id", "unknown"), []).append(segment)
+    return videos
+
+
+def index_week(week_number: int, index: SearchIndex = None) -> dict:
+    """
+    주차 하나를 증분 색인한다. 바뀐 영상만 다시 색인하고, 주차에서 빠진 영상은 색인에서 지운다.
+    반환값: {"updated": n, "unchanged": n, "removed": n}
+    """
+    index = index or get_index()
+    summary = {"updated": 0, "unchanged": 0, "removed": 0}
+    videos = read_week_videos(week_number)
+
+    for video_id, segments in videos.items():
+        doc_key = f"{week_number}/{video_id}"
+        if index.update_document(doc_key, week_number, video_id, [segment["text"] for segment in segments]):
+            summary["updated"] += 1
+        else:
+            summary["unchanged"] += 1
+
+    for doc_key, doc in list(index.load_docs().items()):
+        if doc["week"] == week_number and doc["video_id"] not in videos:
+            index.remove_document(doc_key)
+            summary["removed"] += 1
+    return summary
+
+
+def index_all(rebuild: bool = False) -> dict:
+    """모든 주차를 색인한다. rebuild이면 기존 색인을 지우고 다시 만든다."""
+    if rebuild and INDEX_DIR.exists():
+        shutil.rmtree(INDEX_DIR)
+
+    index = get_index()
+    total = {"updated": 0, "unchanged": 0, "removed": 0}
+    for week_dir in sorted(WEEKS_DIR.glob("week-*")):
+        if not week_dir.is_dir():
+            continue
+        summary = index_week(_week_number(week_dir), index)
+        for key in total:
+            total[key] += summary[key]
+    return total
+
+
+def resolve_hit(hit: dict) -> dict:
+    """검색 결과에 세그먼트 시각과 텍스트를 붙인다 (transcript_segments.bin이 있으면 mmap 조회)."""
+    from segment_store import SegmentStore
+
+    store_path = WEEKS_DIR / f"week-{hit['week']:02d}" / "transcript_segments.bin"
+    if store_path.exists():
+        with SegmentStore(store_path) as store:
+            if hit["video_id"] in store.videos:
+                first, _ = store.videos[hit["video_id"]]
+                return {**hit, **store.segment(first + hit["segment"])}
+
+    segments = read_week_videos(hit["week"]).get(hit["video_id"], [])
+    if hit["segment"] < len(segments):
+        return {**hit, **segments[hit["segment"]]}
+    return {**hit, "start": 0, "text": ""}
+
+
+def print_results(query: str, results: list, elapsed_ms: float) -> None:
+    if not results:
+        print(f"🔍 '{query}' 검색 결과가 없습니다. ({elapsed_ms:.1f}ms)")
+        return
+
+    print(f"🔍 '{query}' 검색 결과 {len(results)}개 ({elapsed_ms:.1f}ms)")
+    for rank, hit in enumerate(results, 1):
+        start = int(hit["start"])
+        text = hit["text"] if len(hit["text"]) <= 100 else hit["text"][:100] + "..."
+        print(f"\n{rank:>2}. Week {hit['week']} · {hit['video_id']} · {start // 60:02d}:{start % 60:02d} "
+              f"(점수 {hit['score']}, 일치: {', '.join(hit['matched'])})")
+        print(f"    {text}")
+        if hit["video_id"] != "unknown":
+            print(f"    https://youtube.com/watch?v={hit['video_id']}&t={start}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="트랜스크립트 전문 검색 (역색인)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="검색어로 영상/타임스탬프 검색")
+    search_parser.add_argument("query", help="검색어 (한국어/영어)")
+    search_parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"최대 결과 수 (기본: {DEFAULT_LIMIT})")
+    search_parser.add_argument("--week", type=int, default=None, help="특정 주차로 제한")
+    search_parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    index_parser = subparsers.add_parser("index", help="트랜스크립트 증분 색인")
+    index_parser.add_argument("--week", type=int, default=None, help="색인할 주차 (생략 시 전체)")
+    index_parser.add_argument("--rebuild", action="store_true", help="기존 색인을 지우고 전체 재생성")
+
+    subparsers.add_parser("stats", help="색인 통계 출력")
+
+    args = parser.parse_args()
+
+    if args.command == "index":
+        start = time.perf_counter()
+        if args.week is not None:
+            summary = index_week(args.week)
+        else:
+            summary = index_all(args.rebuild)
+        elapsed = time.perf_counter() - start
+        print(f"✅ 색인 완료 ({elapsed:.2f}초): 갱신 {summary['updated']}개, "
+              f"변경 없음 {summary['unchanged']}개, 삭제 {summary['removed']}개")
+        return
+
+    index = get_index()
+    if args.command == "stats":
+        docs = index.load_docs()
+        segments = sum(doc["segments"] for doc in docs.values())
+        terms = sum(len(index.load_shard(shard)) for shard in range(SHARD_COUNT))
+        print(f"📚 검색 색인: 문서(주차/영상) {len(docs)}개, 세그먼트 {segments:,}개, 단어 {terms:,}개")
+        print(f"   위치: {INDEX_DIR}")
+        return
+
+    start = time.perf_counter()
+    results = [resolve_hit(hit) for hit in index.search(args.query, args.limit, args.week)]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_results(args.query, results, elapsed_ms)
+
+
+if __name__ == "__main__":
+    # 왜: 상주 데몬이 실행 중이면 샤드 캐시가 살아 있는 데몬에 검색을 맡긴다.
+    from pipeline_daemon import run_via_daemon
+
+    exit_code = run_via_daemon("transcript_search", sys.argv[1:])
+    if exit_code is None:
+        main()
+    else:
+        sys.exit(exit_code)
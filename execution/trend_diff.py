@@ -0,0 +1,319 @@
+"""
+trend_diff.py — 주차 간 트렌드 변화(신규/지속/소멸) 요약
+
+왜(Why) 이 스크립트가 필요한가:
+  주차별 trends.json은 서로 독립된 리포트라서, 이번 주에 정말 새로운 것이 무엇인지 알려면
+  이전 주차 리포트를 전부 다시 읽어야 한다. 이 스크립트는 토픽별 결과에서 키워드와 근거 문장을
+  뽑아 이전 주차들의 색인과 비교하고, 작은 "신규 / 지속 / 소멸" 요약을 만든다.
+  아이디어 생성 단계는 N개의 전체 리포트 대신 이 요약만 읽으면 된다.
+
+  색인(data/trend-index.json)은 주차별 trends.json 해시로 증분 갱신되므로,
+  바뀐 주차만 다시 추출한다.
+
+출력:
+  data/weeks/week-XX/trends-diff.json, trends-diff.md
+
+사용법:
+  python execution/trend_diff.py --week 5
+  python execution/trend_diff.py --rebuild        # 색인을 새로 만들고 모든 주차 요약을 다시 씀
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from atomic_io import atomic_write_json, atomic_writer
+from transcript_search import ENGLISH_STOPWORDS, TOKEN_PATTERN
+from trend_researcher import normalize_query
+from workspace_paths import DATA_DIR, WEEKS_DIR
+
+INDEX_PATH = DATA_DIR / "trend-index.json"
+
+KST = timezone(timedelta(hours=9))
+
+# --- 추출 설정 ---
+# 왜: 토픽 하나의 리포트에서 변화 추적에 쓸 만한 키워드 수. 너무 많으면 요약이 리포트만큼 길어진다.
+KEYWORDS_PER_TOPIC = 25
+# 왜: 요약에서 각 목록을 이 개수로 자른다. 전체 개수는 counts에 남긴다.
+SUMMARY_LIMIT = 10
+EVIDENCE_CHARS = 160
+# 왜: 추출 규칙을 바꾸면 올려서 기존 색인을 다시 추출하게 한다.
+EXTRACTOR_VERSION = 1
+
+# 왜: 한글은 조사가 붙은 어절 단위로 나오므로 흔한 조사를 떼어야 같은 키워드로 모인다.
+# 긴 조사부터 확인해야 "에서"가 "서"보다 먼저 떨어진다.
+KOREAN_PARTICLES = sorted([
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "으로", "로", "와", "과",
+    "도", "만", "까지", "부터", "보다", "처럼", "이다", "입니다", "이며", "하고", "라는", "이라는",
+], key=len, reverse=True)
+KOREAN_STOPWORDS = {
+    "있다", "있는", "있으며", "있습니다", "하는", "한다", "합니다", "했다", "대한", "위한", "통해", "따라",
+    "가장", "또한", "그리고", "하지만", "이러한", "이런", "그런", "것", "수", "등", "및", "더", "매우",
+    "최근", "특히", "경우", "중심", "관련", "위해", "같은", "많은", "다양한", "주요", "때문",
+    "계속", "새로", "여전히", "다시", "이미", "아직", "점점", "크게", "함께", "이후", "현재",
+}
+# 왜: 트렌드 키워드는 대부분 명사이므로 서술어 어미로 끝나는 어절은 뺀다.
+# "광고"처럼 명사와 겹치는 짧은 어미("고", "게")는 넣지 않는다.
+KOREAN_PREDICATE_ENDINGS = ("다", "며", "지만", "면서", "하고", "했고", "으며")
+# 왜: transcript_search의 불용어는 검색용이라 짧다. 리포트 문장에 흔한 부사/전치사를 더 뺀다.
+EXTRA_ENGLISH_STOPWORDS = {
+    "about", "again", "also", "more", "most", "very", "into", "over", "than", "then", "their",
+    "there", "these", "those", "which", "while", "will", "would", "could", "should", "have", "has",
+    "been", "being", "such", "many", "much", "some", "other", "like", "just", "only", "even",
+}
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+MARKDOWN_PREFIX = re.compile(r"^[\s#>*\-•|]+|^\d+[.)]\s*")
+
+
+def result_text(value) -> str:
+    """리서치 결과(문자열 또는 --json 구조)에서 본문 문자열만 모은다."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "\n".join(result_text(item) for item in value.values())
+    if isinstance(value, list):
+        return "\n".join(result_text(item) for item in value)
+    return ""
+
+
+def split_sentences(text: str) -> list:
+    sentences = []
+    for raw in SENTENCE_SPLIT.split(text):
+        sentence = MARKDOWN_PREFIX.sub("", raw).strip()
+        if len(sentence) >= 8:
+            sentences.append(sentence)
+    return sentences
+
+
+def _strip_particle(word: str) -> str:
+    for particle in KOREAN_PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+
+def sentence_keywords(sentence: str) -> list:
+    """
+    문장 하나의 키워드 목록. 한글은 조사를 뗀 어절, 영어는 불용어를 뺀 단어와 인접 단어 쌍이다.
+    왜: transcript_search의 한글 bigram은 검색에는 좋지만 사람이 읽는 트렌드 키워드로는 쓸 수 없다.
+    """
+    keywords = []
+    previous_english = None
+    for match in TOKEN_PATTERN.finditer(sentence.lower()):
+        word = match.group()
+        if "가" <= word[0] <= "힣":
+            previous_english = None
+            word = _strip_particle(word)
+            if len(word) >= 2 and word not in KOREAN_STOPWORDS and not word.endswith(KOREAN_PREDICATE_ENDINGS):
+                keywords.append(word)
+        elif (word.isdigit() or len(word) < 3 or word in ENGLISH_STOPWORDS
+              or word in EXTRA_ENGLISH_STOPWORDS):
+            previous_english = None
+        else:
+            keywords.append(word)
+            # 왜: "greek yogurt", "seth godin"처럼 두 단어여야 뜻이 서는 트렌드가 많다.
+            if previous_english:
+                keywords.append(f"{previous_english} {word}")
+            previous_english = word
+    return keywords
+
+
+def extract_keywords(text: str, limit: int = KEYWORDS_PER_TOPIC) -> dict:
+    """
+    리포트 본문에서 여러 문장에 나오는 순서대로 상위 키워드를 고르고, 처음 나온 문장을 근거로 붙인다.
+    반환값: {키워드: 근거 문장}
+    """
+    counts = {}
+    evidence = {}
+    for sentence in split_sentences(text):
+        for keyword in set(sentence_keywords(sentence)):
+            counts[keyword] = counts.get(keyword, 0) + 1
+            evidence.setdefault(keyword, sentence[:EVIDENCE_CHARS])
+    # 왜: 빈도가 같으면 리포트 앞쪽(대개 요약부)에 먼저 나온 키워드를 우선한다. dict는 삽입 순서를 유지한다.
+    order = {keyword: position for position, keyword in enumerate(evidence)}
+    ranked = sorted(counts, key=lambda keyword: (-counts[keyword], order[keyword]))
+    return {keyword: evidence[keyword] for keyword in ranked[:limit]}
+
+
+def topic_key(query: str) -> str:
+    """
+    토픽 이름을 색인 키로 정규화한다.
+    왜: 리서치 캐시와 같은 토픽을 같은 키로 봐야 하므로 trend_researcher의 규칙을 그대로 쓴다.
+    """
+    return normalize_query(query)
+
+
+def load_index() -> dict:
+    if INDEX_PATH.exists():
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == EXTRACTOR_VERSION:
+                return index
+        except json.JSONDecodeError:
+            print(f"⚠️  트렌드 색인이 손상되어 새로 만듭니다: {INDEX_PATH}")
+    return {"version": EXTRACTOR_VERSION, "weeks": {}}
+
+
+def extract_week(trends_path: Path) -> dict:
+    """trends.json 하나에서 성공한 토픽별 키워드를 추출한다."""
+    with open(trends_path, "r", encoding="utf-8") as f:
+        trends = json.load(f)
+    topics = {}
+    for result in trends.get("results", []):
+        if result.get("status") != "success" or not result.get("result"):
+            continue
+        topics[topic_key(result["query"])] = {
+            "query": result["query"],
+            "keywords": extract_keywords(result_text(result["result"])),
+        }
+    return topics
+
+
+def update_index(index: dict, up_to_week: int = None) -> dict:
+    """
+    trends.json이 바뀐 주차만 다시 추출해 색인을 갱신한다. 반환값: {"updated", "unchanged", "removed"}
+    왜: 매주 모든 주차를 다시 읽으면 주차가 쌓일수록 느려진다. 파일 해시가 같으면 추출 결과도 같다.
+    """
+    summary = {"updated": 0, "unchanged": 0, "removed": 0}
+    present = set()
+    for trends_path in sorted(WEEKS_DIR.glob("week-*/trends.json")):
+        week_number = int(trends_path.parent.name.split("-")[1])
+        if up_to_week is not None and week_number > up_to_week:
+            continue
+        key = str(week_number)
+        present.add(key)
+        source_hash = hashlib.sha256(trends_path.read_bytes()).hexdigest()
+        entry = index["weeks"].get(key)
+        if entry is not None and entry["source_hash"] == source_hash:
+            summary["unchanged"] += 1
+            continue
+        index["weeks"][key] = {"source_hash": source_hash, "topics": extract_week(trends_path)}
+        summary["updated"] += 1
+    for key in list(index["weeks"]):
+        if key not in present and (up_to_week is None or int(key) <= up_to_week):
+            del index["weeks"][key]
+            summary["removed"] += 1
+    return summary
+
+
+def diff_topic(index: dict, week_number: int, key: str) -> dict:
+    """토픽 하나의 이번 주 키워드를 이전 주차들과 비교한다."""
+    current = index["weeks"][str(week_number)]["topics"][key]["keywords"]
+    history = {}
+    previous_week = None
+    for earlier in sorted((int(w) for w in index["weeks"]), reverse=True):
+        if earlier >= week_number:
+            continue
+        topic = index["weeks"][str(earlier)]["topics"].get(key)
+        if topic is None:
+            continue
+        if previous_week is None:
+            previous_week = earlier
+        for keyword in topic["keywords"]:
+            seen = history.setdefault(keyword, {"first_week": earlier, "last_week": earlier, "weeks_seen": 0})
+            seen["first_week"] = earlier
+            seen["weeks_seen"] += 1
+
+    new = [{"keyword": kw, "evidence": evidence} for kw, evidence in current.items() if kw not in history]
+    persisting = [
+        {"keyword": kw, "since_week": history[kw]["first_week"], "weeks_seen": history[kw]["weeks_seen"] + 1}
+        for kw in current if kw in history
+    ]
+    faded = []
+    if previous_week is not None:
+        previous = index["weeks"][str(previous_week)]["topics"][key]["keywords"]
+        faded = [{"keyword": kw, "last_week": previous_week} for kw in previous if kw not in current]
+    return {
+        "query": index["weeks"][str(week_number)]["topics"][key]["query"],
+        "compared_to_week": previous_week,
+        "baseline": previous_week is None,
+        "counts": {"new": len(new), "persisting": len(persisting), "faded": len(faded)},
+        "new": new[:SUMMARY_LIMIT],
+        "persisting": persisting[:SUMMARY_LIMIT],
+        "faded": faded[:SUMMARY_LIMIT],
+    }
+
+
+def render_diff_markdown(diff: dict) -> str:
+    lines = [f"# 트렌드 변화 — Week {diff['week']}", ""]
+    if not diff["topics"]:
+        lines.append("비교할 성공한 리서치 결과가 없습니다.")
+    for topic in diff["topics"]:
+        counts = topic["counts"]
+        if topic["baseline"]:
+            basis = "이전 기록 없음 (기준 주차)"
+        else:
+            basis = f"Week {topic['compared_to_week']} 대비"
+        lines += [f"## {topic['query']}", "",
+                  f"{basis} — 신규 {counts['new']} · 지속 {counts['persisting']} · 소멸 {counts['faded']}", ""]
+        lines += [f"- 🆕 **{item['keyword']}** — {item['evidence']}" for item in topic["new"]]
+        if topic["persisting"]:
+            lines.append("- 🔁 지속: " + ", ".join(
+                f"{item['keyword']} (Week {item['since_week']}부터 {item['weeks_seen']}주)" for item in topic["persisting"]
+            ))
+        if topic["faded"]:
+            lines.append("- 📉 소멸: " + ", ".join(item["keyword"] for item in topic["faded"]))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_week_diff(index: dict, week_number: int) -> dict:
+    """색인에서 주차 하나의 변화 요약을 만들어 trends-diff.json/md로 쓴다."""
+    week = index["weeks"].get(str(week_number), {"topics": {}})
+    diff = {
+        "week": week_number,
+        "generated_at": datetime.now(KST).isoformat(),
+        "topics": [diff_topic(index, week_number, key) for key in week["topics"]],
+    }
+    week_dir = WEEKS_DIR / f"week-{week_number:02d}"
+    atomic_write_json(week_dir / "trends-diff.json", diff)
+    with atomic_writer(week_dir / "trends-diff.md") as f:
+        f.write(render_diff_markdown(diff))
+    return diff
+
+
+def diff_week(week_number: int) -> dict:
+    """
+    색인을 해당 주차까지 증분 갱신하고 그 주차의 변화 요약을 쓴다.
+    반환값: {"updated", "unchanged", "removed", "new", "persisting", "faded"}
+    """
+    index = load_index()
+    summary = update_index(index, up_to_week=week_number)
+    atomic_write_json(INDEX_PATH, index, indent=None)
+    diff = write_week_diff(index, week_number)
+    for kind in ("new", "persisting", "faded"):
+        summary[kind] = sum(topic["counts"][kind] for topic in diff["topics"])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주차 간 트렌드 변화(신규/지속/소멸) 요약")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--week", type=int, help="요약할 주차 번호")
+    target.add_argument("--rebuild", action="store_true", help="색인을 새로 만들고 모든 주차 요약을 다시 씀")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        index = {"version": EXTRACTOR_VERSION, "weeks": {}}
+        summary = update_index(index)
+        atomic_write_json(INDEX_PATH, index, indent=None)
+        for week in sorted(int(w) for w in index["weeks"]):
+            write_week_diff(index, week)
+        print(f"✅ 트렌드 색인 재구축: 주차 {summary['updated']}개, 변화 요약 재작성")
+        return
+
+    if not (WEEKS_DIR / f"week-{args.week:02d}" / "trends.json").exists():
+        print(f"❌ Week {args.week} trends.json이 없습니다. trend_researcher.py를 먼저 실행하세요.")
+        sys.exit(1)
+    summary = diff_week(args.week)
+    print(f"📈 Week {args.week} 트렌드 변화: 신규 {summary['new']} · 지속 {summary['persisting']} · "
+          f"소멸 {summary['faded']} (색인 갱신 {summary['updated']}주, 변경 없음 {summary['unchanged']}주)")
+
+
+if __name__ == "__main__":
+    main()
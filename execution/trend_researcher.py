@@ -10,23 +10,68 @@ trend_researcher.py — D2C 식품 트렌드 리서치 스크립트
   python execution/trend_researcher.py --week 1
   python execution/trend_researcher.py --week 1 --query "커스텀 리서치 쿼리"
   python execution/trend_researcher.py --week 1 --topics "D2C 트렌드" "그릭요거트 시장"
+  python execution/trend_researcher.py --week 1 --parallel 3 --topic-timeout 900 --deadline 1200
+  python execution/trend_researcher.py --week 1 --max-age 0      # 캐시 무시하고 새로 리서치
+  python execution/trend_researcher.py --week 1 --no-resume      # 이번 주 로그를 비우고 처음부터
+  python execution/trend_researcher.py --report --days 30        # 비용/지연 원장 리포트
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
-import subprocess
+import re
 import sys
+import time
+import unicodedata
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_DIR = PROJECT_ROOT / "data"
-WEEKS_DIR = DATA_DIR / "weeks"
+from atomic_io import atomic_writer
+from step_metrics import StepMetrics, count_external_call, record_bytes_written
+from workspace_paths import PROJECT_ROOT, WEEKS_DIR
+
+# 왜: fcntl은 POSIX 전용이다. Windows에서는 잠금 없이 원자적 쓰기만으로 동작한다.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 SKILLS_DIR = Path("/Users/hong/Desktop/Antigravity/AI Skills/skills")
 
 KST = timezone(timedelta(hours=9))
 
+# --- 병렬 리서치 ---
+# 왜: 토픽 하나가 2-10분 걸리므로 순서대로 돌리면 토픽 수만큼 시간이 쌓인다.
+# 서브프로세스는 대부분 원격 작업을 기다리므로 동시에 띄우고, 전체 시간은 가장 느린 토픽에 맞춘다.
+DEFAULT_PARALLEL = int(os.environ.get("DEEP_RESEARCH_PARALLEL") or 3)
+TOPIC_TIMEOUT_SECONDS = 900  # 토픽당 15분
+# 왜: 토픽별 제한 시간에 여유를 더한 값. 동시 실행 수보다 토픽이 많으면 --deadline을 늘린다.
+OVERALL_TIMEOUT_SECONDS = 1200
+# 왜: 취소된 리서치가 결과를 정리할 시간을 준 뒤에도 살아 있으면 강제 종료한다.
+TERMINATE_GRACE_SECONDS = 5
+# 왜: --json 결과가 한 줄로 길게 나오므로 asyncio 기본 줄 길이 제한(64KB)을 넓힌다.
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+# --- 리서치 결과 캐시 ---
+# 왜: 같은 기본 토픽을 매주 $2-5, 2-10분씩 들여 다시 리서치하지만 트렌드 리포트는 주 단위로 거의 바뀌지 않는다.
+# 신선도 기간 안의 결과는 재사용한다. 워크스페이스와 무관한 결과라 프로젝트 공용 캐시에 둔다.
+RESEARCH_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "deep-research.json"
+DEFAULT_MAX_AGE_DAYS = float(os.environ.get("DEEP_RESEARCH_MAX_AGE_DAYS") or 14)
+
+# --- 비용/지연 원장 ---
+# 왜: 리서치 한 번이 $2-5인데 실행 기록이 없으면 지출과 지연을 추적할 수도, 폭주를 막을 수도 없다.
+# 계정 단위 지출이므로 워크스페이스가 아닌 프로젝트 공용 위치에 둔다.
+LEDGER_PATH = PROJECT_ROOT / "data" / "deep-research-ledger.jsonl"
+# 왜: 스킬이 실제 청구액을 알려 주지 않으므로 안내된 범위($2-5)의 중간값으로 추정한다.
+ESTIMATED_COST_USD = float(os.environ.get("DEEP_RESEARCH_COST_USD") or 3.5)
+# 0이면 한도 없음. 주는 월요일 0시(KST), 월은 1일 0시(KST)부터 센다.
+WEEKLY_BUDGET_USD = float(os.environ.get("DEEP_RESEARCH_WEEKLY_BUDGET_USD") or 30)
+MONTHLY_BUDGET_USD = float(os.environ.get("DEEP_RESEARCH_MONTHLY_BUDGET_USD") or 100)
+
 # --- 기본 리서치 쿼리 ---
 # 왜: 매주 고정된 관심 분야를 리서치하여 트렌드 변화를 추적하고,
 # 챕터별로 추가 쿼리를 덧붙여 맥락 있는 리서치가 되도록 한다.
@@ -36,6 +81,131 @@ DEFAULT_TOPICS = [
     "Seth Godin 최신 인터뷰 마케팅 인사이트 2026",
 ]
 
+# 왜: 토픽마다 바뀌는 속도가 다르다. 인터뷰는 새로 나오면 바로 반영해야 하고,
+# 시장 트렌드는 한 달 정도는 그대로 써도 된다. 여기 없는 토픽은 DEFAULT_MAX_AGE_DAYS를 따른다.
+TOPIC_MAX_AGE_DAYS = {
+    "D2C 식품 브랜드 마케팅 트렌드 2026 한국": 14,
+    "그릭요거트 시장 트렌드 및 소비자 행동 2026": 30,
+    "Seth Godin 최신 인터뷰 마케팅 인사이트 2026": 7,
+}
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용으로 리서치 쿼리를 정규화한다.
+    왜: 공백/대소문자/전각 문자만 다른 쿼리는 같은 리서치이므로 같은 키가 되어야 한다.
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def topic_max_age_days(query: str, override: float = None) -> float:
+    """토픽의 신선도 기간(일). override(--max-age)가 있으면 모든 토픽에 그 값을 쓴다."""
+    if override is not None:
+        return override
+    for topic, days in TOPIC_MAX_AGE_DAYS.items():
+        if normalize_query(topic) == normalize_query(query):
+            return days
+    return DEFAULT_MAX_AGE_DAYS
+
+
+class ResearchCache:
+    """
+    정규화된 쿼리 + 출력 형식을 키로 하는 deep-research 결과 캐시.
+
+    저장 형식 (data/cache/deep-research.json):
+      {"entries": {키: {"query", "output_format", "result", "elapsed_seconds", "cached_at"}},
+       "stats": {"hits", "misses"}}
+    """
+
+    def __init__(self, path: Path = RESEARCH_CACHE_PATH):
+        self.path = Path(path)
+        self.data = self._read()
+        # 왜: 저장 시 디스크의 최신 캐시에 이번 실행의 변경분만 합치기 위해 따로 모아 둔다.
+        self._pending_puts = {}
+        self._pending_stats = {"hits": 0, "misses": 0}
+
+    def _read(self) -> dict:
+        data = {"entries": {}, "stats": {"hits": 0, "misses": 0}}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"⚠️  리서치 캐시가 손상되어 새로 만듭니다: {self.path}")
+        return data
+
+    @staticmethod
+    def key(query: str, output_format: str = None) -> str:
+        raw = f"{normalize_query(query)}\n{output_format or ''}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def get(self, query: str, output_format: str = None, max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> dict:
+        """신선도 기간 안의 캐시 항목을 반환한다. 없거나 오래됐으면 None."""
+        entry = self.data["entries"].get(self.key(query, output_format))
+        if entry is not None and time.time() - entry["cached_at"] > max_age_days * 86400:
+            entry = None
+        name = "hits" if entry else "misses"
+        self.data["stats"][name] += 1
+        self._pending_stats[name] += 1
+        return entry
+
+    def put(self, result: dict, output_format: str = None) -> bool:
+        """성공한 리서치 결과만 저장한다. 반환값: 저장 여부"""
+        if result.get("status") != "success" or not result.get("result") or result.get("cache_hit"):
+            return False
+        key = self.key(result["query"], output_format)
+        self.data["entries"][key] = self._pending_puts[key] = {
+            "query": result["query"],
+            "output_format": output_format,
+            "result": result["result"],
+            "elapsed_seconds": result.get("elapsed_seconds"),
+            "cached_at": time.time(),
+        }
+        return True
+
+    def save(self) -> None:
+        """
+        이번 실행의 새 결과와 적중 통계를 디스크의 최신 캐시에 합쳐 저장한다.
+        왜: 캐시는 워크스페이스 간 공용이라 run-all/backfill의 여러 프로세스가 동시에 쓴다.
+        시작할 때 읽은 사본을 그대로 덮어쓰면 다른 프로세스가 그사이 저장한 리서치(토픽당 수 달러)가 사라진다.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                data = self._read()
+                # 왜: 같은 키라면 더 최근에 받은 결과를 남긴다.
+                for key, entry in self._pending_puts.items():
+                    current = data["entries"].get(key)
+                    if current is None or current["cached_at"] <= entry["cached_at"]:
+                        data["entries"][key] = entry
+                for name, count in self._pending_stats.items():
+                    data["stats"][name] = data["stats"].get(name, 0) + count
+                with atomic_writer(self.path) as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        self.data = data
+        self._pending_puts = {}
+        self._pending_stats = {"hits": 0, "misses": 0}
+
+
+def cached_result(entry: dict, query: str, max_age_days: float) -> dict:
+    """캐시 항목을 리서치 결과 형식으로 바꾼다. cache_hit 필드로 trends.json에 재사용 여부를 남긴다."""
+    cached_at = datetime.fromtimestamp(entry["cached_at"], KST)
+    return {
+        "query": query,
+        "result": entry["result"],
+        "status": "success",
+        "cache_hit": True,
+        "cached_at": cached_at.isoformat(),
+        "age_days": round((time.time() - entry["cached_at"]) / 86400, 1),
+        "max_age_days": max_age_days,
+    }
+
 
 def check_api_key() -> bool:
     """
@@ -61,93 +231,384 @@ def check_api_key() -> bool:
     return False
 
 
-def run_deep_research(query: str, output_format: str = None) -> dict:
+def build_research_command(query: str, output_format: str = None) -> list:
+    """deep-research 스킬 실행 명령을 만든다. 스킬이 없으면 None."""
+    research_script = SKILLS_DIR / "deep-research" / "scripts" / "research.py"
+    if not research_script.exists():
+        return None
+
+    cmd = [
+        sys.executable, str(research_script),
+        "--query", query,
+        "--json",
+    ]
+    if output_format:
+        cmd.extend(["--format", output_format])
+    return cmd
+
+
+def _skill_not_found(query: str) -> dict:
+    print(f"⚠️  deep-research 스킬 스크립트를 찾을 수 없습니다: "
+          f"{SKILLS_DIR / 'deep-research' / 'scripts' / 'research.py'}")
+    return {
+        "query": query,
+        "result": None,
+        "status": "skill_not_found",
+        "instruction": (
+            "deep-research 스킬을 사용할 수 없습니다. "
+            "에이전트가 search_web 도구를 사용하여 수동으로 리서치해주세요."
+        ),
+    }
+
+
+async def _stop_process(process) -> None:
+    """자식 프로세스를 SIGTERM으로 멈추고, 유예 시간 뒤에도 살아 있으면 SIGKILL한다."""
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+    except ProcessLookupError:
+        return
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+async def _stream_lines(stream, label: str, sink: list, echo: bool) -> None:
+    """
+    자식 출력을 줄 단위로 모으면서 진행 상황 줄을 토픽 번호와 함께 바로 출력한다.
+    왜: 여러 토픽이 동시에 돌기 때문에 어떤 토픽이 어디까지 왔는지 접두어로 구분한다.
+    --json 결과(첫 글자가 { 또는 [인 줄부터)는 진행 상황이 아니므로 출력하지 않고 모으기만 한다.
+    """
+    payload_started = False
+    async for raw in stream:
+        line = raw.decode("utf-8", errors="replace").rstrip("\n")
+        sink.append(line)
+        if not echo or payload_started:
+            continue
+        if line.lstrip().startswith(("{", "[")):
+            payload_started = True
+        elif line.strip():
+            print(f"   [{label}] {line[:160]}", flush=True)
+
+
+def _parse_output(stdout_lines: list):
+    """--json 출력에서 결과 JSON을 찾는다. 진행 줄이 섞여 있어도 JSON이 시작되는 줄부터 읽는다."""
+    for start, line in enumerate(stdout_lines):
+        if line.lstrip().startswith(("{", "[")):
+            try:
+                return json.loads("\n".join(stdout_lines[start:]))
+            except json.JSONDecodeError:
+                break
+    return "\n".join(stdout_lines)
+
+
+def load_ledger(ledger_path: Path = LEDGER_PATH) -> list:
+    """원장의 모든 줄(예약 + 실행 기록)을 읽는다. append 도중 잘린 마지막 줄은 건너뛴다."""
+    entries = []
+    if not ledger_path.exists():
+        return entries
+    with open(ledger_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def reconcile_ledger(entries: list) -> tuple:
+    """
+    원장 줄을 (끝난 실행 기록, 아직 끝나지 않은 예약)으로 나눈다.
+    왜: 실행을 시작할 때 예약 줄을, 끝날 때 reservation_id가 붙은 실행 기록을 남기므로
+    짝이 없는 예약은 진행 중이거나 기록 전에 프로세스가 죽은 실행이다.
+    """
+    runs = [entry for entry in entries if entry.get("type") != "reservation"]
+    closed = {entry.get("reservation_id") for entry in runs}
+    open_reservations = [
+        entry for entry in entries
+        if entry.get("type") == "reservation" and entry["id"] not in closed
+    ]
+    return runs, open_reservations
+
+
+@contextmanager
+def ledger_lock(ledger_path: Path = LEDGER_PATH):
+    """
+    원장 읽기-판단-추가 구간을 프로세스 간 advisory lock으로 보호한다.
+    왜: run-all/backfill의 여러 프로세스가 같은 계정 예산을 쓰므로, 남은 예산 확인과 예약 기록
+    사이에 다른 프로세스가 끼어들면 둘 다 한도 안이라고 판단해 함께 초과할 수 있다.
     """
-    deep-research 스킬 스크립트를 실행한다.
-    왜: deep-research 스킬은 독립 Python 스크립트로 제공되므로
-    subprocess로 호출하여 결과를 받아온다.
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(ledger_path.with_name(ledger_path.name + ".lock"), "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def record_invocation(entry: dict, ledger_path: Path = LEDGER_PATH) -> None:
+    """원장에 한 줄을 추가하고 fsync한다."""
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(ledger_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def budget_period_starts(now: datetime = None) -> tuple:
+    """이번 주(월요일)와 이번 달(1일)의 시작 시각(KST)을 반환한다."""
+    now = now or datetime.now(KST)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=today.weekday()), today.replace(day=1)
+
+
+class ResearchBudget:
+    """
+    원장에 기록된 이번 주/이번 달 지출과 진행 중인 실행의 추정 비용을 합쳐, 새 실행이 한도를 넘지 않게 한다.
+    왜: 동시에 여러 토픽이 뜨므로 끝난 실행만 세면 한도 직전에 한꺼번에 출발해 초과할 수 있다.
+    진행 중인 실행은 원장의 예약 줄로 남기므로 다른 프로세스의 실행도 함께 센다.
+    끝나지 않은 예약은 기록 전에 죽은 실행일 수도 있지만, 원격 비용은 이미 발생했을 수 있으므로 지출로 본다.
+    """
+
+    def __init__(self, weekly_usd: float = WEEKLY_BUDGET_USD, monthly_usd: float = MONTHLY_BUDGET_USD,
+                 ledger_path: Path = LEDGER_PATH):
+        self.weekly_usd = weekly_usd
+        self.monthly_usd = monthly_usd
+        self.ledger_path = ledger_path
+
+    def usage(self) -> dict:
+        """원장 기준 {"weekly"|"monthly": {"spent": 끝난 실행, "in_flight": 끝나지 않은 예약}}"""
+        week_start, month_start = budget_period_starts()
+        usage = {period: {"spent": 0.0, "in_flight": 0.0} for period in ("weekly", "monthly")}
+        # 왜: 다른 프로세스가 그사이 기록했을 수 있으므로 매번 원장을 다시 읽는다.
+        runs, open_reservations = reconcile_ledger(load_ledger(self.ledger_path))
+        for kind, entries in (("spent", runs), ("in_flight", open_reservations)):
+            for entry in entries:
+                started_at = datetime.fromisoformat(entry["started_at"])
+                cost = entry.get("estimated_cost_usd") or 0.0
+                if started_at >= month_start:
+                    usage["monthly"][kind] += cost
+                if started_at >= week_start:
+                    usage["weekly"][kind] += cost
+        return usage
+
+    def spent(self) -> tuple:
+        """원장 기준 (이번 주 지출, 이번 달 지출). 끝나지 않은 예약을 포함한다."""
+        usage = self.usage()
+        return tuple(usage[period]["spent"] + usage[period]["in_flight"] for period in ("weekly", "monthly"))
+
+    def try_reserve(self, query: str, output_format: str = None, cost: float = ESTIMATED_COST_USD) -> tuple:
+        """
+        한도 안이면 원장에 예약 줄을 남긴다.
+        반환값: (예약 ID, None) 또는 한도를 넘으면 (None, 사유 문자열)
+        """
+        with ledger_lock(self.ledger_path):
+            usage = self.usage()
+            for label, limit, period in (("주간", self.weekly_usd, "weekly"), ("월간", self.monthly_usd, "monthly")):
+                spent, in_flight = usage[period]["spent"], usage[period]["in_flight"]
+                if limit and spent + in_flight + cost > limit:
+                    return None, (f"{label} 예산 ${limit:g} 초과 예상 (지출 ${spent:.2f} + 진행 중 "
+                                  f"${in_flight:.2f} + 이번 ${cost:.2f})")
+            reservation_id = uuid.uuid4().hex[:16]
+            record_invocation({
+                "type": "reservation",
+                "id": reservation_id,
+                "started_at": datetime.now(KST).isoformat(),
+                "query": query,
+                "output_format": output_format,
+                "pid": os.getpid(),
+                "estimated_cost_usd": cost,
+            }, self.ledger_path)
+        return reservation_id, None
+
+    def complete(self, reservation_id: str, entry: dict) -> None:
+        """실행 기록을 예약 ID와 함께 원장에 남겨 예약을 닫는다."""
+        with ledger_lock(self.ledger_path):
+            record_invocation({**entry, "reservation_id": reservation_id}, self.ledger_path)
+
+
+def _budget_exceeded(query: str, reason: str) -> dict:
+    print(f"💸 예산 한도로 건너뜀: {query[:60]} — {reason}", flush=True)
+    return {"query": query, "result": None, "status": "budget_exceeded", "error": reason}
+
+
+async def run_deep_research_async(query: str, label: str = "1", output_format: str = None,
+                                  timeout: float = TOPIC_TIMEOUT_SECONDS,
+                                  budget: ResearchBudget = None) -> dict:
+    """
+    deep-research 스킬 스크립트를 비동기 서브프로세스로 실행한다.
+    왜: deep-research 스킬은 독립 Python 스크립트로 제공되므로 서브프로세스로 호출하고,
+    출력이 끝날 때까지 막혀 있지 않도록 stdout을 줄 단위로 읽으며 진행 상황을 보여 준다.
     비용($2-5/작업)과 시간(2-10분)이 소요되므로 주의가 필요하다.
+    토픽별 제한 시간을 넘기거나 취소되면 자식 프로세스를 정리한다.
 
     반환값:
       {
         "query": "...",
         "result": "... 리서치 결과 마크다운 ...",
-        "status": "success" | "error",
-        "cost_estimate": "$2-5"
+        "status": "success" | "error" | "timeout" | "budget_exceeded",
+        "elapsed_seconds": 123.4
       }
+    실행한 경우 결과와 관계없이(취소 포함) 원장에 기록한다.
     """
-    research_script = SKILLS_DIR / "deep-research" / "scripts" / "research.py"
+    cmd = build_research_command(query, output_format)
+    if cmd is None:
+        return _skill_not_found(query)
 
-    if not research_script.exists():
-        print(f"⚠️  deep-research 스킬 스크립트를 찾을 수 없습니다: {research_script}")
-        return {
-            "query": query,
-            "result": None,
-            "status": "skill_not_found",
-            "instruction": (
-                "deep-research 스킬을 사용할 수 없습니다. "
-                "에이전트가 search_web 도구를 사용하여 수동으로 리서치해주세요."
-            ),
-        }
+    budget = budget or ResearchBudget()
+    reservation_id, reason = budget.try_reserve(query, output_format)
+    if reason:
+        return _budget_exceeded(query, reason)
 
-    # 왜: 리서치는 2-10분 소요되므로 --stream 옵션으로 진행 상황을 표시
-    cmd = [
-        sys.executable, str(research_script),
-        "--query", query,
-        "--json",
-    ]
+    print(f"🔬 [{label}] 리서치 시작: {query[:80]}...", flush=True)
+    count_external_call("deep_research")
+    started_at = datetime.now(KST)
+    started = time.monotonic()
+    stdout_lines = []
+    stderr_lines = []
+    outcome = {"status": "cancelled", "returncode": None}
+    try:
+        return await _run_research_process(cmd, query, label, timeout, started,
+                                           stdout_lines, stderr_lines, outcome)
+    finally:
+        # 왜: 타임아웃/취소된 실행도 원격 작업 비용은 이미 발생했으므로 똑같이 기록한다.
+        budget.complete(reservation_id, {
+            "started_at": started_at.isoformat(),
+            "query": query,
+            "output_format": output_format,
+            "status": outcome["status"],
+            "returncode": outcome["returncode"],
+            "duration_seconds": round(time.monotonic() - started, 1),
+            "output_bytes": sum(len(line.encode("utf-8")) + 1 for line in stdout_lines),
+            "estimated_cost_usd": ESTIMATED_COST_USD,
+        })
 
-    if output_format:
-        cmd.extend(["--format", output_format])
 
+async def _run_research_process(cmd: list, query: str, label: str, timeout: float, started: float,
+                                stdout_lines: list, stderr_lines: list, outcome: dict) -> dict:
+    """서브프로세스를 띄워 출력을 모으고 결과 dict를 만든다. outcome에 원장용 상태를 채운다."""
     try:
-        print(f"🔬 리서치 시작: {query[:80]}...")
-        print(f"   예상 소요 시간: 2-10분")
-        print(f"   예상 비용: $2-5")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=900,  # 15분 타임아웃
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=str(SKILLS_DIR / "deep-research"),
+            limit=STREAM_LINE_LIMIT,
         )
+    except OSError as e:
+        outcome["status"] = "error"
+        return {"query": query, "result": None, "status": "error", "error": str(e)}
 
-        if result.returncode == 0:
-            try:
-                return {
-                    "query": query,
-                    "result": json.loads(result.stdout),
-                    "status": "success",
-                }
-            except json.JSONDecodeError:
-                return {
-                    "query": query,
-                    "result": result.stdout,
-                    "status": "success",
-                }
-        else:
-            return {
-                "query": query,
-                "result": None,
-                "status": "error",
-                "error": result.stderr,
-            }
+    async def communicate():
+        # 왜: gather 퓨처를 코루틴 안에서 await해야 취소 시 예외가 회수되어
+        # "exception was never retrieved" 경고가 남지 않는다.
+        await asyncio.gather(
+            _stream_lines(process.stdout, label, stdout_lines, echo=True),
+            _stream_lines(process.stderr, label, stderr_lines, echo=False),
+            process.wait(),
+        )
 
-    except subprocess.TimeoutExpired:
+    try:
+        await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _stop_process(process)
+        outcome.update(status="timeout", returncode=process.returncode)
+        print(f"⏱️  [{label}] 제한 시간 {timeout:g}초 초과로 중단", flush=True)
         return {
             "query": query,
             "result": None,
             "status": "timeout",
-            "error": "리서치가 15분을 초과했습니다.",
+            "error": f"리서치가 제한 시간 {timeout:g}초를 초과했습니다.",
+            "elapsed_seconds": round(time.monotonic() - started, 1),
         }
-    except Exception as e:
+    except asyncio.CancelledError:
+        # 왜: 전체 제한 시간 초과나 Ctrl+C로 취소되어도 자식 프로세스가 남지 않게 한다.
+        await _stop_process(process)
+        raise
+
+    elapsed = round(time.monotonic() - started, 1)
+    outcome.update(status="success" if process.returncode == 0 else "error", returncode=process.returncode)
+    if process.returncode == 0:
+        print(f"✅ [{label}] 리서치 완료 ({elapsed:.0f}초)", flush=True)
         return {
             "query": query,
-            "result": None,
-            "status": "error",
-            "error": str(e),
+            "result": _parse_output(stdout_lines),
+            "status": "success",
+            "elapsed_seconds": elapsed,
         }
+    print(f"❌ [{label}] 리서치 실패 (종료 코드 {process.returncode})", flush=True)
+    return {
+        "query": query,
+        "result": None,
+        "status": "error",
+        "error": "\n".join(stderr_lines[-20:]),
+        "elapsed_seconds": elapsed,
+    }
+
+
+async def run_research_batch(topics: list, parallel: int = DEFAULT_PARALLEL,
+                             topic_timeout: float = TOPIC_TIMEOUT_SECONDS,
+                             overall_timeout: float = OVERALL_TIMEOUT_SECONDS,
+                             output_format: str = None, on_result=None,
+                             budget: ResearchBudget = None) -> list:
+    """
+    여러 토픽을 최대 parallel개씩 동시에 리서치하고 입력 순서대로 결과를 반환한다.
+    전체 제한 시간이 지나면 아직 끝나지 않은(또는 시작하지 못한) 토픽을 취소하고 cancelled로 기록한다.
+    on_result(result)는 토픽 하나가 끝날 때마다 바로 호출된다(취소된 토픽은 호출되지 않음).
+    예산은 각 토픽이 실제로 출발하기 직전에 확인하므로, 한도에 닿으면 남은 토픽은 budget_exceeded가 된다.
+    """
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    budget = budget or ResearchBudget()
+
+    async def run_one(label: str, topic: str) -> dict:
+        async with semaphore:
+            result = await run_deep_research_async(topic, label, output_format, topic_timeout, budget)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    tasks = [asyncio.create_task(run_one(str(i), topic)) for i, topic in enumerate(topics, 1)]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=overall_timeout)
+    finally:
+        # 왜: 전체 제한 시간 초과뿐 아니라 바깥에서 취소돼도 남은 토픽을 모두 정리한다.
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if pending:
+        print(f"⏱️  전체 제한 시간 {overall_timeout:g}초 초과 — 남은 토픽 {len(pending)}개 취소", flush=True)
+
+    results = []
+    for topic, task in zip(topics, tasks):
+        if task.cancelled():
+            results.append({
+                "query": topic,
+                "result": None,
+                "status": "cancelled",
+                "error": f"전체 제한 시간({overall_timeout:g}초)을 넘어 취소했습니다.",
+            })
+        elif task.exception() is not None:
+            results.append({"query": topic, "result": None, "status": "error", "error": str(task.exception())})
+        else:
+            results.append(task.result())
+    return results
+
+
+def run_deep_research(query: str, output_format: str = None) -> dict:
+    """
+    deep-research 스킬을 토픽 하나에 대해 동기로 실행한다.
+    왜: 단일 쿼리 호출부는 이벤트 루프를 몰라도 되도록 비동기 실행기를 감싼다.
+    """
+    return asyncio.run(run_deep_research_async(query, output_format=output_format))
 
 
 def generate_search_fallback(query: str) -> dict:
@@ -169,7 +630,65 @@ def generate_search_fallback(query: str) -> dict:
     }
 
 
-def save_trends(results: list, week_number: int) -> Path:
+def trends_log_path(week_number: int) -> Path:
+    return WEEKS_DIR / f"week-{week_number:02d}" / "trends.jsonl"
+
+
+def append_trend_record(week_number: int, result: dict) -> None:
+    """
+    토픽 결과 하나를 주차별 trends.jsonl에 한 줄로 추가하고 fsync한다.
+    왜: 모든 토픽이 끝난 뒤 한꺼번에 저장하면 토픽 3에서 죽었을 때 이미 비용을 낸 토픽 1-2도 잃는다.
+    """
+    log_path = trends_log_path(week_number)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    record = dict(result, recorded_at=datetime.now(KST).isoformat())
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_trend_records(week_number: int) -> dict:
+    """trends.jsonl을 읽어 정규화된 쿼리별 마지막 기록을 반환한다."""
+    log_path = trends_log_path(week_number)
+    records = {}
+    if not log_path.exists():
+        return records
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 왜: 마지막 줄은 append 도중 잘렸을 수 있다. fsync 전이므로 없던 결과로 본다.
+                continue
+            records[normalize_query(record.get("query", ""))] = record
+    return records
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    # 왜: 토픽이 끝날 때마다 다시 렌더링하므로, 쓰는 도중 죽어도 이전 버전이 온전히 남아야 한다.
+    with atomic_writer(path) as f:
+        f.write(text)
+    record_bytes_written(path)
+
+
+def render_trends(week_number: int, topics: list, cache_summary: dict = None, quiet: bool = False) -> Path:
+    """
+    trends.jsonl에서 topics 순서대로 마지막 기록을 모아 trends.md/trends.json을 다시 만든다.
+    아직 기록이 없는 토픽은 pending으로 표시한다.
+    """
+    records = load_trend_records(week_number)
+    results = [
+        records.get(normalize_query(topic)) or {"query": topic, "result": None, "status": "pending"}
+        for topic in topics
+    ]
+    return save_trends(results, week_number, cache_summary, quiet)
+
+
+def save_trends(results: list, week_number: int, cache_summary: dict = None, quiet: bool = False) -> Path:
     """
     리서치 결과를 주차별 디렉토리에 저장한다.
     왜: 다른 파이프라인 단계(아이디어 생성)에서 참조할 수 있도록
@@ -177,62 +696,167 @@ def save_trends(results: list, week_number: int) -> Path:
     """
     week_dir = WEEKS_DIR / f"week-{week_number:02d}"
     week_dir.mkdir(parents=True, exist_ok=True)
+    trends_path = week_dir / "trends.md"
+    trends_json_path = week_dir / "trends.json"
+
+    # 왜: 토픽이 끝날 때마다, 그리고 재실행할 때마다 다시 렌더링한다. 결과가 그대로인데 리서치 시각만
+    # 새로 찍어 다시 쓰면 파일 해시가 바뀌어 trend_diff가 바뀌지 않은 주차를 매번 다시 추출한다.
+    content = json.loads(json.dumps({"week": week_number, "cache": cache_summary or {}, "results": results},
+                                    ensure_ascii=False))
+    if trends_path.exists() and trends_json_path.exists():
+        try:
+            with open(trends_json_path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except json.JSONDecodeError:
+            previous = {}
+        if {key: previous.get(key) for key in content} == content:
+            if not quiet:
+                print(f"💾 트렌드 리서치 결과가 그대로여서 다시 쓰지 않습니다: {trends_json_path}")
+            return trends_path
 
     # --- 마크다운 저장 ---
-    trends_path = week_dir / "trends.md"
 
-    content = f"""# D2C 트렌드 리서치 — Week {week_number}
+    parts = [f"""# D2C 트렌드 리서치 — Week {week_number}
 
 **리서치 시각**: {datetime.now(KST).strftime('%Y-%m-%d %H:%M KST')}
 **쿼리 수**: {len(results)}
 
 ---
 
-"""
+"""]
     for i, result in enumerate(results, 1):
-        content += f"## {i}. {result.get('query', 'N/A')}\n\n"
+        parts.append(f"## {i}. {result.get('query', 'N/A')}\n\n")
         status = result.get("status", "unknown")
 
+        if result.get("cache_hit"):
+            parts.append(f"🗄️ 캐시 재사용: {result['cached_at'][:10]} 리서치 "
+                         f"({result['age_days']:g}일 전, 신선도 {result['max_age_days']:g}일)\n\n")
         if status == "success" and result.get("result"):
             if isinstance(result["result"], dict):
-                content += json.dumps(result["result"], ensure_ascii=False, indent=2)
+                parts.append(json.dumps(result["result"], ensure_ascii=False, indent=2))
             else:
-                content += str(result["result"])
+                parts.append(str(result["result"]))
         elif status == "skill_not_found":
-            content += f"⚠️ {result.get('instruction', '스킬 미발견')}\n"
+            parts.append(f"⚠️ {result.get('instruction', '스킬 미발견')}\n")
         elif status == "error":
-            content += f"❌ 에러: {result.get('error', '알 수 없음')}\n"
+            parts.append(f"❌ 에러: {result.get('error', '알 수 없음')}\n")
+        elif status == "budget_exceeded":
+            parts.append(f"💸 예산 한도로 실행하지 않음: {result.get('error')}\n")
+        elif status in ("timeout", "cancelled"):
+            parts.append(f"⏱️ {result.get('error', status)}\n")
+        elif status == "pending":
+            parts.append("⏳ 리서치 진행 중 (아직 결과 없음)\n")
         else:
-            content += f"상태: {status}\n"
+            parts.append(f"상태: {status}\n")
 
-        content += "\n\n---\n\n"
+        parts.append("\n\n---\n\n")
 
-    with open(trends_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    _atomic_write_text(trends_path, "".join(parts))
 
     # --- JSON 저장 ---
-    trends_json_path = week_dir / "trends.json"
-    with open(trends_json_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "week": week_number,
-            "researched_at": datetime.now(KST).isoformat(),
-            "results": results,
-        }, f, ensure_ascii=False, indent=2)
+    _atomic_write_text(trends_json_path, json.dumps({
+        "week": week_number,
+        "researched_at": datetime.now(KST).isoformat(),
+        "cache": cache_summary or {},
+        "results": results,
+    }, ensure_ascii=False, indent=2))
 
-    print(f"💾 트렌드 리서치 결과 저장 완료:")
-    print(f"   마크다운: {trends_path}")
-    print(f"   JSON: {trends_json_path}")
+    if not quiet:
+        print(f"💾 트렌드 리서치 결과 저장 완료:")
+        print(f"   마크다운: {trends_path}")
+        print(f"   JSON: {trends_json_path}")
 
     return trends_path
 
 
+def percentile(values: list, q: float) -> float:
+    """최근접 순위(nearest-rank) 백분위수. 값이 없으면 None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def build_ledger_report(days: float = None, budget: ResearchBudget = None) -> dict:
+    """
+    원장을 집계해 상태별 횟수, 비용/소요 시간/출력 크기 백분위수, 주간/월간 예산 사용량을 만든다.
+    왜: 평균만 보면 간헐적으로 10분씩 걸리거나 실패가 몰리는 부하 상황을 놓친다.
+    """
+    budget = budget or ResearchBudget()
+    entries, open_reservations = reconcile_ledger(load_ledger(budget.ledger_path))
+    if days:
+        cutoff = datetime.now(KST) - timedelta(days=days)
+        entries = [e for e in entries if datetime.fromisoformat(e["started_at"]) >= cutoff]
+
+    by_status = {}
+    for entry in entries:
+        by_status[entry["status"]] = by_status.get(entry["status"], 0) + 1
+
+    def spread(key: str) -> dict:
+        values = [e[key] for e in entries if e.get(key) is not None]
+        summary = {f"p{q}": percentile(values, q) for q in (50, 90, 95, 99)}
+        summary["max"] = max(values) if values else None
+        summary["total"] = round(sum(values), 2)
+        return summary
+
+    usage = budget.usage()
+    return {
+        "generated_at": datetime.now(KST).isoformat(),
+        "days": days,
+        "runs": len(entries),
+        "open_reservations": len(open_reservations),
+        "by_status": by_status,
+        "duration_seconds": spread("duration_seconds"),
+        "estimated_cost_usd": spread("estimated_cost_usd"),
+        "output_bytes": spread("output_bytes"),
+        "budget": {
+            period: {
+                "spent_usd": round(usage[period]["spent"], 2),
+                "in_flight_usd": round(usage[period]["in_flight"], 2),
+                "limit_usd": limit,
+            }
+            for period, limit in (("weekly", budget.weekly_usd), ("monthly", budget.monthly_usd))
+        },
+    }
+
+
+def print_ledger_report(report: dict) -> None:
+    """원장 집계를 표로 출력한다."""
+    period = f"최근 {report['days']:g}일" if report["days"] else "전체 기간"
+    print(f"📒 deep-research 원장 ({period}, 실행 {report['runs']}회)")
+    if report["by_status"]:
+        print("   상태: " + ", ".join(f"{status} {count}" for status, count in sorted(report["by_status"].items())))
+
+        formats = {
+            "duration_seconds": lambda v: f"{v:,.1f}s",
+            "estimated_cost_usd": lambda v: f"${v:,.2f}",
+            "output_bytes": lambda v: f"{v / 1024:,.1f}KB",
+        }
+
+        header = f"   {'지표':<12}{'p50':>12}{'p90':>12}{'p95':>12}{'p99':>12}{'최대':>12}{'합계':>14}"
+        print(header)
+        for name, key in (("소요 시간", "duration_seconds"), ("추정 비용", "estimated_cost_usd"),
+                          ("출력 크기", "output_bytes")):
+            row = report[key]
+            cells = ["-" if row[q] is None else formats[key](row[q]) for q in ("p50", "p90", "p95", "p99", "max", "total")]
+            print(f"   {name:<12}" + "".join(cell.rjust(12) for cell in cells[:-1]) + cells[-1].rjust(14))
+    for label, key in (("이번 주", "weekly"), ("이번 달", "monthly")):
+        budget = report["budget"][key]
+        limit = f"${budget['limit_usd']:g}" if budget["limit_usd"] else "한도 없음"
+        in_flight = f" (+ 진행 중/미완료 ${budget['in_flight_usd']:.2f})" if budget["in_flight_usd"] else ""
+        print(f"💰 {label} 지출 ${budget['spent_usd']:.2f}{in_flight} / {limit}")
+    if report["open_reservations"]:
+        print(f"⏳ 끝나지 않은 예약 {report['open_reservations']}건 — 진행 중이거나 기록 전에 중단된 실행 (지출로 계산)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="D2C 식품 트렌드 리서치 스크립트"
     )
     parser.add_argument(
-        "--week", type=int, required=True,
-        help="주차 번호 (1-23)"
+        "--week", type=int, default=None,
+        help="주차 번호 (1-23, --report가 아니면 필수)"
     )
     parser.add_argument(
         "--topics", nargs="+", default=None,
@@ -246,9 +870,60 @@ def main():
         "--skip-deep-research", action="store_true",
         help="deep-research 스킬을 건너뛰고 search_web 폴백 지시만 생성"
     )
+    parser.add_argument(
+        "--max-age", type=float, default=None,
+        help="캐시 재사용 기간(일). 모든 토픽의 신선도 기간을 덮어씀, 0이면 새로 리서치 "
+             f"(기본: 토픽별, 그 외 {DEFAULT_MAX_AGE_DAYS:g}일)"
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true",
+        help="이번 주차 trends.jsonl을 비우고 모든 토픽을 처음부터 진행 (기본: 완료된 토픽은 건너뜀)"
+    )
+    parser.add_argument(
+        "--weekly-budget", type=float, default=WEEKLY_BUDGET_USD,
+        help=f"이번 주 deep-research 예산(USD), 0이면 한도 없음 (기본: {WEEKLY_BUDGET_USD:g})"
+    )
+    parser.add_argument(
+        "--monthly-budget", type=float, default=MONTHLY_BUDGET_USD,
+        help=f"이번 달 deep-research 예산(USD), 0이면 한도 없음 (기본: {MONTHLY_BUDGET_USD:g})"
+    )
+    parser.add_argument(
+        "--report", action="store_true",
+        help="리서치를 실행하지 않고 비용/지연 원장 리포트만 출력"
+    )
+    parser.add_argument(
+        "--days", type=float, default=None,
+        help="--report 집계 기간(일) (기본: 전체)"
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="--report 결과를 JSON으로 출력"
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=DEFAULT_PARALLEL,
+        help=f"동시에 실행할 리서치 수 (기본: {DEFAULT_PARALLEL})"
+    )
+    parser.add_argument(
+        "--topic-timeout", type=float, default=TOPIC_TIMEOUT_SECONDS,
+        help=f"토픽별 제한 시간(초) (기본: {TOPIC_TIMEOUT_SECONDS})"
+    )
+    parser.add_argument(
+        "--deadline", type=float, default=OVERALL_TIMEOUT_SECONDS,
+        help=f"전체 제한 시간(초), 넘으면 남은 토픽 취소 (기본: {OVERALL_TIMEOUT_SECONDS})"
+    )
 
     args = parser.parse_args()
 
+    if args.report:
+        report = build_ledger_report(args.days, ResearchBudget(args.weekly_budget, args.monthly_budget))
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            print_ledger_report(report)
+        return
+    if args.week is None:
+        parser.error("--week가 필요합니다 (--report 제외)")
+
     # --- 리서치 토픽 결정 ---
     topics = args.topics or DEFAULT_TOPICS
     if args.query:
@@ -258,30 +933,103 @@ def main():
     for i, topic in enumerate(topics, 1):
         print(f"   {i}. {topic}")
 
-    # --- API 키 확인 ---
-    has_key = check_api_key()
-    if not has_key:
-        print("\n⚠️  GEMINI_API_KEY가 설정되지 않았습니다.")
-        print("   deep-research 스킬 대신 search_web 폴백을 사용합니다.\n")
+    with StepMetrics("trends_researched", args.week):
+        # --- API 키 확인 ---
+        has_key = check_api_key()
+        if not has_key:
+            print("\n⚠️  GEMINI_API_KEY가 설정되지 않았습니다.")
+            print("   deep-research 스킬 대신 search_web 폴백을 사용합니다.\n")
 
-    # --- 리서치 실행 ---
-    results = []
+        # --- 이어하기 ---
+        # 왜: 이전 실행이 중간에 죽었으면 이미 성공한 토픽은 로그에서 그대로 가져온다.
+        if args.no_resume:
+            trends_log_path(args.week).unlink(missing_ok=True)
+        records = load_trend_records(args.week)
+        results = [None] * len(topics)
+        for i, topic in enumerate(topics):
+            record = records.get(normalize_query(topic))
+            if record is not None and record.get("status") == "success":
+                results[i] = record
+                print(f"↩️  이전 실행 결과 사용: {topic[:60]}")
+        resumed = sum(1 for result in results if result is not None)
 
-    for topic in topics:
-        if args.skip_deep_research or not has_key:
-            # 폴백: 에이전트에게 웹 검색 지시
-            result = generate_search_fallback(topic)
-            result["query"] = topic
-            result["status"] = "fallback"
-            results.append(result)
-            print(f"\n📡 폴백 지시 생성: {topic[:60]}...")
-        else:
-            result = run_deep_research(topic)
-            results.append(result)
+        # --- 캐시 조회 ---
+        # 왜: 신선도 기간 안의 결과는 API 키 없이도 재사용할 수 있으므로 폴백 여부와 무관하게 먼저 본다.
+        cache = ResearchCache()
+        hits = 0
+        for i, topic in enumerate(topics):
+            if results[i] is not None:
+                continue
+            max_age = topic_max_age_days(topic, args.max_age)
+            entry = cache.get(topic, max_age_days=max_age)
+            if entry is not None:
+                results[i] = cached_result(entry, topic, max_age)
+                append_trend_record(args.week, results[i])
+                hits += 1
+                print(f"🗄️  캐시 재사용: {topic[:60]} ({results[i]['age_days']:g}일 전)")
+        missing = [i for i, result in enumerate(results) if result is None]
+        cache_summary = {
+            "hits": hits,
+            "misses": len(missing),
+            "resumed": resumed,
+            "max_age_override_days": args.max_age,
+        }
+
+        # --- 리서치 실행 ---
+        if missing and (args.skip_deep_research or not has_key):
+            for i in missing:
+                # 폴백: 에이전트에게 웹 검색 지시
+                result = generate_search_fallback(topics[i])
+                result["query"] = topics[i]
+                result["status"] = "fallback"
+                append_trend_record(args.week, result)
+                print(f"\n📡 폴백 지시 생성: {topics[i][:60]}...")
+        elif missing:
+            print(f"\n🚀 토픽 {len(missing)}개 병렬 리서치 (동시 {args.parallel}개, "
+                  f"토픽당 {args.topic_timeout / 60:g}분, 전체 {args.deadline / 60:g}분 제한)")
+            print(f"   예상 비용: 토픽당 $2-5")
+
+            def record_result(result: dict) -> None:
+                # 왜: 토픽이 끝나는 즉시 로그에 남기고 산출물을 다시 그려 두면 이후 크래시에도 결과가 남는다.
+                append_trend_record(args.week, result)
+                if cache.put(result):
+                    cache.save()
+                render_trends(args.week, topics, cache_summary, quiet=True)
+
+            budget = ResearchBudget(args.weekly_budget, args.monthly_budget)
+            week_spent, month_spent = budget.spent()
+            print(f"   예산: 이번 주 ${week_spent:.2f}/${args.weekly_budget:g}, "
+                  f"이번 달 ${month_spent:.2f}/${args.monthly_budget:g}")
+            started = time.monotonic()
+            fresh = asyncio.run(run_research_batch(
+                [topics[i] for i in missing], args.parallel, args.topic_timeout, args.deadline,
+                on_result=record_result, budget=budget,
+            ))
+            print(f"\n⏱️  리서치 총 소요 시간: {time.monotonic() - started:.0f}초")
+            for result in fresh:
+                if result["status"] == "cancelled":
+                    append_trend_record(args.week, result)
+        cache.save()
+
+        if hits:
+            print(f"🗄️  리서치 캐시 적중 {hits}/{len(topics)} — 예상 절약 ${hits * 2}-{hits * 5}")
+        if resumed:
+            print(f"↩️  이전 실행에서 이어받은 토픽 {resumed}/{len(topics)}")
+
+        # --- 결과 저장 ---
+        render_trends(args.week, topics, cache_summary)
+
+        # 왜: 아이디어 생성 단계가 이전 주차 리포트를 모두 다시 읽지 않도록 변화 요약을 함께 만든다.
+        # 색인은 바뀐 주차만 다시 추출하므로 매주 실행해도 가볍다.
+        try:
+            import trend_diff
 
-    # --- 결과 저장 ---
-    save_trends(results, args.week)
-    print(f"\n🎉 Week {args.week} 트렌드 리서치 완료!")
+            summary = trend_diff.diff_week(args.week)
+            print(f"📈 트렌드 변화: 신규 {summary['new']} · 지속 {summary['persisting']} · 소멸 {summary['faded']} "
+                  f"(색인 갱신 {summary['updated']}주)")
+        except Exception as e:
+            print(f"⚠️  트렌드 변화 요약 실패: {e}")
+        print(f"\n🎉 Week {args.week} 트렌드 리서치 완료!")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+"""
+workspace_paths.py — execution 스크립트 공용 데이터 경로
+
+왜(Why) 이 모듈이 필요한가:
+  state_manager는 워크스페이스별로 스크립트를 실행할 때 WYSH_DATA_DIR 환경 변수로
+  산출물 위치를 넘긴다. 모든 스크립트가 이 규칙을 한곳에서 가져와야
+  워크스페이스 격리가 스크립트마다 어긋나지 않는다.
+
+사용법 (스크립트 내부):
+  from workspace_paths import PROJECT_ROOT, DATA_DIR, WEEKS_DIR
+"""
+
+import os
+from pathlib import Path
+
+DATA_DIR_ENV = "WYSH_DATA_DIR"
+
+PROJECT_ROOT = Path(__file__).parent.parent
+# 왜: 환경 변수가 없으면 기본 워크스페이스(기존 data/ 레이아웃)를 쓴다.
+DATA_DIR = Path(os.environ.get(DATA_DIR_ENV) or PROJECT_ROOT / "data")
+WEEKS_DIR = DATA_DIR / "weeks"
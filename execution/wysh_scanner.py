@@ -15,13 +15,13 @@ wysh_scanner.py — WYSH 쇼핑몰/인스타그램 스캔 스크립트
 
 import argparse
 import json
+import os
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_DIR = PROJECT_ROOT / "data"
-WEEKS_DIR = DATA_DIR / "weeks"
+from step_metrics import StepMetrics, count_external_call, record_bytes_written
+from workspace_paths import DATA_DIR, PROJECT_ROOT, WEEKS_DIR
 
 KST = timezone(timedelta(hours=9))
 
@@ -58,6 +58,14 @@ def load_env_config() -> dict:
                 elif key == "WYSH_INSTAGRAM_HANDLE":
                     config["instagram_handle"] = value
 
+    # 왜: 워크스페이스별 브랜드 설정은 state_manager가 환경 변수로 전달하므로 .env보다 우선한다.
+    if os.environ.get("HEADLESS"):
+        config["headless"] = os.environ["HEADLESS"].lower() == "true"
+    if os.environ.get("WYSH_SHOP_URL"):
+        config["shop_url"] = os.environ["WYSH_SHOP_URL"]
+    if os.environ.get("WYSH_INSTAGRAM_HANDLE"):
+        config["instagram_handle"] = os.environ["WYSH_INSTAGRAM_HANDLE"]
+
     return config
 
 
@@ -104,6 +112,7 @@ async def scan_shop(config: dict) -> dict:
 
         try:
             print(f"🌐 쇼핑몰 접속 중: {shop_url}")
+            count_external_call("browser")
             await page.goto(shop_url, wait_until="networkidle", timeout=30000)
 
             # --- 페이지 기본 정보 ---
@@ -207,6 +216,7 @@ async def scan_instagram(config: dict) -> dict:
 
         try:
             print(f"📸 인스타그램 접속 중: {instagram_url}")
+            count_external_call("browser")
             await page.goto(instagram_url, wait_until="networkidle", timeout=30000)
 
             # --- 로그인 팝업 닫기 ---
@@ -279,6 +289,7 @@ def save_context(shop_result: dict, instagram_result: dict, week_number: int) ->
     context_path = week_dir / "wysh-context.json"
     with open(context_path, "w", encoding="utf-8") as f:
         json.dump(context, f, ensure_ascii=False, indent=2)
+    record_bytes_written(context_path)
 
     # 스냅샷 캐시에도 최신 버전 저장
     # 왜: 매번 스캔하지 않아도 가장 최근 스캔 결과를 빠르게 참조할 수 있게
@@ -335,7 +346,8 @@ def main():
     args = parser.parse_args()
 
     import asyncio
-    asyncio.run(run_scan(args))
+    with StepMetrics("wysh_context_collected", args.week):
+        asyncio.run(run_scan(args))
 
 
 if __name__ == "__main__":
@@ -10,22 +10,562 @@ youtube_transcript.py — 유튜브 트랜스크립트 추출 스크립트
   python execution/youtube_transcript.py --url "https://youtu.be/VIDEO_ID" --week 1
   python execution/youtube_transcript.py --url "https://youtu.be/VIDEO_ID" --week 1 --dry-run
   python execution/youtube_transcript.py --url "https://youtu.be/VIDEO_ID" --week 1 --lang ko
+
+  # 배치 모드: .env의 YOUTUBE_URLS + state.json의 youtube_urls를 한 번에 추출
+  python execution/youtube_transcript.py --all --week 1 [--workers 4] [--rate 2] [--retries 3]
+
+  # 지정한 URL 목록만 배치 추출 (backfill이 주차에 기록된 URL을 넘길 때)
+  python execution/youtube_transcript.py --urls URL1 URL2 --week 1
+
+  # 네트워크 없이 로컬 대체 제공자로 실행 (<local-dir>/<video_id>.json)
+  python execution/youtube_transcript.py --all --week 1 --provider local --local-dir data/local-transcripts
+
+  # 저장된 세그먼트 읽기 (다른 스크립트에서)
+  from youtube_transcript import iter_segments
+  for segment in iter_segments(1): ...
+
+  # 특정 시각의 자막 찾기 (transcript_segments.bin 이진 탐색)
+  python execution/youtube_transcript.py --week 1 --at 125.5 [--video VIDEO_ID]
+
+  # 중복 영상(재업로드) 처리: skip(기본) / flag / off
+  python execution/youtube_transcript.py --all --week 1 --dedup flag [--dedup-threshold 0.8]
+
+  # 트랜스크립트 캐시 통계 확인 / 캐시 없이 실행
+  python execution/youtube_transcript.py --cache-stats
+  python execution/youtube_transcript.py --all --week 1 --no-cache
 """
 
 import argparse
+import gzip
+import hashlib
 import json
+import os
+import random
 import re
+import shutil
 import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-# --- 프로젝트 경로 ---
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_DIR = PROJECT_ROOT / "data"
-WEEKS_DIR = DATA_DIR / "weeks"
+from atomic_io import atomic_write_json, atomic_writer
+from segment_store import SegmentStore, SegmentStoreWriter
+from step_metrics import StepMetrics, count_external_call, record_bytes_written
+from workspace_paths import DATA_DIR, PROJECT_ROOT, WEEKS_DIR
+
+# 왜: fcntl은 POSIX 전용이다. Windows에서는 잠금 없이 원자적 쓰기만으로 동작한다.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 KST = timezone(timedelta(hours=9))
 
+# 왜: 한국어를 우선, 영어를 폴백으로 시도한다. state_manager의 단계 지문(fingerprint)도
+# 이 값을 입력으로 사용하므로 한곳에서 관리한다.
+DEFAULT_LANGUAGES = ["ko", "en"]
+
+# --- 배치 추출 기본값 ---
+# 왜: YouTube는 짧은 시간에 요청이 몰리면 차단(429)하므로 동시 요청 수와 초당 호출 수를 함께 제한한다.
+DEFAULT_WORKERS = 4
+DEFAULT_RATE_PER_SECOND = 2.0
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0
+
+# 왜: 재시도해도 결과가 바뀌지 않는 오류는 즉시 포기하여 한도를 낭비하지 않는다.
+PERMANENT_ERRORS = ("TranscriptsDisabled", "NoTranscriptFound", "VideoUnavailable")
+
+# 왜: 네트워크 없이 배치 흐름을 점검할 수 있도록 로컬 대체 제공자가 읽을 기본 디렉토리.
+DEFAULT_LOCAL_DIR = DATA_DIR / "local-transcripts"
+
+# --- 트랜스크립트 캐시 ---
+# 왜: 같은 Seth Godin 강연이 여러 챕터에서 반복 사용되므로 영상 단위로 캐시한다.
+# 영상 내용은 워크스페이스와 무관하므로 워크스페이스별 DATA_DIR이 아닌 공용 data/cache에 둔다.
+TRANSCRIPT_CACHE_DIR = Path(
+    os.environ.get("TRANSCRIPT_CACHE_DIR") or PROJECT_ROOT / "data" / "cache" / "transcripts"
+)
+DEFAULT_CACHE_MAX_MB = float(os.environ.get("TRANSCRIPT_CACHE_MAX_MB") or 200)
+
+# --- 중복 영상 탐지 (MinHash + LSH) ---
+# 왜: 같은 강연이 여러 Video ID로 재업로드되므로, 이미 수집한 영상과 내용이 거의 같은 영상을 걸러낸다.
+# 어떤 영상이 어떤 영상의 중복인지는 워크스페이스의 수집 이력이므로 DATA_DIR에 둔다.
+DEDUP_INDEX_PATH = DATA_DIR / "transcript-dedup.json"
+DEFAULT_DEDUP_THRESHOLD = float(os.environ.get("TRANSCRIPT_DEDUP_THRESHOLD") or 0.8)
+DEDUP_SHINGLE_WORDS = 5
+DEDUP_NUM_PERM = 128
+# 왜: 16밴드 × 8행이면 유사도 약 0.7부터 후보로 잡힐 확률이 급격히 오른다 ((1/16)^(1/8) ≈ 0.71).
+# 후보는 서명으로 다시 유사도를 추정해 임계값과 비교하므로, 임계값보다 조금 낮게 잡는다.
+DEDUP_BANDS = 16
+_MINHASH_PRIME = (1 << 61) - 1
+# 왜: 서명이 실행마다 같아야 저장된 색인과 비교할 수 있으므로 고정 시드로 해시 계수를 만든다.
+_minhash_random = random.Random(20241)
+_MINHASH_PARAMS = [
+    (_minhash_random.randrange(1, _MINHASH_PRIME), _minhash_random.randrange(0, _MINHASH_PRIME))
+    for _ in range(DEDUP_NUM_PERM)
+]
+
+
+class TranscriptProvider(ABC):
+    """
+    트랜스크립트 제공자 인터페이스.
+    왜: 배치/재시도/저장 로직을 YouTube 네트워크와 분리해야
+    로컬 파일로 같은 흐름을 재현하고 점검할 수 있다.
+    추상 메서드로 선언해 메서드를 빠뜨린 제공자는 생성 시점에 실패하게 한다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def list_languages(self, video_id: str) -> list:
+        """사용 가능한 트랜스크립트 [(언어 이름, 언어 코드, 자동생성 여부)] 목록."""
+
+    @abstractmethod
+    def get_segments(self, video_id: str, languages: list) -> list:
+        """우선순위 언어로 세그먼트 [{"text", "start", "duration"}] 목록을 가져온다."""
+
+
+class YouTubeTranscriptProvider(TranscriptProvider):
+    """youtube-transcript-api를 사용하는 기본 제공자."""
+
+    name = "youtube"
+
+    def __init__(self):
+        self._api = None
+
+    @property
+    def api(self):
+        # 왜: 모든 영상이 캐시에 있으면 라이브러리가 없어도 실행되도록 처음 호출할 때 import한다.
+        if self._api is None:
+            try:
+                from youtube_transcript_api import YouTubeTranscriptApi
+            except ImportError:
+                print("❌ youtube-transcript-api가 설치되지 않았습니다.")
+                print("   설치: pip install youtube-transcript-api")
+                sys.exit(1)
+            self._api = YouTubeTranscriptApi
+        return self._api
+
+    def list_languages(self, video_id: str) -> list:
+        count_external_call("youtube")
+        return [
+            (t.language, t.language_code, t.is_generated)
+            for t in self.api.list_transcripts(video_id)
+        ]
+
+    def get_segments(self, video_id: str, languages: list) -> list:
+        count_external_call("youtube")
+        return self.api.get_transcript(video_id, languages=languages)
+
+
+class LocalTranscriptProvider(TranscriptProvider):
+    """
+    <directory>/<video_id>.json을 읽는 로컬 대체 제공자.
+    파일 형식: 세그먼트 배열, 또는 {"language": "en", "is_generated": false, "segments": [...]}
+    왜: 네트워크 없이 배치 모드(동시 실행, 재시도, 번들 저장)를 재현하기 위함.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _load(self, video_id: str) -> dict:
+        path = self.directory / f"{video_id}.json"
+        if not path.exists():
+            raise LookupError(f"NoTranscriptFound: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {"segments": data}
+        return data
+
+    def list_languages(self, video_id: str) -> list:
+        data = self._load(video_id)
+        language = data.get("language", DEFAULT_LANGUAGES[-1])
+        return [(language, language, data.get("is_generated", True))]
+
+    def get_segments(self, video_id: str, languages: list) -> list:
+        return self._load(video_id)["segments"]
+
+
+def get_provider(name: str = "youtube", local_dir: Path = None) -> TranscriptProvider:
+    """이름에 해당하는 트랜스크립트 제공자를 만든다."""
+    if name == "local":
+        return LocalTranscriptProvider(local_dir or DEFAULT_LOCAL_DIR)
+    return YouTubeTranscriptProvider()
+
+
+class RateLimiter:
+    """
+    스레드 간에 공유하는 최소 호출 간격 제한기.
+    왜: 동시 작업자 수만으로는 순간 호출량이 제한되지 않으므로,
+    모든 작업자가 같은 시계를 보고 호출 시각을 1/rate초 간격으로 나눠 갖는다.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.interval == 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TranscriptCache:
+    """
+    video_id + 실제 사용된 언어를 키로 하는 영구 트랜스크립트 캐시 (크기 상한 + LRU 제거).
+    왜: fetch_transcript는 이전 주차에 받은 영상도 매번 YouTube에 다시 요청한다.
+    캐시가 있으면 반복 주차와 backfill은 네트워크 왕복 없이 끝난다.
+
+    저장 형식:
+      <cache_dir>/<video_id>.<lang>.json.gz  [[start, duration, text], ...] (gzip, 공백 없는 JSON)
+      <cache_dir>/index.json                 항목별 크기/마지막 사용 시각, 영상별 사용 가능 언어, 적중 통계
+      <cache_dir>/index.lock                 인덱스 읽기-합치기-쓰기 구간의 프로세스 간 잠금
+
+    언어는 요청 우선순위가 아니라 "실제로 선택된 언어"로 저장한다. 조회 시에는 영상별로 저장해 둔
+    사용 가능 언어 목록으로 이번 요청이 선택할 언어를 먼저 정한 뒤 그 항목만 찾으므로,
+    ["en"] 요청으로 저장된 영어 자막이 ["ko", "en"] 요청의 한국어 자막을 가리지 않는다.
+    """
+
+    def __init__(self, cache_dir: Path = TRANSCRIPT_CACHE_DIR, max_mb: float = DEFAULT_CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # 왜: 배치 모드의 작업자 스레드가 같은 인덱스를 동시에 갱신한다.
+        self.lock = threading.Lock()
+        self.index = self._load_index()
+        self._index_stamp = self._stamp()
+        # 왜: 조회(get)마다 인덱스를 다시 쓰면 적중할수록 느려진다. 마지막 사용 시각과 적중/실패
+        # 횟수는 모아 두었다가 put/flush 때 디스크의 최신 인덱스에 합쳐 한 번에 쓴다.
+        self._pending_access = {}
+        self._pending_stats = {"hits": 0, "misses": 0}
+        # 이번 실행에서의 적중/실패 (누적값은 index["stats"])
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self) -> dict:
+        index = {"entries": {}, "videos": {}, "stats": {"hits": 0, "misses": 0, "evictions": 0}}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"⚠️  캐시 인덱스가 손상되어 새로 만듭니다: {self.index_path}")
+        return index
+
+    def _stamp(self) -> tuple:
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        """다른 프로세스가 인덱스를 바꿨으면 다시 읽는다 (self.lock 안에서 호출)."""
+        stamp = self._stamp()
+        if stamp != self._index_stamp:
+            self.index = self._load_index()
+            self._index_stamp = stamp
+
+    @contextmanager
+    def _locked_index(self):
+        """
+        프로세스 간 잠금을 잡고 디스크의 최신 인덱스에 미뤄 둔 사용 기록을 합친 뒤 넘겨주고,
+        블록이 끝나면 원자적으로 다시 쓴다.
+        왜: 배치 실행 여러 개(run-all, backfill)가 같은 공용 캐시를 쓰므로, 읽어 둔 인덱스를
+        그대로 덮어쓰면 다른 프로세스가 추가한 항목과 통계가 사라진다.
+        """
+        with self.lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / "index.lock", "a") as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    self.index = self._load_index()
+                    for key, accessed in self._pending_access.items():
+                        if key in self.index["entries"]:
+                            entry = self.index["entries"][key]
+                            entry["last_access"] = max(entry["last_access"], accessed)
+                    for name, count in self._pending_stats.items():
+                        self.index["stats"][name] = self.index["stats"].get(name, 0) + count
+                    self._pending_access = {}
+                    self._pending_stats = {"hits": 0, "misses": 0}
+                    yield self.index
+                    self._save_index()
+                    self._index_stamp = self._stamp()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _save_index(self) -> None:
+        # 왜: 쓰는 도중 중단되어도 인덱스가 잘리지 않도록 임시 파일을 rename한다.
+        atomic_write_json(self.index_path, self.index, indent=None)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def get(self, video_id: str, languages: list) -> dict:
+        """캐시된 결과를 반환한다. 없으면 None. 사용 기록은 flush/put 때 인덱스에 반영된다."""
+        with self.lock:
+            self._refresh()
+            available = self.index["videos"].get(video_id)
+            key = None
+            if available is not None:
+                codes = [code for _, code, _ in available]
+                resolved = next((lang for lang in languages if lang in codes), None)
+                if resolved is not None:
+                    key = f"{video_id}.{resolved}"
+
+            rows = None
+            if key in self.index["entries"]:
+                # 왜: 다른 프로세스가 방금 제거한 항목이면 파일이 없을 수 있다. 실패로 처리한다.
+                try:
+                    with gzip.open(self._entry_path(key), "rt", encoding="utf-8") as f:
+                        rows = json.load(f)
+                except (OSError, EOFError, json.JSONDecodeError):
+                    rows = None
+
+            if rows is None:
+                self.misses += 1
+                self._pending_stats["misses"] += 1
+                return None
+            self.hits += 1
+            self._pending_stats["hits"] += 1
+            self._pending_access[key] = time.time()
+
+        segments = [{"text": text, "start": start, "duration": duration} for start, duration, text in rows]
+        return _build_result(video_id, segments, languages, [tuple(item) for item in available])
+
+    def put(self, result: dict, available: list) -> None:
+        """추출 결과를 저장하고 크기 상한을 넘으면 오래 안 쓴 항목부터 제거한다."""
+        if result["language"] == "unknown":
+            # 왜: 어떤 언어가 선택됐는지 모르면 다음 조회에서 키를 재현할 수 없다.
+            return
+        key = f"{result['video_id']}.{result['language']}"
+        rows = [
+            [segment["start"], segment.get("duration", 0), segment["text"]]
+            for segment in result["segments"]
+        ]
+
+        with self._locked_index() as index:
+            entry_path = self._entry_path(key)
+            # 왜: 다른 프로세스가 같은 항목을 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 rename한다.
+            with atomic_writer(entry_path, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, separators=(",", ":"))
+
+            index["videos"][result["video_id"]] = [list(item) for item in available]
+            index["entries"][key] = {
+                "size": entry_path.stat().st_size,
+                "last_access": time.time(),
+            }
+            self._evict(keep=key)
+
+    def flush(self) -> None:
+        """미뤄 둔 사용 시각/적중 통계를 인덱스에 반영한다. 배치가 끝날 때 한 번 호출한다."""
+        with self.lock:
+            pending = self._pending_access or any(self._pending_stats.values())
+        if pending:
+            with self._locked_index():
+                pass
+
+    def _evict(self, keep: str) -> None:
+        total = sum(entry["size"] for entry in self.index["entries"].values())
+        for key in sorted(self.index["entries"], key=lambda k: self.index["entries"][k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.index["entries"].pop(key)["size"]
+            self._entry_path(key).unlink(missing_ok=True)
+            self.index["stats"]["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            self._refresh()
+            stats = dict(self.index["stats"])
+            for name, count in self._pending_stats.items():
+                stats[name] = stats.get(name, 0) + count
+            return {
+                "entries": len(self.index["entries"]),
+                "bytes": sum(entry["size"] for entry in self.index["entries"].values()),
+                "max_bytes": self.max_bytes,
+                "run_hits": self.hits,
+                "run_misses": self.misses,
+                **stats,
+            }
+
+    def print_stats(self) -> None:
+        stats = self.stats()
+        print(f"🗄️  트랜스크립트 캐시: 이번 실행 적중 {stats['run_hits']} / 실패 {stats['run_misses']}, "
+              f"누적 적중 {stats['hits']} / 실패 {stats['misses']} / 제거 {stats['evictions']}, "
+              f"항목 {stats['entries']}개 ({stats['bytes'] / 1024:.1f}KB / {stats['max_bytes'] / 1024 / 1024:g}MB)")
+
+
+def minhash_signature(segments: list) -> list:
+    """
+    세그먼트 텍스트의 MinHash 서명을 만든다. 텍스트가 없으면 None.
+    왜: 자동 생성 자막은 업로드마다 구두점/대소문자/줄바꿈 위치가 조금씩 달라지므로,
+    소문자 단어 5-gram 집합의 자카드 유사도로 비교한다. 서명 두 개에서 같은 자리 값이
+    일치하는 비율이 자카드 유사도의 추정값이다.
+    """
+    words = []
+    for segment in segments:
+        words.extend(re.findall(r"\w+", segment["text"].lower()))
+    if not words:
+        return None
+
+    shingles = {
+        " ".join(words[i:i + DEDUP_SHINGLE_WORDS])
+        for i in range(max(1, len(words) - DEDUP_SHINGLE_WORDS + 1))
+    }
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+    return [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _MINHASH_PARAMS]
+
+
+class TranscriptDedupIndex:
+    """
+    수집한 영상의 MinHash 서명을 LSH 밴드 버킷으로 저장하는 중복 탐지 색인.
+    왜: 새 영상을 수집된 모든 영상과 하나씩 비교하면 URL 목록이 길수록 비교 횟수가 제곱으로 는다.
+    서명을 밴드로 나눠 버킷에 넣어 두면, 같은 버킷에 걸린 후보만 비교하면 된다.
+
+    저장 형식 (data/transcript-dedup.json):
+      {"videos": {video_id: {"week", "signature"} 또는 {"week", "duplicate_of", "similarity"}},
+       "buckets": {"밴드번호:해시": [video_id, ...]}}
+
+    중복으로 판정된 영상은 서명을 버킷에 넣지 않는다. 원본 하나만 비교 대상으로 남겨야
+    재업로드가 여러 개여도 후보가 늘지 않는다. 이미 중복으로 기록된 영상은 다음 실행에서
+    트랜스크립트를 받기 전에 건너뛸 수 있다.
+
+    여러 주차를 동시에 수집하는 프로세스(run-all, backfill)가 같은 색인을 쓰므로, 이 인스턴스가
+    바꾼 영상 기록만 모아 두었다가 save()에서 잠금을 잡고 디스크의 최신 색인에 합친다.
+    """
+
+    def __init__(self, path: Path = DEDUP_INDEX_PATH, threshold: float = DEFAULT_DEDUP_THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.index = self._read()
+        # video_id -> 새 기록 (다른 프로세스의 변경과 합칠 때 이 영상들만 덮어쓴다)
+        self._pending = {}
+
+    def _read(self) -> dict:
+        index = {"videos": {}, "buckets": {}}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    index.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"⚠️  중복 탐지 색인이 손상되어 새로 만듭니다: {self.path}")
+        return index
+
+    @staticmethod
+    def _band_keys(signature: list) -> list:
+        rows = DEDUP_NUM_PERM // DEDUP_BANDS
+        keys = []
+        for band in range(DEDUP_BANDS):
+            values = signature[band * rows:(band + 1) * rows]
+            digest = hashlib.blake2b(json.dumps(values).encode("utf-8"), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    def known_duplicate(self, video_id: str) -> dict:
+        """이전에 중복으로 기록된 영상이면 그 기록을 반환한다 (트랜스크립트를 받기 전 확인용)."""
+        entry = self.index["videos"].get(video_id)
+        if entry and entry.get("duplicate_of"):
+            return entry
+        return None
+
+    def find_duplicate(self, video_id: str, signature: list) -> tuple:
+        """같은 버킷에 걸린 후보 중 임계값 이상으로 가장 비슷한 원본 영상. 없으면 None."""
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.index["buckets"].get(key, ()))
+        # 왜: 같은 주차를 다시 실행하면 자기 자신이 후보로 나오므로 제외한다.
+        candidates.discard(video_id)
+
+        best = None
+        for candidate in candidates:
+            other = self.index["videos"][candidate]["signature"]
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / DEDUP_NUM_PERM
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+    @classmethod
+    def _remove(cls, index: dict, video_id: str) -> None:
+        entry = index["videos"].pop(video_id, None)
+        if entry and entry.get("signature"):
+            for key in cls._band_keys(entry["signature"]):
+                bucket = index["buckets"].get(key, [])
+                if video_id in bucket:
+                    bucket.remove(video_id)
+                if not bucket:
+                    index["buckets"].pop(key, None)
+
+    @classmethod
+    def _put(cls, index: dict, video_id: str, entry: dict) -> None:
+        # 왜: 내용이 바뀐 재수집일 수 있으므로 예전 서명과 버킷을 먼저 지운다.
+        cls._remove(index, video_id)
+        index["videos"][video_id] = entry
+        if entry.get("signature"):
+            for key in cls._band_keys(entry["signature"]):
+                index["buckets"].setdefault(key, []).append(video_id)
+
+    def check_and_add(self, result: dict, week_number: int) -> tuple:
+        """
+        결과를 색인과 비교하고 기록한다.
+        반환값: 중복이면 (원본 video_id, 유사도), 아니면 None
+        """
+        video_id = result["video_id"]
+        signature = minhash_signature(result["segments"])
+        if signature is None:
+            return None
+
+        match = self.find_duplicate(video_id, signature)
+        if match is not None:
+            entry = {"week": week_number, "duplicate_of": match[0], "similarity": round(match[1], 3)}
+        else:
+            entry = {"week": week_number, "signature": signature}
+        self._put(self.index, video_id, entry)
+        self._pending[video_id] = entry
+        return match
+
+    def save(self) -> None:
+        """
+        잠금을 잡고 디스크의 최신 색인을 다시 읽어 이 인스턴스가 바꾼 영상만 합친 뒤 원자적으로 쓴다.
+        왜: 읽어 둔 색인을 그대로 쓰면 그사이 다른 프로세스가 추가한 영상과 버킷이 사라진다.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                index = self._read()
+                for video_id, entry in self._pending.items():
+                    self._put(index, video_id, entry)
+                # 왜: 쓰는 도중 중단되어도 색인이 잘리지 않도록 임시 파일을 rename한다.
+                atomic_write_json(self.path, index, indent=None)
+                self.index = index
+                self._pending = {}
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
 
 def extract_video_id(url: str) -> str:
     """
@@ -56,11 +596,99 @@ def extract_video_id(url: str) -> str:
     return None
 
 
-def fetch_transcript(video_id: str, languages: list = None) -> dict:
+def load_youtube_urls(state_urls: list = None, env_value: str = None) -> list:
+    """
+    배치 대상 URL을 .env의 YOUTUBE_URLS(쉼표 구분)와 상태 저장소의 youtube_urls에서 모은다.
+    왜: 같은 영상이 두 곳에 모두 적혀 있을 수 있으므로 Video ID 기준으로 중복을 제거하고
+    먼저 나온 순서를 유지한다. 환경 변수 YOUTUBE_URLS가 .env보다 우선한다.
+    state_urls/env_value를 넘기면 파일 대신 그 값을 쓴다 (state_manager가 이미 로드한 상태 사용).
+    """
+    urls = []
+
+    if env_value is None:
+        env_value = os.environ.get("YOUTUBE_URLS")
+    env_path = PROJECT_ROOT / ".env"
+    if env_value is None and env_path.exists():
+        with open(env_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                if key.strip() == "YOUTUBE_URLS":
+                    env_value = value.strip()
+    if env_value:
+        urls.extend(url.strip() for url in env_value.split(",") if url.strip())
+
+    if state_urls is None:
+        # 왜: STATE_BACKEND=sqlite이면 state.json은 낡았거나 없으므로 설정된 상태 저장소에서 읽는다.
+        import state_manager
+
+        state_urls = (state_manager.get_backend().load_state() or {}).get("youtube_urls") or []
+    urls.extend(state_urls or [])
+
+    unique_urls = []
+    seen_ids = set()
+    for url in urls:
+        video_id = extract_video_id(url)
+        if video_id is None:
+            print(f"⚠️  유효하지 않은 YouTube URL을 건너뜁니다: {url}")
+            continue
+        if video_id not in seen_ids:
+            seen_ids.add(video_id)
+            unique_urls.append(url)
+    return unique_urls
+
+
+def _build_result(video_id: str, segments: list, languages: list, available: list) -> dict:
+    """
+    세그먼트 목록에서 저장용 결과 딕셔너리를 만든다.
+    왜: 전체 텍스트는 TranscriptWriter가 세그먼트를 흘려 쓰면서 만들므로,
+    여기서 합친 문자열을 따로 들고 있지 않고 문자 수만 계산한다.
+    """
+    # 문자 수 = 세그먼트 텍스트 길이 + 세그먼트 사이 공백
+    character_count = sum(len(entry["text"]) for entry in segments) + max(0, len(segments) - 1)
+
+    # 총 재생 시간 계산
+    if segments:
+        last_entry = segments[-1]
+        duration = last_entry["start"] + last_entry.get("duration", 0)
+    else:
+        duration = 0
+
+    # 사용된 언어 확인
+    available_codes = [code for _, code, _ in available]
+    used_lang = "unknown"
+    for lang in languages:
+        if lang in available_codes:
+            used_lang = lang
+            break
+
+    is_generated = True
+    for _, code, generated in available:
+        if code == used_lang:
+            is_generated = generated
+            break
+
+    return {
+        "video_id": video_id,
+        "language": used_lang,
+        "is_generated": is_generated,
+        "segments": segments,
+        "duration_seconds": int(duration),
+        "character_count": character_count,
+    }
+
+
+def fetch_transcript(video_id: str, languages: list = None, provider: TranscriptProvider = None,
+                     rate_limiter: RateLimiter = None, retries: int = 1,
+                     cache: TranscriptCache = None) -> dict:
     """
     유튜브 트랜스크립트를 추출한다.
-    왜: youtube-transcript-api를 래핑하여 에러 핸들링과
-    언어 폴백 로직을 캡슐화한다.
+    왜: 제공자 호출을 래핑하여 에러 핸들링, 언어 폴백, 재시도 로직을 캡슐화한다.
+    네트워크 오류처럼 일시적인 실패만 지수 백오프로 재시도하고,
+    자막 비활성화 같은 영구 오류는 바로 포기한다.
+    cache가 주어지면 캐시를 먼저 확인하고, 새로 받은 결과는 캐시에 저장한다.
 
     반환값:
       {
@@ -68,156 +696,503 @@ def fetch_transcript(video_id: str, languages: list = None) -> dict:
         "language": "en",
         "is_generated": True,
         "segments": [...],
-        "full_text": "...",
-        "duration_seconds": 1234
+        "duration_seconds": 1234,
+        "character_count": 5678
       }
     """
-    try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-    except ImportError:
-        print("❌ youtube-transcript-api가 설치되지 않았습니다.")
-        print("   설치: pip install youtube-transcript-api")
-        sys.exit(1)
-
-    # 왜: 한국어를 우선, 영어를 폴백으로 시도. 사용자가 --lang으로 지정 가능.
+    # 왜: 사용자가 --lang으로 지정하지 않으면 기본 우선순위를 사용한다.
     if languages is None:
-        languages = ["ko", "en"]
-
-    try:
-        # 사용 가능한 트랜스크립트 목록 확인
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        print(f"📝 사용 가능한 트랜스크립트:")
-        available = []
-        for t in transcript_list:
-            tag = "[자동생성]" if t.is_generated else "[수동]"
-            print(f"   - {t.language} ({t.language_code}) {tag}")
-            available.append(t.language_code)
-
-        # 트랜스크립트 가져오기
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-
-        # 전체 텍스트 합치기
-        full_text = " ".join([entry["text"] for entry in transcript])
-
-        # 총 재생 시간 계산
-        if transcript:
-            last_entry = transcript[-1]
-            duration = last_entry["start"] + last_entry.get("duration", 0)
-        else:
-            duration = 0
+        languages = DEFAULT_LANGUAGES
+    if provider is None:
+        provider = get_provider()
 
-        # 사용된 언어 확인
-        used_lang = "unknown"
-        for lang in languages:
-            if lang in available:
-                used_lang = lang
-                break
+    if cache is not None:
+        cached = cache.get(video_id, languages)
+        if cached is not None:
+            print(f"🗄️  [{video_id}] 캐시 사용 ({cached['language']})")
+            return cached
 
-        return {
-            "video_id": video_id,
-            "language": used_lang,
-            "is_generated": True,
-            "segments": transcript,
-            "full_text": full_text,
-            "duration_seconds": int(duration),
-            "character_count": len(full_text),
-        }
-
-    except Exception as e:
-        error_msg = str(e)
-
-        # 왜: 에러 유형별로 구체적인 안내를 제공하여 사용자가 문제를 해결할 수 있게 한다.
-        if "TranscriptsDisabled" in error_msg:
-            print(f"❌ 이 영상은 자막이 비활성화되어 있습니다: {video_id}")
-        elif "NoTranscriptFound" in error_msg:
-            print(f"❌ 트랜스크립트를 찾을 수 없습니다: {video_id}")
-            print(f"   요청 언어: {', '.join(languages)}")
-        elif "VideoUnavailable" in error_msg:
-            print(f"❌ 영상이 비공개이거나 존재하지 않습니다: {video_id}")
+    for attempt in range(1, retries + 1):
+        try:
+            # 사용 가능한 트랜스크립트 목록 확인
+            if rate_limiter:
+                rate_limiter.wait()
+            available = provider.list_languages(video_id)
+            print(f"📝 [{video_id}] 사용 가능한 트랜스크립트:")
+            for language, code, generated in available:
+                tag = "[자동생성]" if generated else "[수동]"
+                print(f"   - {language} ({code}) {tag}")
+
+            # 트랜스크립트 가져오기
+            if rate_limiter:
+                rate_limiter.wait()
+            segments = provider.get_segments(video_id, languages)
+            result = _build_result(video_id, segments, languages, available)
+            if cache is not None:
+                cache.put(result, available)
+            return result
+
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {e}"
+            permanent = any(name in error_msg for name in PERMANENT_ERRORS)
+
+            if not permanent and attempt < retries:
+                wait_seconds = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                print(f"⚠️  [{video_id}] 추출 실패 ({attempt}/{retries}), {wait_seconds:.0f}초 후 재시도: {e}")
+                time.sleep(wait_seconds)
+                continue
+
+            # 왜: 에러 유형별로 구체적인 안내를 제공하여 사용자가 문제를 해결할 수 있게 한다.
+            if "TranscriptsDisabled" in error_msg:
+                print(f"❌ 이 영상은 자막이 비활성화되어 있습니다: {video_id}")
+            elif "NoTranscriptFound" in error_msg:
+                print(f"❌ 트랜스크립트를 찾을 수 없습니다: {video_id}")
+                print(f"   요청 언어: {', '.join(languages)}")
+            elif "VideoUnavailable" in error_msg:
+                print(f"❌ 영상이 비공개이거나 존재하지 않습니다: {video_id}")
+            else:
+                print(f"❌ 트랜스크립트 추출 실패: {error_msg}")
+
+            return None
+
+    return None
+
+
+def iter_transcripts_batch(video_ids: list, languages: list = None, provider: TranscriptProvider = None,
+                           workers: int = DEFAULT_WORKERS, rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                           retries: int = DEFAULT_RETRIES, cache: TranscriptCache = None):
+    """
+    여러 영상의 트랜스크립트를 제한된 스레드 풀로 동시에 추출하며 (video_id, 결과)를 하나씩 내보낸다.
+    왜: 영상마다 프로세스를 띄우고 목록 조회/자막 조회를 순서대로 왕복하면
+    영상 수만큼 대기 시간이 쌓인다. 호출은 네트워크 대기가 대부분이므로 스레드로 겹친다.
+    결과를 모두 모은 뒤 반환하지 않고 입력 순서대로 내보내므로, 호출자가 바로 파일에 쓰고
+    버리면 재생목록 전체가 메모리에 쌓이지 않는다. 실패한 영상의 결과는 None이다.
+    executor.map은 모든 영상을 한꺼번에 제출하므로, 앞 영상이 느리면 뒤 영상의 결과가
+    끝없이 쌓인다. 제출은 작업자 수의 두 배까지만 앞서가게 하고(제출 창), 맨 앞 작업이
+    끝날 때마다 내보낸 뒤 다음 영상을 제출한다.
+    """
+    if provider is None:
+        provider = get_provider()
+    rate_limiter = RateLimiter(rate_per_second)
+    workers = max(1, workers)
+    window = workers * 2
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        remaining = iter(video_ids)
+        try:
+            for video_id in remaining:
+                pending.append((video_id, executor.submit(
+                    fetch_transcript, video_id, languages, provider, rate_limiter, retries, cache
+                )))
+                if len(pending) >= window:
+                    head_id, future = pending.popleft()
+                    yield head_id, future.result()
+            while pending:
+                head_id, future = pending.popleft()
+                yield head_id, future.result()
+        finally:
+            # 왜: 호출자가 중간에 멈추면(예외, break) 아직 시작하지 않은 작업은 취소한다.
+            for _, future in pending:
+                future.cancel()
+
+
+def fetch_transcripts_batch(video_ids: list, languages: list = None, provider: TranscriptProvider = None,
+                            workers: int = DEFAULT_WORKERS, rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                            retries: int = DEFAULT_RETRIES, cache: TranscriptCache = None) -> tuple:
+    """
+    iter_transcripts_batch의 결과를 목록으로 모아 반환한다.
+
+    반환값: (성공 결과 목록 — 입력 순서 유지, 실패한 video_id 목록)
+    """
+    succeeded = []
+    failed = []
+    for video_id, result in iter_transcripts_batch(
+        video_ids, languages, provider, workers, rate_per_second, retries, cache
+    ):
+        if result is None:
+            failed.append(video_id)
         else:
-            print(f"❌ 트랜스크립트 추출 실패: {error_msg}")
+            succeeded.append(result)
+    return succeeded, failed
 
-        return None
 
+def _format_duration(seconds: int) -> str:
+    return f"{seconds // 60}분 {seconds % 60}초"
 
-def save_transcript(result: dict, week_number: int) -> Path:
+
+class TranscriptWriter:
     """
-    추출된 트랜스크립트를 주차별 디렉토리에 마크다운으로 저장한다.
-    왜: 마크다운 형식으로 저장하면 사람이 직접 읽기도 편하고,
-    다른 도구(NotebookLM 등)에 소스로 제공하기도 용이하다.
+    트랜스크립트를 세그먼트 단위로 흘려 쓰는 주차별 저장기.
+    왜: 전체 텍스트를 join으로 만들고 세그먼트를 들여쓰기 JSON으로 한 번에 덤프하면
+    긴 강연이나 재생목록은 같은 내용이 메모리에 여러 벌 생기고 파일도 커진다.
+    세그먼트가 들어오는 대로 transcript_segments.jsonl에 한 줄씩(공백 없는 JSON) 쓰고,
+    transcript.md 본문과 열 단위 바이너리(transcript_segments.bin)도 같은 순간 이어 쓴다.
+    총 길이/문자 수가 들어가는 머리말은 끝에서야 알 수 있으므로, 종료 시 머리말을 쓰고
+    본문 임시 파일을 스트림 복사한 뒤 rename한다. 메모리 사용량은 영상 하나 분량을 넘지 않는다.
+
+    사용법:
+      with TranscriptWriter(week_number, bundle=True) as writer:
+          writer.add(result)            # 영상 하나의 결과
+          writer.add_failure(video_id)  # 실패한 영상 기록
     """
-    week_dir = WEEKS_DIR / f"week-{week_number:02d}"
-    week_dir.mkdir(parents=True, exist_ok=True)
 
-    # --- 마크다운 파일 생성 ---
-    transcript_path = week_dir / "transcript.md"
+    def __init__(self, week_number: int, bundle: bool = False):
+        self.week_number = week_number
+        self.week_dir = WEEKS_DIR / f"week-{week_number:02d}"
+        self.transcript_path = self.week_dir / "transcript.md"
+        self.segments_path = self.week_dir / "transcript_segments.jsonl"
+        self.store_path = self.week_dir / "transcript_segments.bin"
+        self.bundle = bundle
+        self.videos = []
+        self.failed = []
+        self.duplicates = []
+        self._segments_tmp = None
+        self._body = None
 
-    duration_min = result["duration_seconds"] // 60
-    duration_sec = result["duration_seconds"] % 60
+    def __enter__(self):
+        self.week_dir.mkdir(parents=True, exist_ok=True)
+        # 왜: 중간에 실패하면 이전 주차 산출물을 그대로 남기기 위해 같은 디렉토리 임시 파일에 쓴다.
+        fd, self._segments_tmp = tempfile.mkstemp(
+            dir=str(self.week_dir), prefix=".transcript_segments.", suffix=".tmp"
+        )
+        self._segments_file = os.fdopen(fd, "w", encoding="utf-8")
+        self._body = tempfile.TemporaryFile("w+", encoding="utf-8")
+        # 왜: 타임스탬프 탐색용 바이너리 저장소는 JSONL과 같은 세그먼트 스트림에서 함께 만든다.
+        self._store = SegmentStoreWriter(self.store_path).__enter__()
+        return self
 
-    content = f"""# YouTube 트랜스크립트
+    def add(self, result: dict) -> None:
+        """영상 하나의 세그먼트를 JSONL과 마크다운 본문에 이어 쓴다."""
+        video_id = result["video_id"]
+        if self.bundle:
+            if self.videos:
+                self._body.write("\n---\n\n")
+            self._body.write(f"""## 영상 {len(self.videos) + 1}: {video_id}
 
-**Video ID**: {result['video_id']}
-**URL**: https://youtube.com/watch?v={result['video_id']}
+**URL**: https://youtube.com/watch?v={video_id}
 **언어**: {result['language']}
-**길이**: {duration_min}분 {duration_sec}초
+**길이**: {_format_duration(result['duration_seconds'])}
 **문자 수**: {result['character_count']:,}자
-**추출 시각**: {datetime.now(KST).strftime('%Y-%m-%d %H:%M KST')}
+
+""")
+        else:
+            self._body.write("## 전체 텍스트\n\n")
+
+        for i, segment in enumerate(result["segments"]):
+            self._segments_file.write(json.dumps(
+                {"video_id": video_id, **segment}, ensure_ascii=False, separators=(",", ":")
+            ) + "\n")
+            self._store.add(video_id, segment)
+            if i:
+                self._body.write(" ")
+            self._body.write(segment["text"])
+        self._body.write("\n")
+
+        # 왜: 세그먼트 목록은 쓰고 나면 필요 없으므로 머리말에 쓸 요약만 남긴다.
+        self.videos.append({
+            "video_id": video_id,
+            "language": result["language"],
+            "duration_seconds": result["duration_seconds"],
+            "character_count": result["character_count"],
+        })
+
+    def add_failure(self, video_id: str) -> None:
+        self.failed.append(video_id)
+
+    def add_duplicate(self, video_id: str, original: str, similarity: float, skipped: bool) -> None:
+        """중복 영상을 머리말에 기록한다. skipped가 False면 번들에는 그대로 포함된 영상이다."""
+        self.duplicates.append({
+            "video_id": video_id, "original": original, "similarity": similarity, "skipped": skipped,
+        })
+
+    def _header(self) -> str:
+        extracted_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M KST')
+        if not self.bundle:
+            video = self.videos[0]
+            return f"""# YouTube 트랜스크립트
+
+**Video ID**: {video['video_id']}
+**URL**: https://youtube.com/watch?v={video['video_id']}
+**언어**: {video['language']}
+**길이**: {_format_duration(video['duration_seconds'])}
+**문자 수**: {video['character_count']:,}자
+**추출 시각**: {extracted_at}
 
 ---
 
-## 전체 텍스트
+"""
+        failed_note = f"**추출 실패**: {', '.join(self.failed)}\n" if self.failed else ""
+        for label, skipped in (("중복 제외", True), ("중복 의심", False)):
+            entries = [
+                f"{item['video_id']} (≈ {item['original']}, 유사도 {item['similarity']:.2f})"
+                for item in self.duplicates if item["skipped"] == skipped
+            ]
+            if entries:
+                failed_note += f"**{label}**: {', '.join(entries)}\n"
+        total_seconds = sum(video["duration_seconds"] for video in self.videos)
+        total_characters = sum(video["character_count"] for video in self.videos)
+        return f"""# YouTube 트랜스크립트 번들
+
+**영상 수**: {len(self.videos)}개
+**총 길이**: {_format_duration(total_seconds)}
+**총 문자 수**: {total_characters:,}자
+**추출 시각**: {extracted_at}
+{failed_note}
+---
 
-{result['full_text']}
 """
 
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    def __exit__(self, exc_type, exc, tb):
+        self._segments_file.close()
+        try:
+            if exc_type is not None or not self.videos:
+                os.unlink(self._segments_tmp)
+                self._store.__exit__(RuntimeError, None, None)
+                return False
+
+            with atomic_writer(self.transcript_path) as f:
+                f.write(self._header())
+                self._body.seek(0)
+                shutil.copyfileobj(self._body, f)
+            os.replace(self._segments_tmp, self.segments_path)
+            self._store.__exit__(None, None, None)
+        finally:
+            self._body.close()
+
+        # 왜: 예전 형식 파일이 남아 있으면 어느 쪽이 최신인지 헷갈리므로 정리한다.
+        legacy_path = self.week_dir / "transcript_segments.json"
+        if legacy_path.exists():
+            legacy_path.unlink()
+
+        record_bytes_written(self.transcript_path)
+        record_bytes_written(self.segments_path)
+        record_bytes_written(self.store_path)
+
+        # 왜: 새 트랜스크립트를 바로 검색할 수 있도록 이 주차만 증분 색인한다.
+        # 색인 실패가 트랜스크립트 저장 결과를 바꾸면 안 되므로 경고만 남긴다.
+        try:
+            import transcript_search
+
+            summary = transcript_search.index_week(self.week_number)
+            print(f"🔎 검색 색인 갱신: 영상 {summary['updated']}개 "
+                  f"(변경 없음 {summary['unchanged']}개, 삭제 {summary['removed']}개)")
+        except Exception as e:
+            print(f"⚠️  검색 색인 갱신 실패: {e}")
+
+        # 왜: 질의 단계가 관련 구간만 보낼 수 있도록 토큰 예산 청크도 함께 만든다.
+        # 트랜스크립트가 바뀌지 않은 영상은 해시 캐시를 그대로 쓴다.
+        try:
+            import transcript_chunker
+
+            summary = transcript_chunker.chunk_week(self.week_number)
+            print(f"✂️  청크 {summary['chunks']}개 생성 (캐시 사용 영상 {summary['cached']}개)")
+        except Exception as e:
+            print(f"⚠️  청크 생성 실패: {e}")
+        return False
+
+
+def find_segment_at(week_number: int, seconds: float, video_id: str = None) -> dict:
+    """
+    주차 트랜스크립트에서 주어진 시각의 세그먼트를 찾는다.
+    왜: transcript_segments.bin을 mmap으로 열어 이진 탐색하므로 세그먼트 수와 무관하게 빠르다.
+    바이너리 저장소가 없는 예전 주차는 iter_segments로 순차 탐색한다.
+    """
+    store_path = WEEKS_DIR / f"week-{week_number:02d}" / "transcript_segments.bin"
+    if store_path.exists():
+        with SegmentStore(store_path) as store:
+            return store.segment_at(seconds, video_id)
+
+    found = None
+    for segment in iter_segments(week_number):
+        if video_id is not None and segment.get("video_id", video_id) != video_id:
+            continue
+        if video_id is None:
+            video_id = segment.get("video_id")
+        if segment["start"] > seconds:
+            break
+        found = segment
+    return found
+
+
+def iter_segments(week_number: int):
+    """
+    주차의 트랜스크립트 세그먼트를 하나씩 읽는 제너레이터.
+    왜: JSONL을 한 줄씩 읽으므로 여러 시간짜리 강연도 전체를 파싱하지 않고 처리할 수 있다.
+    이전 형식(transcript_segments.json 배열)만 있는 주차도 같은 방식으로 읽는다.
+    """
+    week_dir = WEEKS_DIR / f"week-{week_number:02d}"
+    segments_path = week_dir / "transcript_segments.jsonl"
+    if segments_path.exists():
+        with open(segments_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    legacy_path = week_dir / "transcript_segments.json"
+    if legacy_path.exists():
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
 
-    # --- 원본 세그먼트 JSON 저장 (타임스탬프 포함) ---
-    # 왜: 마크다운은 가독성용, JSON은 프로그래밍 활용용으로 분리 저장
-    segments_path = week_dir / "transcript_segments.json"
-    with open(segments_path, "w", encoding="utf-8") as f:
-        json.dump(result["segments"], f, ensure_ascii=False, indent=2)
+
+def save_transcript(result: dict, week_number: int) -> Path:
+    """
+    추출된 트랜스크립트를 주차별 디렉토리에 마크다운으로 저장한다.
+    왜: 마크다운 형식으로 저장하면 사람이 직접 읽기도 편하고,
+    다른 도구(NotebookLM 등)에 소스로 제공하기도 용이하다.
+    타임스탬프가 필요한 프로그래밍 활용은 transcript_segments.jsonl을 쓴다.
+    """
+    with TranscriptWriter(week_number) as writer:
+        writer.add(result)
 
     print(f"💾 트랜스크립트 저장 완료:")
-    print(f"   마크다운: {transcript_path}")
-    print(f"   세그먼트: {segments_path}")
+    print(f"   마크다운: {writer.transcript_path}")
+    print(f"   세그먼트: {writer.segments_path}")
 
-    return transcript_path
+    return writer.transcript_path
+
+
+def save_transcript_bundle(results: list, failed: list, week_number: int) -> Path:
+    """
+    배치로 추출한 여러 영상의 트랜스크립트를 주차 단위 번들 하나로 저장한다.
+    왜: 하류 단계(NotebookLM 분석, 아이디어 생성)는 주차별 transcript.md 하나를 읽으므로,
+    영상별 파일을 흩어 놓지 않고 같은 경로에 영상별 섹션으로 합친다.
+    transcript_segments.jsonl의 각 세그먼트에는 어느 영상인지 알 수 있도록 video_id를 붙인다.
+    """
+    with TranscriptWriter(week_number, bundle=True) as writer:
+        for result in results:
+            writer.add(result)
+        for video_id in failed:
+            writer.add_failure(video_id)
+
+    print(f"💾 트랜스크립트 번들 저장 완료 (영상 {len(writer.videos)}개):")
+    print(f"   마크다운: {writer.transcript_path}")
+    print(f"   세그먼트: {writer.segments_path}")
+
+    return writer.transcript_path
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="유튜브 트랜스크립트 추출 스크립트"
     )
-    parser.add_argument(
-        "--url", required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--cache-stats", action="store_true",
+        help="트랜스크립트 캐시 통계만 출력"
+    )
+    source.add_argument(
+        "--url",
         help="유튜브 영상 URL 또는 Video ID"
     )
+    source.add_argument(
+        "--at", type=float,
+        help="저장된 주차 트랜스크립트에서 해당 시각(초)의 세그먼트를 출력"
+    )
+    source.add_argument(
+        "--all", action="store_true",
+        help=".env의 YOUTUBE_URLS와 state.json의 youtube_urls를 모두 배치 추출"
+    )
+    source.add_argument(
+        "--urls", nargs="+",
+        help="지정한 URL 목록만 배치 추출 (backfill이 주차에 기록된 URL을 넘길 때)"
+    )
     parser.add_argument(
-        "--week", type=int, required=True,
+        "--week", type=int,
         help="저장할 주차 번호 (1-23)"
     )
     parser.add_argument(
-        "--lang", nargs="+", default=["ko", "en"],
+        "--lang", nargs="+", default=DEFAULT_LANGUAGES,
         help="트랜스크립트 언어 우선순위 (기본: ko en)"
     )
     parser.add_argument(
         "--dry-run", action="store_true",
         help="실제 API 호출 없이 URL 파싱만 테스트"
     )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"배치 모드 동시 추출 수 (기본: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE_PER_SECOND,
+        help=f"초당 최대 호출 수, 0이면 제한 없음 (기본: {DEFAULT_RATE_PER_SECOND})"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=DEFAULT_RETRIES,
+        help=f"영상별 최대 시도 횟수 (기본: {DEFAULT_RETRIES})"
+    )
+    parser.add_argument(
+        "--provider", choices=["youtube", "local"],
+        default=os.environ.get("TRANSCRIPT_PROVIDER", "youtube"),
+        help="트랜스크립트 제공자 (local: --local-dir의 <video_id>.json을 읽음)"
+    )
+    parser.add_argument(
+        "--local-dir", type=Path,
+        default=Path(os.environ.get("TRANSCRIPT_LOCAL_DIR") or DEFAULT_LOCAL_DIR),
+        help="local 제공자가 읽을 디렉토리"
+    )
+    parser.add_argument(
+        "--video", type=str, default=None,
+        help="--at 탐색 대상 Video ID (생략 시 첫 번째 영상)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="트랜스크립트 캐시를 읽거나 쓰지 않음"
+    )
+    parser.add_argument(
+        "--dedup", choices=["skip", "flag", "off"],
+        default=os.environ.get("TRANSCRIPT_DEDUP", "skip"),
+        help="이미 수집한 영상과 거의 같은 영상 처리 (skip: 번들에서 제외, flag: 포함하고 표시, 기본: skip)"
+    )
+    parser.add_argument(
+        "--dedup-threshold", type=float, default=DEFAULT_DEDUP_THRESHOLD,
+        help=f"중복으로 볼 추정 자카드 유사도 (기본: {DEFAULT_DEDUP_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB,
+        help=f"캐시 크기 상한 MB, 넘으면 오래 안 쓴 영상부터 제거 (기본: {DEFAULT_CACHE_MAX_MB:.0f})"
+    )
 
     args = parser.parse_args()
 
+    if args.cache_stats:
+        TranscriptCache(max_mb=args.cache_max_mb).print_stats()
+        return
+    if args.week is None:
+        parser.error("--week가 필요합니다.")
+
+    if args.at is not None:
+        segment = find_segment_at(args.week, args.at, args.video)
+        if segment is None:
+            print(f"❌ Week {args.week}에서 {args.at}초의 세그먼트를 찾을 수 없습니다.")
+            sys.exit(1)
+        print(f"⏱️  [{segment.get('video_id', '-')}] {segment['start']:.2f}s "
+              f"(+{segment.get('duration', 0):.2f}s): {segment['text']}")
+        return
+
+    cache = None if args.no_cache else TranscriptCache(max_mb=args.cache_max_mb)
+    dedup = None if args.dedup == "off" else TranscriptDedupIndex(threshold=args.dedup_threshold)
+
     # Step 1: URL 파싱
-    video_id = extract_video_id(args.url)
-    if not video_id:
-        print(f"❌ 유효하지 않은 YouTube URL: {args.url}")
-        print("   지원 형식: https://youtube.com/watch?v=ID, https://youtu.be/ID")
+    if args.urls:
+        urls = load_youtube_urls(args.urls, env_value="")
+    else:
+        urls = load_youtube_urls() if args.all else [args.url]
+    if not urls:
+        print("❌ 추출할 URL이 없습니다. .env의 YOUTUBE_URLS 또는 state.json의 youtube_urls를 설정하세요.")
         sys.exit(1)
 
-    print(f"📹 Video ID: {video_id}")
+    video_ids = []
+    for url in urls:
+        video_id = extract_video_id(url)
+        if not video_id:
+            print(f"❌ 유효하지 않은 YouTube URL: {url}")
+            print("   지원 형식: https://youtube.com/watch?v=ID, https://youtu.be/ID")
+            sys.exit(1)
+        video_ids.append(video_id)
+
+    print(f"📹 Video ID: {', '.join(video_ids)}")
 
     if args.dry_run:
         print(f"🧪 Dry run 모드 — API 호출을 건너뜁니다.")
@@ -225,18 +1200,89 @@ def main():
         print(f"   언어: {args.lang}")
         sys.exit(0)
 
-    # Step 2: 트랜스크립트 추출
-    print(f"\n🔄 트랜스크립트 추출 중...")
-    result = fetch_transcript(video_id, args.lang)
+    if args.all or args.urls:
+        with StepMetrics("transcript_extracted", args.week):
+            provider = get_provider(args.provider, args.local_dir)
+            print(f"\n🔄 트랜스크립트 {len(video_ids)}개 배치 추출 중... "
+                  f"(동시 {args.workers}개, 초당 {args.rate}회, 최대 {args.retries}회 시도)")
+            # 왜: 영상 하나가 끝날 때마다 바로 번들에 쓰고 결과를 버린다.
+            with TranscriptWriter(args.week, bundle=True) as writer:
+                fetch_ids = video_ids
+                if dedup is not None and args.dedup == "skip":
+                    # 왜: 이전 실행에서 중복으로 판정된 영상은 트랜스크립트를 다시 받지 않는다.
+                    fetch_ids = []
+                    for video_id in video_ids:
+                        known = dedup.known_duplicate(video_id)
+                        if known is None:
+                            fetch_ids.append(video_id)
+                        else:
+                            print(f"♻️  중복 영상 건너뜀: {video_id} ≈ {known['duplicate_of']} "
+                                  f"(유사도 {known['similarity']:.2f}, 이전 판정)")
+                            writer.add_duplicate(video_id, known["duplicate_of"], known["similarity"], True)
 
-    if result is None:
-        sys.exit(1)
+                for video_id, result in iter_transcripts_batch(
+                    fetch_ids, args.lang, provider, args.workers, args.rate, args.retries, cache
+                ):
+                    if result is None:
+                        writer.add_failure(video_id)
+                        continue
+                    # 왜: 결과가 입력 순서대로 오므로 같은 배치 안의 재업로드도 앞 영상과 비교된다.
+                    match = dedup.check_and_add(result, args.week) if dedup is not None else None
+                    if match is not None:
+                        skipped = args.dedup == "skip"
+                        print(f"♻️  중복 영상{' 건너뜀' if skipped else ' 의심'}: {video_id} ≈ {match[0]} "
+                              f"(유사도 {match[1]:.2f})")
+                        writer.add_duplicate(video_id, match[0], match[1], skipped)
+                        if skipped:
+                            continue
+                    writer.add(result)
+            if cache is not None:
+                cache.flush()
+                cache.print_stats()
+            if dedup is not None:
+                dedup.save()
+
+            if not writer.videos:
+                if writer.duplicates and not writer.failed:
+                    print("❌ 모든 영상이 이미 수집한 영상의 중복입니다. (--dedup off로 강제 수집)")
+                else:
+                    print("❌ 모든 영상의 트랜스크립트 추출에 실패했습니다.")
+                sys.exit(1)
+            if writer.duplicates:
+                print(f"♻️  중복 영상 {len(writer.duplicates)}개 (--dedup {args.dedup})")
+            if writer.failed:
+                print(f"⚠️  추출 실패 {len(writer.failed)}개: {', '.join(writer.failed)}")
+
+            print(f"💾 트랜스크립트 번들 저장 완료 (영상 {len(writer.videos)}개):")
+            print(f"   마크다운: {writer.transcript_path}")
+            print(f"   세그먼트: {writer.segments_path}")
+            print(f"\n🎉 Week {args.week} 트랜스크립트 번들 준비 완료! ({len(writer.videos)}/{len(video_ids)}개)")
+        return
+
+    with StepMetrics("transcript_extracted", args.week):
+        # Step 2: 트랜스크립트 추출
+        print(f"\n🔄 트랜스크립트 추출 중...")
+        provider = get_provider(args.provider, args.local_dir)
+        result = fetch_transcript(video_ids[0], args.lang, provider, retries=args.retries, cache=cache)
+        if cache is not None:
+            cache.flush()
+            cache.print_stats()
+
+        if result is None:
+            sys.exit(1)
+
+        print(f"✅ 추출 완료: {result['character_count']:,}자")
 
-    print(f"✅ 추출 완료: {result['character_count']:,}자")
+        # 왜: 단일 영상 모드는 주차의 유일한 소스이므로 건너뛰지 않고 경고만 한다.
+        if dedup is not None:
+            match = dedup.check_and_add(result, args.week)
+            dedup.save()
+            if match is not None:
+                print(f"⚠️  이미 수집한 영상과 거의 같습니다: {match[0]} (유사도 {match[1]:.2f})")
 
-    # Step 3: 파일 저장
-    save_transcript(result, args.week)
-    print(f"\n🎉 Week {args.week} 트랜스크립트 준비 완료!")
+        # Step 3: 파일 저장
+        save_transcript(result, args.week)
+        print(f"\n🎉 Week {args.week} 트랜스크립트 준비 완료!")
 
 
 if __name__ == "__main__":
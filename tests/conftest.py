@@ -0,0 +1,12 @@
+"""
+pytest 공통 설정.
+왜: execution 스크립트는 패키지가 아니라 `python execution/<script>.py`로 실행되며
+서로를 최상위 모듈로 import하므로, 테스트에서도 같은 방식으로 import할 수 있게 경로를 추가한다.
+"""
+
+import sys
+from pathlib import Path
+
+EXECUTION_DIR = Path(__file__).resolve().parent.parent / "execution"
+if str(EXECUTION_DIR) not in sys.path:
+    sys.path.insert(0, str(EXECUTION_DIR))
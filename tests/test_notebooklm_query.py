@@ -0,0 +1,205 @@
+"""
+notebooklm_query 배치 경로 테스트.
+매니페스트 병합, 응답 누락/할당량 대기 주차의 저장 처리, 응답 파일 재작성 왕복을
+echo_answerer를 NotebookLM 대신 써서 확인하고, 할당량 스케줄러는 가짜 시계로 확인한다.
+"""
+
+import contextlib
+import json
+
+import pytest
+
+import notebooklm_query
+from notebooklm_query import (
+    AnswerCache,
+    QuotaScheduler,
+    answer_manifest_locally,
+    cached_answer_entries,
+    ingest_answers,
+    load_answers,
+    merge_manifests,
+    rewrite_answers,
+)
+
+
+@pytest.fixture
+def weeks_dir(tmp_path, monkeypatch):
+    weeks = tmp_path / "weeks"
+    monkeypatch.setattr(notebooklm_query, "WEEKS_DIR", weeks)
+    # 왜: 단계 계측은 실제 워크스페이스의 meta.json에 기록하므로 테스트에서는 끈다.
+    monkeypatch.setattr(notebooklm_query, "StepMetrics", lambda *args: contextlib.nullcontext())
+    return weeks
+
+
+def make_manifest(weeks: dict, statuses: dict = None) -> dict:
+    """{주차: 질문 수}로 매니페스트를 만든다. statuses로 질문 ID별 status를 바꾼다."""
+    statuses = statuses or {}
+    manifest = {
+        "version": notebooklm_query.MANIFEST_VERSION,
+        "notebook_url": "https://notebooklm.example/nb",
+        "weeks": {},
+        "questions": [],
+    }
+    for week, count in weeks.items():
+        manifest["weeks"][str(week)] = f"Chapter {week}"
+        for i in range(1, count + 1):
+            question_id = f"w{week:02d}-q{i}"
+            manifest["questions"].append({
+                "id": question_id,
+                "week": week,
+                "question": f"Week {week} question {i}?",
+                "status": statuses.get(question_id, "dispatched"),
+            })
+    return manifest
+
+
+def test_merge_keeps_pending_weeks_and_replaces_rebuilt_ones():
+    existing = make_manifest({1: 2, 2: 2}, statuses={"w01-q2": "queued"})
+    existing["questions"][2]["question"] = "old week 2 question"
+    new = make_manifest({2: 3, 3: 1})
+
+    merged = merge_manifests(existing, new)
+
+    assert set(merged["weeks"]) == {"1", "2", "3"}
+    assert [item["id"] for item in merged["questions"]] == [
+        "w01-q1", "w01-q2", "w02-q1", "w02-q2", "w02-q3", "w03-q1",
+    ]
+    # 왜: 다시 만든 주차의 예전 질문은 남지 않고, 남은 주차의 대기 상태는 유지된다.
+    assert "old week 2 question" not in [item["question"] for item in merged["questions"]]
+    assert merged["questions"][1]["status"] == "queued"
+
+
+def test_ingest_saves_complete_weeks_and_defers_queued_or_unanswered(weeks_dir, tmp_path):
+    manifest = make_manifest({1: 2, 2: 2, 3: 1, 4: 2}, statuses={"w02-q2": "queued"})
+    answers = {
+        "w01-q1": {"id": "w01-q1", "answer": "a1", "method": "mcp"},
+        "w01-q2": {"id": "w01-q2", "answer": "a2", "method": "mcp"},
+        "w02-q1": {"id": "w02-q1", "answer": "b1", "method": "mcp"},
+        "w04-q1": {"id": "w04-q1", "answer": "d1", "method": "local:echo"},
+        "w99-q1": {"id": "w99-q1", "answer": "stray"},
+    }
+    cache = AnswerCache(tmp_path / "answers-cache.json")
+
+    saved = ingest_answers(manifest, answers, cache)
+
+    # 1주차: 모두 응답 / 2주차: 할당량 대기 질문이 남아 미룸 / 3주차: 응답 없음 / 4주차: 누락 포함 저장
+    assert saved == [1, 4]
+    assert set(manifest["weeks"]) == {"2", "3"}
+    assert {item["week"] for item in manifest["questions"]} == {2, 3}
+
+    week4 = json.loads((weeks_dir / "week-04" / "chapter-analysis.json").read_text(encoding="utf-8"))
+    assert [(result["method"], result["answer"]) for result in week4["results"]] == [
+        ("local:echo", "d1"), ("missing", "(응답 없음)"),
+    ]
+    assert not (weeks_dir / "week-02").exists()
+
+    # 왜: 실제 응답(mcp)만 캐시에 들어가고, 로컬 대체/누락 응답은 들어가지 않는다.
+    reloaded = AnswerCache(tmp_path / "answers-cache.json")
+    assert reloaded.get(manifest["notebook_url"], "Week 1 question 1?")["answer"] == "a1"
+    assert reloaded.get(manifest["notebook_url"], "Week 4 question 1?") is None
+
+
+def test_rewrite_answers_round_trip(tmp_path):
+    manifest = make_manifest({1: 2, 2: 2})
+    manifest["questions"][3]["cached_answer"] = "from cache"
+    answers_path = tmp_path / "answers.jsonl"
+
+    assert answer_manifest_locally(manifest, answers_path, answerer="echo") == 4
+    answers = load_answers(answers_path)
+    assert answers["w01-q1"]["method"] == "local:echo"
+    assert answers["w01-q1"]["answer"].endswith("Week 1 question 1?")
+    assert answers["w02-q2"] == {"id": "w02-q2", "answer": "from cache", "method": "cache"}
+
+    with open(answers_path, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+    week2 = [item for item in manifest["questions"] if item["week"] == 2]
+    added = rewrite_answers(answers_path, {"w01-q1", "w01-q2"}, cached_answer_entries(week2))
+
+    assert added == 1
+    rewritten = load_answers(answers_path)
+    assert rewritten == {
+        "w01-q1": answers["w01-q1"],
+        "w01-q2": answers["w01-q2"],
+        "w02-q2": {"id": "w02-q2", "answer": "from cache", "method": "cache"},
+    }
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_answer_cache_save_merges_with_other_writers(tmp_path):
+    path = tmp_path / "answers-cache.json"
+    url = "https://notebooklm.example/nb"
+    first = AnswerCache(path)
+    second = AnswerCache(path)
+
+    first.put(url, "Q1?", "a1")
+    first.save()
+    # 왜: second는 Q1이 저장되기 전에 읽었지만, 저장할 때 Q1을 지우면 안 된다.
+    second.put(url, "Q2?", "a2")
+    assert second.get(url, "Q3?") is None
+    second.save()
+
+    merged = AnswerCache(path)
+    assert merged.get(url, "Q1?")["answer"] == "a1"
+    assert merged.get(url, "Q2?")["answer"] == "a2"
+    assert merged.data["stats"]["misses"] == 1
+
+    # 왜: 노트북 전체 무효화는 다른 프로세스가 그사이 추가한 항목까지 지운다.
+    third = AnswerCache(path)
+    first.put(url, "Q4?", "a4")
+    first.save()
+    assert third.invalidate(url) == 2
+    third.save()
+    assert AnswerCache(path).data["entries"] == {}
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_quota_scheduler_caps_burst_plus_refill_within_window(tmp_path):
+    clock = FakeClock()
+    scheduler = QuotaScheduler(tmp_path / "quota.json", limit=50, clock=clock)
+
+    assert scheduler.acquire(1000) == 50
+    # 왜: 24시간 가까이 지나 버킷은 거의 다시 찼지만, 최근 24시간에 이미 50회를 썼다.
+    clock.now += 23 * 3600 + 59 * 60
+    assert scheduler.acquire(1000) == 0
+    assert scheduler.available() == 0
+    assert scheduler.seconds_until(1) == pytest.approx(60)
+
+    clock.now += 120
+    assert scheduler.acquire(1000) == 50
+
+
+def test_quota_scheduler_window_releases_oldest_grants_first(tmp_path):
+    clock = FakeClock()
+    scheduler = QuotaScheduler(tmp_path / "quota.json", limit=48, clock=clock)
+
+    assert scheduler.acquire(24) == 24
+    clock.now += 12 * 3600
+    # 왜: 버킷은 가득 찼지만 24시간 창에는 24회만 남았고, 다른 인스턴스도 같은 파일 상태를 본다.
+    other = QuotaScheduler(tmp_path / "quota.json", limit=48, clock=clock)
+    assert other.acquire(1000) == 24
+    assert other.seconds_until(1) == pytest.approx(12 * 3600)
+
+    # 첫 허용 기록이 창 밖으로 나가면 그만큼 다시 쓸 수 있다 (버킷도 12시간분 24회가 찼다).
+    clock.now += 12 * 3600 + 1
+    assert scheduler.acquire(1000) == 24
+
+
+def test_quota_acquire_keys_charges_each_question_once_per_window(tmp_path):
+    clock = FakeClock()
+    scheduler = QuotaScheduler(tmp_path / "quota.json", limit=3, clock=clock)
+
+    assert scheduler.acquire_keys(["w01:a", "w01:b"]) == {"w01:a", "w01:b"}
+    # 왜: 같은 주차를 다시 실행해도 이미 허용한 질문은 다시 차감하지 않는다.
+    assert scheduler.acquire_keys(["w01:a", "w01:b", "w01:c", "w01:d"]) == {"w01:a", "w01:b", "w01:c"}
+    assert scheduler.available() == 0
+
+    clock.now += 24 * 3600 + 1
+    assert scheduler.acquire_keys(["w01:a"]) == {"w01:a"}
+    assert scheduler.available() == 2
@@ -0,0 +1,79 @@
+"""
+segment_store 열 단위 저장소 테스트.
+저장기로 쓴 파일을 mmap 저장소로 다시 열어 세그먼트 텍스트/오프셋 배치와
+영상별 시각 탐색(segment_at)을 확인한다.
+"""
+
+import pytest
+
+from segment_store import HEADER, VIDEO_ENTRY, SegmentStore, SegmentStoreWriter
+
+SEGMENTS = {
+    "aaa": [
+        {"text": "hello", "start": 0.0, "duration": 2.0},
+        {"text": "안녕하세요", "start": 2.0, "duration": 3.0},
+        {"text": "", "start": 6.0, "duration": 1.0},
+    ],
+    "bbbbbbbbbbbbbbbb": [
+        {"text": "second video", "start": 0.0, "duration": 4.0},
+        {"text": "끝", "start": 4.0},
+    ],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "transcript_segments.bin"
+    with SegmentStoreWriter(path) as writer:
+        for video_id, segments in SEGMENTS.items():
+            for segment in segments:
+                writer.add(video_id, segment)
+    with SegmentStore(path) as opened:
+        yield opened
+
+
+def test_segments_round_trip_with_text_offsets(store):
+    flat = [(video_id, segment) for video_id, segments in SEGMENTS.items() for segment in segments]
+    assert len(store) == len(flat)
+    assert store.videos == {"aaa": (0, 3), "bbbbbbbbbbbbbbbb": (3, 2)}
+
+    for i, (video_id, segment) in enumerate(flat):
+        assert store.segment(i) == {
+            "video_id": video_id,
+            "text": segment["text"],
+            "start": segment["start"],
+            "duration": segment.get("duration", 0),
+        }
+
+    # 왜: 오프셋은 UTF-8 바이트 기준 누적값이다 (빈 텍스트는 길이 0 구간).
+    lengths = [len(segment["text"].encode("utf-8")) for _, segment in flat]
+    assert [store.offsets[i] for i in range(len(flat) + 1)] == [sum(lengths[:i]) for i in range(len(flat) + 1)]
+    assert store.text_offset == (HEADER.size + 2 * VIDEO_ENTRY.size + len(flat) * 16 + (len(flat) + 1) * 8)
+    assert store.path.stat().st_size == store.text_offset + sum(lengths)
+
+
+def test_segment_at_searches_within_one_video(store):
+    assert store.segment_at(1.0)["text"] == "hello"
+    assert store.segment_at(2.0)["text"] == "안녕하세요"
+    # 왜: 세그먼트 사이 빈 구간(5~6초)에서는 직전 자막을 돌려준다.
+    assert store.segment_at(5.5)["text"] == "안녕하세요"
+    assert store.segment_at(100.0)["text"] == ""
+
+    # 두 번째 영상도 0초부터 시작하므로 영상 범위 안에서만 찾아야 한다.
+    assert store.segment_at(1.0, video_id="bbbbbbbbbbbbbbbb")["text"] == "second video"
+    assert store.segment_at(4.5, video_id="bbbbbbbbbbbbbbbb")["text"] == "끝"
+    assert store.segment_at(-1.0, video_id="bbbbbbbbbbbbbbbb") is None
+    assert store.segment_at(1.0, video_id="missing") is None
+
+
+def test_writer_rejects_long_video_id_and_reader_rejects_other_files(tmp_path):
+    with pytest.raises(ValueError):
+        with SegmentStoreWriter(tmp_path / "segments.bin") as writer:
+            writer.add("x" * 17, {"text": "t", "start": 0.0})
+    # 왜: 저장 중 예외가 나면 반쯤 쓰인 파일을 남기지 않는다.
+    assert not (tmp_path / "segments.bin").exists()
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\0" * HEADER.size)
+    with pytest.raises(ValueError):
+        SegmentStore(other)
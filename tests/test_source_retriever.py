@@ -0,0 +1,71 @@
+"""
+source_retriever 로컬 BM25 검색 테스트.
+작은 요약 파일로 챕터 범위 해석, 질문에 언급된 챕터로의 후보 제한,
+일치 단어가 없을 때의 챕터 앞쪽 구절 대체, 소스 변경 시 색인 재생성을 확인한다.
+"""
+
+import pytest
+
+from source_retriever import SourceRetriever
+
+SUMMARY = """# This Is Marketing
+
+## Overview
+Smallest viable market appears here but outside any chapter.
+
+## Chapter 3: The Smallest Viable Market
+### Core Thesis
+Find the smallest viable market you can serve.
+### Example
+A bakery serving one neighbourhood.
+
+## Chapter 4: In Search of Better
+### Core Thesis
+Better is defined by the customer.
+
+## Chapter 6: Beyond Commodity
+### Core Thesis
+The smallest viable market again, for commodity sellers.
+"""
+
+
+@pytest.fixture
+def retriever(tmp_path):
+    source = tmp_path / "summary.md"
+    source.write_text(SUMMARY, encoding="utf-8")
+    return SourceRetriever(source, tmp_path / "source-index.json")
+
+
+def test_chapters_in_parses_ranges_and_lists():
+    assert SourceRetriever.chapters_in("Chapter 3~5 핵심 원칙") == {3, 4, 5}
+    assert SourceRetriever.chapters_in("chapter 8-6") == {6, 7, 8}
+    assert SourceRetriever.chapters_in("Chapter 2 & 9, Chapter 4") == {2, 4, 9}
+    assert SourceRetriever.chapters_in("챕터 번호 없음") == set()
+
+
+def test_search_limits_candidates_to_mentioned_chapters(retriever):
+    everywhere = retriever.search("smallest viable market", limit=10)
+    # 왜: "## Overview" 같은 챕터 밖 섹션은 구절로 만들지 않는다.
+    assert {passage["chapter"] for passage in everywhere} == {3, 6}
+
+    limited = retriever.search("Chapter 3~5 smallest viable market", limit=10)
+    assert {passage["chapter"] for passage in limited} == {3}
+    assert limited[0]["section"] == "Core Thesis"
+    assert retriever.search("smallest viable market", limit=10, chapters={6})[0]["chapter"] == 6
+
+
+def test_search_falls_back_to_chapter_opening_without_matches(retriever):
+    passages = retriever.search("Chapter 4 zzz", limit=1)
+    assert [(p["chapter"], p["section"], p["score"]) for p in passages] == [(4, "Core Thesis", 0.0)]
+    # 챕터를 지정하지 않은 질문은 대체 구절 없이 빈 결과다.
+    assert retriever.search("zzz") == []
+    assert retriever.answer("zzz") == "(로컬 소스에서 관련 구절을 찾지 못했습니다)"
+
+
+def test_index_rebuilds_when_source_changes(retriever):
+    assert retriever.search("bakery")
+    retriever.source_path.write_text(SUMMARY.replace("bakery", "florist"), encoding="utf-8")
+
+    reloaded = SourceRetriever(retriever.source_path, retriever.index_path)
+    assert reloaded.search("bakery") == []
+    assert reloaded.search("florist")[0]["line"] == 10
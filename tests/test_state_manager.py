@@ -0,0 +1,123 @@
+"""
+state_manager 상태 저장소 테스트.
+JSON/SQLite 저장소 왕복과 export-json 레이아웃, 저널 재생을 통한 크래시 복구,
+run-week --reuse의 지문 비교를 임시 데이터 디렉토리에서 확인한다.
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+import state_manager
+import trend_researcher
+from state_manager import JsonStateBackend, SqliteStateBackend
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    monkeypatch.setattr(state_manager, "DATA_DIR", data)
+    monkeypatch.setattr(state_manager, "WORKSPACES_DIR", data / "workspaces")
+    # 왜: 워크스페이스와 저장소 인스턴스는 프로세스 안에서 캐시되므로 테스트마다 새로 만든다.
+    monkeypatch.setattr(state_manager, "_workspaces", {})
+    monkeypatch.setenv("STATE_BACKEND", "json")
+    return data
+
+
+def started_week(step_names=()) -> dict:
+    """1주차를 시작하고 주어진 단계를 완료 표시한 상태를 반환한다."""
+    state = state_manager.init_week(state_manager.load_state())
+    for step_name in step_names:
+        state = state_manager.complete_step(state, step_name, 1)
+    return state
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_json_sqlite_round_trip_and_export_layout(data_dir):
+    started_week(["transcript_extracted"])
+    backend = JsonStateBackend()
+    week_meta = backend.load_week_meta(1)
+    # 왜: 고정 컬럼에 없는 meta 키도 SQLite를 거쳐 그대로 돌아와야 한다.
+    week_meta["youtube_urls"] = ["https://youtu.be/aaaaaaaaaaa"]
+    backend.save_week_meta(1, week_meta)
+
+    state_path = data_dir / "state.json"
+    meta_path = data_dir / "weeks" / "week-01" / "meta.json"
+    original_state = read_json(state_path)
+    original_meta = read_json(meta_path)
+
+    state_manager.migrate_json_to_sqlite()
+    sqlite = SqliteStateBackend()
+    assert sqlite.load_state() == original_state
+    assert sqlite.load_week_meta(1) == original_meta
+    assert sqlite.week_numbers() == [1]
+
+    state_path.unlink()
+    meta_path.unlink()
+    state_manager.export_json()
+    assert read_json(state_path) == original_state
+    assert read_json(meta_path) == original_meta
+
+
+def test_journal_replay_recovers_step_after_crash(data_dir):
+    started_week(["transcript_extracted"])
+    # 왜: 저널에 쓴 직후 meta.json을 갱신하기 전에 프로세스가 죽은 상황을 만든다.
+    state_manager.append_step_journal(1, "notebooklm_analyzed")
+    journal = data_dir / "step-journal.jsonl"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"week": 1, "step": "trends_res')
+
+    backend = JsonStateBackend()
+    assert backend.load_week_meta(1)["completed_steps"] == ["transcript_extracted"]
+
+    # 상태를 읽으면 저널을 재생한다. 잘린 마지막 줄은 fsync 전이므로 완료로 보지 않는다.
+    assert backend.load_state() is not None
+    assert backend.load_week_meta(1)["completed_steps"] == ["transcript_extracted", "notebooklm_analyzed"]
+    assert not journal.exists()
+
+
+def fake_step_commands(content: str):
+    """실제 스크립트 대신 단계 산출물 파일에 content를 쓰는 build_step_command."""
+    def build_step_command(step_name, state, week_number=None):
+        week_dir = state_manager.get_week_dir(week_number or state["current_week"])
+        paths = [str(week_dir / artifact) for artifact in state_manager.STEP_ARTIFACTS[step_name]]
+        script = "import sys\nfor path in sys.argv[2:]:\n    open(path, 'w').write(sys.argv[1])\n"
+        return [sys.executable, "-c", script, content] + paths
+    return build_step_command
+
+
+def test_reuse_skips_unchanged_steps_and_reruns_changed_ones(data_dir, monkeypatch):
+    monkeypatch.setattr(state_manager, "build_step_command", fake_step_commands("v1"))
+    state = started_week()
+
+    first = asyncio.run(state_manager.run_week_pipeline(state, reuse=True))
+    assert set(first.values()) == {"completed"}
+
+    second = asyncio.run(state_manager.run_week_pipeline(state_manager.load_state(), reuse=True))
+    assert set(second.values()) == {"reused"}
+
+    # 왜: 입력(토픽 목록)이 바뀐 단계만 다시 실행한다. 산출물이 같으면 하위 단계는 재사용된다.
+    monkeypatch.setattr(trend_researcher, "DEFAULT_TOPICS", ["다른 토픽"])
+    third = asyncio.run(state_manager.run_week_pipeline(state_manager.load_state(), reuse=True))
+    assert third.pop("trends_researched") == "completed"
+    assert set(third.values()) == {"reused"}
+
+    # 산출물이 손으로 바뀐 단계는 입력이 같아도 다시 실행한다.
+    (state_manager.get_week_dir(1) / "ideas.json").write_text("edited", encoding="utf-8")
+    fourth = asyncio.run(state_manager.run_week_pipeline(state_manager.load_state(), reuse=True))
+    assert fourth.pop("ideas_generated") == "completed"
+    assert set(fourth.values()) == {"reused"}
+
+    # 상위 산출물이 바뀌면 하위 단계의 입력 해시도 바뀌어 함께 다시 실행된다.
+    (state_manager.get_week_dir(1) / "wysh-context.json").unlink()
+    monkeypatch.setattr(state_manager, "build_step_command", fake_step_commands("v2"))
+    fifth = asyncio.run(state_manager.run_week_pipeline(state_manager.load_state(), reuse=True))
+    assert {step for step, outcome in fifth.items() if outcome == "completed"} == {
+        "wysh_context_collected", "ideas_generated", "feedback_applied",
+    }
@@ -0,0 +1,53 @@
+"""transcript_chunker 주차 청크 파일/캐시 테스트."""
+
+import json
+
+import pytest
+
+import transcript_chunker
+import youtube_transcript
+
+
+@pytest.fixture
+def weeks_dir(tmp_path, monkeypatch):
+    weeks = tmp_path / "weeks"
+    monkeypatch.setattr(youtube_transcript, "WEEKS_DIR", weeks)
+    monkeypatch.setattr(transcript_chunker, "WEEKS_DIR", weeks)
+    monkeypatch.setattr(transcript_chunker, "CHUNK_CACHE_DIR", tmp_path / "cache")
+    return weeks
+
+
+def _write_segments(weeks_dir, week, segments):
+    week_dir = weeks_dir / f"week-{week:02d}"
+    week_dir.mkdir(parents=True, exist_ok=True)
+    with open(week_dir / "transcript_segments.jsonl", "w", encoding="utf-8") as f:
+        for segment in segments:
+            f.write(json.dumps(segment) + "\n")
+    return week_dir
+
+
+def test_chunk_week_writes_chunks_and_reuses_cache(weeks_dir):
+    segments = [{"video_id": "aaa", "text": f"sentence {i}", "start": float(i), "duration": 1.0}
+                for i in range(5)]
+    week_dir = _write_segments(weeks_dir, 1, segments)
+
+    first = transcript_chunker.chunk_week(1)
+    second = transcript_chunker.chunk_week(1)
+
+    assert (first["videos"], first["cached"]) == (1, 0)
+    assert (second["videos"], second["cached"]) == (1, 1)
+    assert [chunk["video_id"] for chunk in transcript_chunker.iter_chunks(1)] == ["aaa"] * first["chunks"]
+    assert not list(week_dir.glob(".*.tmp"))
+
+
+def test_chunk_week_without_segments_removes_stale_chunks(weeks_dir):
+    week_dir = _write_segments(weeks_dir, 2, [{"video_id": "aaa", "text": "old", "start": 0.0, "duration": 1.0}])
+    transcript_chunker.chunk_week(2)
+    assert (week_dir / "transcript_chunks.jsonl").exists()
+
+    (week_dir / "transcript_segments.jsonl").write_text("", encoding="utf-8")
+    summary = transcript_chunker.chunk_week(2)
+
+    assert summary["videos"] == 0
+    assert not (week_dir / "transcript_chunks.jsonl").exists()
+    assert list(transcript_chunker.iter_chunks(2)) == []
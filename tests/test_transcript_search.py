@@ -0,0 +1,79 @@
+"""transcript_search 공유 색인 인스턴스와 증분 색인 파일 구성 테스트."""
+
+import json
+import shutil
+
+import pytest
+
+import transcript_search
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_search, "INDEX_DIR", tmp_path / "search-index")
+    monkeypatch.setattr(transcript_search, "_shared_index", None)
+    monkeypatch.setattr(transcript_search, "_shared_manifest_stamp", None)
+    return tmp_path / "search-index"
+
+
+def test_get_index_reuses_one_instance(index_dir):
+    index = transcript_search.get_index()
+    assert transcript_search.get_index() is index
+
+
+def test_shared_index_drops_cache_when_manifest_changes(index_dir):
+    index = transcript_search.get_index()
+    index.update_document("1/aaa", 1, "aaa", ["smallest viable market"])
+    assert [hit["video_id"] for hit in transcript_search.get_index().search("viable")] == ["aaa"]
+
+    # 왜: 색인을 지우고 다시 만들면 예전 샤드가 캐시에 남아 있으면 안 된다.
+    shutil.rmtree(index_dir)
+    index = transcript_search.get_index()
+    assert index.search("viable") == []
+    index.update_document("2/bbb", 2, "bbb", ["tribes need a leader"])
+    index = transcript_search.get_index()
+    assert index.search("viable") == []
+    assert [hit["video_id"] for hit in index.search("tribes")] == ["bbb"]
+
+
+def _shard_inodes(index_dir):
+    # 왜: 원자적 쓰기는 새 파일로 바꿔치기하므로 inode로 다시 쓴 샤드를 구분한다 (mtime은 해상도가 거칠 수 있다).
+    return {path.name: path.stat().st_ino for path in index_dir.glob("postings-*.json")}
+
+
+def test_update_rewrites_only_shards_whose_postings_changed(index_dir):
+    index = transcript_search.get_index()
+    texts = ["smallest viable market", "tribes need a leader", "permission marketing works"]
+    index.update_document("1/aaa", 1, "aaa", texts)
+    before = _shard_inodes(index_dir)
+
+    # 왜: 마지막 세그먼트만 바뀌었으므로 그 단어들이 속한 샤드만 다시 써야 한다.
+    index.update_document("1/aaa", 1, "aaa", texts[:2] + ["permission marketing scales"])
+    after = _shard_inodes(index_dir)
+    changed = {name for name in after if before.get(name) != after[name]}
+    expected = {f"postings-{transcript_search.shard_of(term):02d}.json" for term in ("works", "scales")}
+    assert changed == expected
+
+    docs = json.loads((index_dir / "docs.json").read_text(encoding="utf-8"))
+    assert docs["docs"]["1/aaa"]["segments"] == 3
+    assert "terms" not in docs["docs"]["1/aaa"]
+    assert "scales" in index.load_detail("1/aaa")["terms"]
+    assert [hit["segment"] for hit in index.search("scales")] == [2]
+
+    index.remove_document("1/aaa")
+    assert index.search("viable") == []
+    assert not list((index_dir / "docs").glob("*.json"))
+
+
+def test_old_format_index_is_rebuilt(index_dir):
+    index_dir.mkdir(parents=True)
+    (index_dir / "docs.json").write_text(json.dumps({
+        "1/old": {"week": 1, "video_id": "old", "hash": "x", "lengths": [3], "terms": ["viable"]},
+    }), encoding="utf-8")
+    (index_dir / f"postings-{transcript_search.shard_of('viable'):02d}.json").write_text(
+        json.dumps({"viable": {"1/old": [[5, 1]]}}), encoding="utf-8")
+
+    index = transcript_search.get_index()
+    assert index.search("viable") == []
+    index.update_document("1/new", 1, "new", ["smallest viable market"])
+    assert [hit["video_id"] for hit in index.search("viable")] == ["new"]
@@ -0,0 +1,107 @@
+"""
+trend_diff 주차 간 트렌드 변화 테스트.
+손으로 만든 색인으로 신규/지속/소멸 분류를 확인하고,
+임시 주차 디렉토리로 바뀐 주차만 다시 추출하는 증분 색인 갱신을 확인한다.
+"""
+
+import json
+
+import pytest
+
+import trend_diff
+from trend_diff import diff_topic, update_index
+
+
+def week_entry(keywords_by_topic: dict) -> dict:
+    """{토픽 키: [키워드]}로 색인의 주차 항목을 만든다 (근거 문장은 키워드 이름)."""
+    return {
+        "source_hash": "test",
+        "topics": {
+            key: {"query": key.upper(), "keywords": {kw: f"{kw} evidence" for kw in keywords}}
+            for key, keywords in keywords_by_topic.items()
+        },
+    }
+
+
+def test_diff_topic_classifies_new_persisting_and_faded():
+    index = {"weeks": {
+        "1": week_entry({"d2c": ["bundle", "subscription"]}),
+        "2": week_entry({"d2c": ["subscription", "creator"], "other": ["noise"]}),
+        # 3주차에는 토픽이 없으므로 비교 대상은 2주차다.
+        "3": week_entry({"other": ["noise"]}),
+        "4": week_entry({"d2c": ["subscription", "bundle", "retail"]}),
+        "5": week_entry({"d2c": ["future"]}),
+    }}
+
+    diff = diff_topic(index, 4, "d2c")
+
+    assert diff["query"] == "D2C"
+    assert (diff["compared_to_week"], diff["baseline"]) == (2, False)
+    assert diff["new"] == [{"keyword": "retail", "evidence": "retail evidence"}]
+    # 왜: 지속 키워드는 처음 나온 주차와 이번 주를 포함한 등장 주차 수를 함께 남긴다.
+    assert diff["persisting"] == [
+        {"keyword": "subscription", "since_week": 1, "weeks_seen": 3},
+        {"keyword": "bundle", "since_week": 1, "weeks_seen": 2},
+    ]
+    # 소멸은 직전 비교 주차에 있었지만 이번 주에 없는 키워드만 센다 (이후 주차는 보지 않는다).
+    assert diff["faded"] == [{"keyword": "creator", "last_week": 2}]
+    assert diff["counts"] == {"new": 1, "persisting": 2, "faded": 1}
+
+    baseline = diff_topic(index, 1, "d2c")
+    assert (baseline["compared_to_week"], baseline["baseline"]) == (None, True)
+    assert baseline["counts"] == {"new": 2, "persisting": 0, "faded": 0}
+
+
+def write_trends(weeks_dir, week_number: int, text: str) -> None:
+    week_dir = weeks_dir / f"week-{week_number:02d}"
+    week_dir.mkdir(parents=True, exist_ok=True)
+    trends = {"week": week_number, "results": [
+        {"query": "D2C 트렌드", "result": text, "status": "success"},
+        {"query": "실패한 토픽", "result": None, "status": "error"},
+    ]}
+    (week_dir / "trends.json").write_text(json.dumps(trends, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def weeks_dir(tmp_path, monkeypatch):
+    weeks = tmp_path / "weeks"
+    monkeypatch.setattr(trend_diff, "WEEKS_DIR", weeks)
+    return weeks
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    """extract_week가 다시 추출한 주차 디렉토리 이름을 기록한다."""
+    extracted = []
+    original = trend_diff.extract_week
+
+    def counting_extract_week(trends_path):
+        extracted.append(trends_path.parent.name)
+        return original(trends_path)
+
+    monkeypatch.setattr(trend_diff, "extract_week", counting_extract_week)
+    return extracted
+
+
+def test_update_index_reextracts_only_changed_weeks(weeks_dir, extracted):
+    write_trends(weeks_dir, 1, "Subscription bundles dominate premium yogurt.")
+    write_trends(weeks_dir, 2, "Creator partnerships drive subscription growth.")
+    write_trends(weeks_dir, 3, "Retail expansion slows.")
+    index = {"version": trend_diff.EXTRACTOR_VERSION, "weeks": {}}
+
+    assert update_index(index, up_to_week=2) == {"updated": 2, "unchanged": 0, "removed": 0}
+    assert set(index["weeks"]) == {"1", "2"}
+    # 왜: 실패한 토픽은 비교할 내용이 없으므로 색인에 넣지 않는다.
+    assert list(index["weeks"]["1"]["topics"]) == [trend_diff.topic_key("D2C 트렌드")]
+    assert "subscription" in index["weeks"]["1"]["topics"][trend_diff.topic_key("D2C 트렌드")]["keywords"]
+
+    extracted.clear()
+    write_trends(weeks_dir, 2, "Creator partnerships replace paid ads.")
+    assert update_index(index) == {"updated": 2, "unchanged": 1, "removed": 0}
+    assert extracted == ["week-02", "week-03"]
+
+    extracted.clear()
+    (weeks_dir / "week-03" / "trends.json").unlink()
+    assert update_index(index) == {"updated": 0, "unchanged": 2, "removed": 1}
+    assert extracted == []
+    assert set(index["weeks"]) == {"1", "2"}
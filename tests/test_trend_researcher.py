@@ -0,0 +1,68 @@
+"""trend_researcher 공용 캐시/비용 원장, 결과 저장 테스트."""
+
+from datetime import datetime
+
+import trend_researcher
+from trend_researcher import KST, ResearchBudget, ResearchCache, load_ledger, reconcile_ledger, save_trends
+
+
+def _result(query, text):
+    return {"query": query, "result": text, "status": "success", "elapsed_seconds": 1.0}
+
+
+def test_research_cache_save_merges_with_other_writers(tmp_path):
+    path = tmp_path / "deep-research.json"
+    first = ResearchCache(path)
+    second = ResearchCache(path)
+
+    assert first.put(_result("D2C 트렌드", "first"))
+    first.save()
+    # 왜: second는 first가 저장하기 전에 읽었지만, 저장할 때 first의 결과를 지우면 안 된다.
+    assert second.get("그릭요거트 시장") is None
+    assert second.put(_result("그릭요거트 시장", "second"))
+    second.save()
+
+    merged = ResearchCache(path)
+    assert merged.get("d2c  트렌드")["result"] == "first"
+    assert merged.get("그릭요거트 시장")["result"] == "second"
+    assert merged.data["stats"] == {"hits": 2, "misses": 1}
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_budget_reservations_are_shared_through_the_ledger(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    # 왜: 같은 원장을 쓰는 두 프로세스를 서로 다른 ResearchBudget 인스턴스로 흉내 낸다.
+    first = ResearchBudget(weekly_usd=10, monthly_usd=100, ledger_path=ledger)
+    second = ResearchBudget(weekly_usd=10, monthly_usd=100, ledger_path=ledger)
+
+    reservation_a, reason = first.try_reserve("topic A", cost=4)
+    assert reason is None
+    reservation_b, reason = second.try_reserve("topic B", cost=4)
+    assert reason is None
+    # 왜: 끝난 실행이 없어도 두 예약($8)이 원장에 있으므로 세 번째는 주간 한도 $10을 넘는다.
+    reservation_c, reason = first.try_reserve("topic C", cost=4)
+    assert reservation_c is None and "주간" in reason
+
+    first.complete(reservation_a, {"started_at": datetime.now(KST).isoformat(), "query": "topic A",
+                                   "status": "success", "estimated_cost_usd": 4})
+    runs, open_reservations = reconcile_ledger(load_ledger(ledger))
+    assert [run["reservation_id"] for run in runs] == [reservation_a]
+    assert [entry["id"] for entry in open_reservations] == [reservation_b]
+    usage = second.usage()["weekly"]
+    assert (usage["spent"], usage["in_flight"]) == (4, 4)
+    assert second.spent()[0] == 8
+
+
+def test_save_trends_keeps_files_when_results_are_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(trend_researcher, "WEEKS_DIR", tmp_path / "weeks")
+    trends_json = tmp_path / "weeks" / "week-03" / "trends.json"
+    results = [_result("D2C 트렌드", "first")]
+
+    save_trends(results, 3, {"hits": 0}, quiet=True)
+    written = trends_json.read_bytes()
+    # 왜: 결과가 같으면 리서치 시각만 바뀐 파일로 다시 쓰지 않아야 trend_diff가 주차를 건너뛴다.
+    save_trends([dict(result) for result in results], 3, {"hits": 0}, quiet=True)
+    assert trends_json.read_bytes() == written
+
+    save_trends([_result("D2C 트렌드", "second")], 3, {"hits": 0}, quiet=True)
+    assert trends_json.read_bytes() != written
@@ -0,0 +1,239 @@
+"""
+youtube_transcript 배치 추출 테스트.
+네트워크 없이 가짜 제공자와 LocalTranscriptProvider로 동시 실행 순서, 영상별 실패 격리,
+호출 간격 제한을 확인한다.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import youtube_transcript
+from youtube_transcript import (
+    LocalTranscriptProvider,
+    RateLimiter,
+    TranscriptProvider,
+    fetch_transcripts_batch,
+    iter_transcripts_batch,
+)
+
+
+class FakeProvider(TranscriptProvider):
+    """영상별 지연/실패를 지정할 수 있는 가짜 제공자."""
+
+    name = "fake"
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        # video_id -> 남은 실패 횟수와 예외 (횟수 None이면 항상 실패)
+        self.failures = failures or {}
+        self.calls = {}
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def list_languages(self, video_id):
+        return [("English", "en", False)]
+
+    def get_segments(self, video_id, languages):
+        with self.lock:
+            self.calls[video_id] = self.calls.get(video_id, 0) + 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(video_id, 0))
+            if video_id in self.failures:
+                remaining, error = self.failures[video_id]
+                if remaining is None or remaining > 0:
+                    if remaining is not None:
+                        self.failures[video_id] = (remaining - 1, error)
+                    raise error
+            return [{"text": f"{video_id} text", "start": 0.0, "duration": 1.5}]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # 왜: 재시도 경로를 검증할 때 실제 백오프(2초, 4초...)를 기다리지 않는다.
+    monkeypatch.setattr(youtube_transcript, "RETRY_BACKOFF_SECONDS", 0.0)
+
+
+def test_provider_interface_requires_all_methods():
+    with pytest.raises(TypeError):
+        TranscriptProvider()
+
+    class Incomplete(TranscriptProvider):
+        def list_languages(self, video_id):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_batch_yields_in_input_order_while_running_concurrently():
+    video_ids = [f"vid{i}" for i in range(6)]
+    # 왜: 앞 영상일수록 오래 걸리게 하여 완료 순서가 입력 순서와 반대가 되도록 한다.
+    provider = FakeProvider(delays={video_id: 0.05 * (6 - i) for i, video_id in enumerate(video_ids)})
+
+    pairs = list(iter_transcripts_batch(video_ids, ["en"], provider, workers=3, rate_per_second=0))
+
+    assert [video_id for video_id, _ in pairs] == video_ids
+    assert [result["video_id"] for _, result in pairs] == video_ids
+    assert provider.max_active > 1
+
+
+def test_batch_submits_only_a_bounded_window_ahead_of_a_slow_head():
+    video_ids = [f"vid{i}" for i in range(20)]
+    provider = FakeProvider(delays={"vid0": 0.3})
+    workers = 2
+
+    batch = iter_transcripts_batch(video_ids, ["en"], provider, workers=workers, rate_per_second=0)
+    first_id, _ = next(batch)
+    # 왜: 맨 앞 영상이 느려도 작업자 수의 두 배보다 많이 앞서 제출하지 않는다.
+    assert first_id == "vid0"
+    assert sum(provider.calls.values()) <= workers * 2
+
+    rest = [video_id for video_id, _ in batch]
+    assert rest == video_ids[1:]
+
+
+def test_failed_video_does_not_affect_others():
+    provider = FakeProvider(failures={
+        "broken": (None, LookupError("NoTranscriptFound: broken")),
+        "flaky": (1, ConnectionError("temporary")),
+    })
+    video_ids = ["ok1", "broken", "flaky", "ok2"]
+
+    succeeded, failed = fetch_transcripts_batch(
+        video_ids, ["en"], provider, workers=2, rate_per_second=0, retries=2
+    )
+
+    assert [result["video_id"] for result in succeeded] == ["ok1", "flaky", "ok2"]
+    assert failed == ["broken"]
+    # 왜: 영구 오류는 재시도하지 않고, 일시적 오류는 한 번 더 시도해 성공한다.
+    assert provider.calls["broken"] == 1
+    assert provider.calls["flaky"] == 2
+
+
+def test_transient_failure_exhausting_retries_is_reported_as_failed():
+    provider = FakeProvider(failures={"down": (None, ConnectionError("still down"))})
+
+    succeeded, failed = fetch_transcripts_batch(
+        ["down", "ok"], ["en"], provider, workers=2, rate_per_second=0, retries=3
+    )
+
+    assert [result["video_id"] for result in succeeded] == ["ok"]
+    assert failed == ["down"]
+    assert provider.calls["down"] == 3
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = RateLimiter(20)  # 50ms 간격
+    stamps = []
+    stamps_lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            limiter.wait()
+            with stamps_lock:
+                stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stamps.sort()
+    assert len(stamps) == 9
+    # 왜: 제한기는 호출 시각(슬롯)을 간격만큼 벌려 주므로, 스레드 전환으로 기록 시각이 흔들려도
+    # k번째 호출은 시작 후 k × 간격보다 먼저 일어날 수 없다.
+    for k, stamp in enumerate(stamps):
+        assert stamp - start >= k * limiter.interval - 0.005
+
+
+def test_rate_limiter_disabled_does_not_wait():
+    limiter = RateLimiter(0)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.05
+
+
+def test_local_provider_batch(tmp_path):
+    (tmp_path / "aaa.json").write_text(json.dumps(
+        [{"text": "hello", "start": 0.0, "duration": 2.0}, {"text": "world", "start": 2.0, "duration": 3.0}]
+    ), encoding="utf-8")
+    (tmp_path / "bbb.json").write_text(json.dumps(
+        {"language": "ko", "is_generated": False, "segments": [{"text": "안녕", "start": 0.0, "duration": 1.0}]}
+    ), encoding="utf-8")
+    provider = LocalTranscriptProvider(tmp_path)
+
+    succeeded, failed = fetch_transcripts_batch(
+        ["aaa", "missing", "bbb"], ["ko", "en"], provider, workers=2, rate_per_second=0
+    )
+
+    assert failed == ["missing"]
+    first, second = succeeded
+    assert (first["video_id"], first["language"], first["is_generated"]) == ("aaa", "en", True)
+    assert first["duration_seconds"] == 5
+    assert first["character_count"] == len("hello world")
+    assert (second["video_id"], second["language"], second["is_generated"]) == ("bbb", "ko", False)
+
+
+def _cache_result(video_id):
+    return {"video_id": video_id, "language": "en",
+            "segments": [{"text": f"{video_id} text", "start": 0.0, "duration": 1.0}]}
+
+
+def test_cache_instances_merge_instead_of_overwriting(tmp_path):
+    available = [("English", "en", False)]
+    first = youtube_transcript.TranscriptCache(tmp_path)
+    second = youtube_transcript.TranscriptCache(tmp_path)
+
+    first.put(_cache_result("aaa"), available)
+    # 왜: second는 aaa가 추가되기 전 인덱스를 들고 있지만, 쓸 때 최신 인덱스에 합쳐야 한다.
+    second.put(_cache_result("bbb"), available)
+    assert second.get("aaa", ["en"])["segments"][0]["text"] == "aaa text"
+
+    index_mtime = (tmp_path / "index.json").stat().st_mtime_ns
+    assert first.get("bbb", ["en"]) is not None
+    assert first.get("zzz", ["en"]) is None
+    # 왜: 조회는 인덱스를 다시 쓰지 않고, flush 때 통계를 합친다.
+    assert (tmp_path / "index.json").stat().st_mtime_ns == index_mtime
+    first.flush()
+    second.flush()
+
+    stats = youtube_transcript.TranscriptCache(tmp_path).stats()
+    assert stats["entries"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def _dedup_result(video_id, text):
+    return {"video_id": video_id, "segments": [{"text": text, "start": 0.0, "duration": 1.0}]}
+
+
+def test_dedup_index_instances_merge_instead_of_overwriting(tmp_path):
+    path = tmp_path / "transcript-dedup.json"
+    original = " ".join(f"word{i}" for i in range(200))
+    first = youtube_transcript.TranscriptDedupIndex(path)
+    second = youtube_transcript.TranscriptDedupIndex(path)
+
+    assert first.check_and_add(_dedup_result("aaa", original), 1) is None
+    first.save()
+    # 왜: second는 aaa가 저장되기 전 색인을 들고 있지만, 저장할 때 aaa를 지우면 안 된다.
+    assert second.check_and_add(_dedup_result("bbb", "completely different words here"), 2) is None
+    second.save()
+
+    merged = youtube_transcript.TranscriptDedupIndex(path)
+    assert set(merged.index["videos"]) == {"aaa", "bbb"}
+    # 합쳐진 버킷으로 aaa의 재업로드를 찾는다.
+    match = merged.check_and_add(_dedup_result("ccc", original), 3)
+    assert match is not None and match[0] == "aaa"
+    merged.save()
+    assert youtube_transcript.TranscriptDedupIndex(path).known_duplicate("ccc")["duplicate_of"] == "aaa"